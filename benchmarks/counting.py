@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`counting`
+===============
+
+Per-sample overhead of the signal statistics wrapping notification
+callbacks, with and without timing of the callback.
+
+Usage::
+
+    python benchmarks/counting.py --max-overhead 0.5
+
+exits with status 1 if counting, without timing, adds more than the
+given number of microseconds per sample.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-19
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import sys
+import timeit
+import argparse
+
+from pymetawear.stats import SignalStats
+
+
+def run(n_samples=100000, repeat=5):
+    """Time a callback bare, with counting and with timing.
+
+    :param int n_samples: Number of samples per timing.
+    :param int repeat: Number of timings, of which the best is used.
+    :return: Dictionary of the microseconds per sample of the ``bare``
+        callback, and of the overhead of ``counting`` and ``timing``.
+    :rtype: dict
+
+    """
+    def callback(data):
+        pass
+
+    def per_sample(wrapper):
+        t = min(timeit.repeat(lambda: wrapper(None),
+                              number=n_samples, repeat=repeat))
+        return t / n_samples * 1e6
+
+    bare = per_sample(callback)
+    return {
+        'bare': bare,
+        'counting': per_sample(SignalStats().wrap(callback)) - bare,
+        'timing': per_sample(
+            SignalStats(timing=True).wrap(callback)) - bare,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('-n', '--n-samples', type=int, default=100000)
+    parser.add_argument('--max-overhead', type=float, default=None,
+                        help="Maximal microseconds per sample.")
+    args = parser.parse_args(argv)
+
+    results = run(args.n_samples)
+    print("bare: {0:6.3f} us/sample, counting: +{1:6.3f} us/sample, "
+          "timing: +{2:6.3f} us/sample".format(
+              results['bare'], results['counting'], results['timing']))
+    if args.max_overhead is not None and \
+            results['counting'] > args.max_overhead:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`decoding`
+===============
+
+Per-sample overhead of decoding ``libmetawear`` data pointers in
+notification callbacks, compared to reading them with ``ctypes.cast``.
+
+Usage::
+
+    python benchmarks/decoding.py --max-overhead 2.0
+
+exits with status 1 if the decoding layer needs more than the given
+number of microseconds per sample for any data type.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-17
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import sys
+import timeit
+import argparse
+from ctypes import c_uint, c_float, cast, pointer, POINTER, c_void_p
+
+from pymetawear.decoding import data_handler
+from pymetawear.mbientlab.metawear.core import Data, DataTypeId, \
+    CartesianFloat, BatteryState
+
+
+def _data(type_id, value):
+    data = Data()
+    data.epoch = 1463472000000
+    data.value = cast(pointer(value), c_void_p)
+    data.type_id = type_id
+    # Keep the value alive as long as the data.
+    data._value = value
+    return pointer(data)
+
+
+def _cast_cartesian(func):
+    def wrapper(data):
+        if data.contents.type_id == DataTypeId.CARTESIAN_FLOAT:
+            data_ptr = cast(data.contents.value, POINTER(CartesianFloat))
+            func((data_ptr.contents.x,
+                  data_ptr.contents.y,
+                  data_ptr.contents.z))
+    return wrapper
+
+
+def _cast_battery(func):
+    def wrapper(data):
+        if data.contents.type_id == DataTypeId.BATTERY_STATE:
+            data_ptr = cast(data.contents.value, POINTER(BatteryState))
+            func((data_ptr.contents.voltage, data_ptr.contents.charge))
+    return wrapper
+
+
+def _cast_uint32(func):
+    def wrapper(data):
+        if data.contents.type_id == DataTypeId.UINT32:
+            func(cast(data.contents.value, POINTER(c_uint)).contents.value)
+    return wrapper
+
+
+CASES = (
+    ('cartesian_float', DataTypeId.CARTESIAN_FLOAT,
+     lambda: CartesianFloat(0.1, -0.2, 0.98), _cast_cartesian),
+    ('battery_state', DataTypeId.BATTERY_STATE,
+     lambda: BatteryState(4105, 87), _cast_battery),
+    ('uint32', DataTypeId.UINT32, lambda: c_uint(1), _cast_uint32),
+)
+
+
+def run(n_samples=100000, repeat=5):
+    """Time the decoding of each data type.
+
+    :param int n_samples: Number of samples per timing.
+    :param int repeat: Number of timings, of which the best is used.
+    :return: Dictionary from data type to a dictionary of the
+        microseconds per sample for the ``decoding`` layer, and
+        for ``cast`` reading.
+    :rtype: dict
+
+    """
+    def callback(value):
+        pass
+
+    results = {}
+    for name, type_id, value, cast_wrapper in CASES:
+        data = _data(type_id, value())
+        results[name] = {}
+        for method, wrapper in (
+                ('decoding', data_handler(callback, type_id)),
+                ('cast', cast_wrapper(callback))):
+            t = min(timeit.repeat(lambda: wrapper(data),
+                                  number=n_samples, repeat=repeat))
+            results[name][method] = t / n_samples * 1e6
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('-n', '--n-samples', type=int, default=100000)
+    parser.add_argument('--max-overhead', type=float, default=None,
+                        help="Maximal microseconds per sample.")
+    args = parser.parse_args(argv)
+
+    results = run(args.n_samples)
+    failed = False
+    for name in sorted(results):
+        r = results[name]
+        print("{0:<16} decoding: {1:6.3f} us/sample, cast: {2:6.3f} "
+              "us/sample".format(name, r['decoding'], r['cast']))
+        if args.max_overhead is not None and \
+                r['decoding'] > args.max_overhead:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
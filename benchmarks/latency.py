@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`latency`
+==============
+
+Command-to-response latency of one or many boards, probed at the same
+time, as percentiles of repeated round trips.
+
+Usage::
+
+    python benchmarks/latency.py DD:3A:7D:4D:56:F0 F1:A2:3C:4D:5E:60
+    python benchmarks/latency.py --standin 8 --standin-latency 0.0075
+
+probes connected boards, or stand-in boards answering after the given
+latency, in seconds.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-22
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import sys
+import json
+import argparse
+
+from pymetawear.client import MetaWearClient
+from pymetawear.tuning import probe_latency
+
+
+def _print_report(name, r):
+    def ms(x):
+        return float('nan') if x is None else x * 1e3
+    print("{0:<20} {1:6d} answered {2:4d} lost  p50 {3:8.2f} ms  "
+          "p90 {4:8.2f} ms  p99 {5:8.2f} ms  max {6:8.2f} ms".format(
+              name, r['count'], r['lost'], ms(r['p50']), ms(r['p90']),
+              ms(r['p99']), ms(r['max'])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('addresses', nargs='*',
+                        help="Addresses of the boards to probe.")
+    parser.add_argument('--backend', default='pygatt')
+    parser.add_argument('--standin', type=int, default=0,
+                        help="Number of stand-in boards to probe instead.")
+    parser.add_argument('--standin-latency', type=float, default=0.0075)
+    parser.add_argument('--module', default='battery',
+                        help="Module to read, e.g. battery or switch.")
+    parser.add_argument('-n', '--n-probes', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('-o', '--output', default=None,
+                        help="File to write the report to, as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.standin:
+        clients = [MetaWearClient('stand-in-{0}'.format(k),
+                                  backend='standin')
+                   for k in range(args.standin)]
+        for c in clients:
+            c.backend.latency = args.standin_latency
+    else:
+        clients = [MetaWearClient(a, backend=args.backend)
+                   for a in args.addresses]
+    if not clients:
+        parser.error("No boards to probe.")
+
+    try:
+        report = probe_latency(clients, args.module, args.n_probes,
+                               args.timeout, args.interval)
+    finally:
+        for c in clients:
+            c.disconnect()
+
+    for address in sorted(report['boards']):
+        _print_report(address, report['boards'][address])
+    _print_report('combined', report['combined'])
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`suite`
+============
+
+Benchmarks of the Python hot paths, run offline against stand-in boards.
+
+Covers import time, client construction, command marshalling, notification
+ingestion per module, callback decoding per data type, signal statistics
+and fan-in of notifications from several boards. Results are written as JSON, and can
+be compared against the results of an earlier run.
+
+Usage::
+
+    python benchmarks/suite.py -o results-0.5.0.json
+    python benchmarks/suite.py --baseline results-0.5.0.json --tolerance 0.2
+
+exits with status 1 if any result is more than the tolerance worse than
+in the baseline.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-21
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import sys
+import time
+import json
+import struct
+import platform
+import argparse
+import threading
+import subprocess
+
+import pymetawear
+from pymetawear.client import MetaWearClient
+
+import counting
+import decoding
+
+# Notification payloads per module attribute, and keyword arguments of
+# the subscription.
+PAYLOADS = (
+    ('accelerometer', {},
+     bytearray(struct.pack(str('<BBhhh'), 0x03, 0x04, 16, -16, 16384))),
+    ('accelerometer_packed', {'packed': True},
+     bytearray(struct.pack(str('<BB9h'), 0x03, 0x1c, *range(9)))),
+    ('gyroscope', {},
+     bytearray(struct.pack(str('<BBhhh'), 0x13, 0x05, 164, 0, -164))),
+    ('switch', {}, bytearray([0x01, 0x01, 0x01])),
+    ('battery', {},
+     bytearray(struct.pack(str('<BBBH'), 0x11, 0x8c, 99, 4100))),
+)
+
+
+def _result(value, unit, better='lower'):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def _best(func, number, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.time()
+        for _ in range(number):
+            func()
+        t = (time.time() - t0) / number
+        best = t if best is None else min(best, t)
+    return best
+
+
+def _client(address):
+    return MetaWearClient(address, backend='standin')
+
+
+def bench_import(repeat=5):
+    """Time of importing the client module in a new interpreter,
+    in excess of starting the interpreter."""
+    def run(code):
+        t0 = time.time()
+        subprocess.check_call([sys.executable, '-c', code])
+        return time.time() - t0
+    startup = min(run('pass') for _ in range(repeat))
+    t = min(run('import pymetawear.client') for _ in range(repeat))
+    return {'import_time': _result((t - startup) * 1e3, 'ms')}
+
+
+def bench_construction(repeat=5):
+    """Time from creating a client until it is ready to use.
+
+    The client polls the board for the end of the initialization every
+    :attr:`~pymetawear.backends.BLECommunicationBackend.poll_interval`,
+    a millisecond with the stand-in backend, which limits the resolution.
+
+    """
+    def construct():
+        _client('stand-in').disconnect()
+    return {'client_construction': _result(
+        _best(construct, 1, repeat) * 1e3, 'ms')}
+
+
+def bench_marshalling(client, n=10000, repeat=5):
+    """Time of sending a command through ``libmetawear`` and the backend."""
+    return {'command_marshalling': _result(
+        _best(client.accelerometer.start, n, repeat) * 1e6, 'us')}
+
+
+def bench_ingestion(client, n=10000, repeat=5):
+    """Time of receiving a notification until it has been delivered
+    to the module callback, per module."""
+    results = {}
+    for name, kwargs, payload in PAYLOADS:
+        module = getattr(client, name.split('_')[0])
+        module.notifications(lambda data: None, **kwargs)
+        try:
+            t = _best(lambda: client.backend.notify(payload), n, repeat)
+        finally:
+            module.notifications(None)
+        results['ingestion_{0}'.format(name)] = _result(t * 1e6, 'us')
+    return results
+
+
+def bench_decode(n=100000, repeat=5):
+    """Time of decoding a data pointer in a callback, per data type."""
+    return {'decode_{0}'.format(name): _result(r['decoding'], 'us')
+            for name, r in decoding.run(n, repeat).items()}
+
+
+def bench_counting(n=100000, repeat=5):
+    """Overhead of the signal statistics per sample, with and without
+    timing of the callback."""
+    results = counting.run(n, repeat)
+    return {'stats_{0}'.format(name): _result(results[name], 'us')
+            for name in ('counting', 'timing')}
+
+
+def bench_fan_in(n_boards=4, n=5000):
+    """Notifications per second delivered from several boards at once,
+    each board notifying from its own thread."""
+    clients = [_client('stand-in-{0}'.format(k)) for k in range(n_boards)]
+    received = [0]
+    lock = threading.Lock()
+
+    def callback(data):
+        with lock:
+            received[0] += 1
+
+    payload = PAYLOADS[0][2]
+
+    def feed(client):
+        for _ in range(n):
+            client.backend.notify(payload)
+
+    try:
+        for c in clients:
+            c.accelerometer.notifications(callback)
+        threads = [threading.Thread(target=feed, args=(c, ))
+                   for c in clients]
+        t0 = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.time() - t0
+    finally:
+        for c in clients:
+            c.accelerometer.notifications(None)
+            c.disconnect()
+    return {'fan_in_{0}_boards'.format(n_boards): _result(
+        received[0] / elapsed, 'notifications/s', 'higher')}
+
+
+def run(n=10000, n_boards=4, repeat=5):
+    """Run all benchmarks.
+
+    :param int n: Number of operations per timing.
+    :param int n_boards: Number of boards for the fan-in benchmark.
+    :param int repeat: Number of timings, of which the best is used.
+    :return: Dictionary of the environment and the results by name,
+        each with a value, its unit, and if ``lower`` or ``higher``
+        values are better.
+    :rtype: dict
+
+    """
+    results = {}
+    results.update(bench_import(repeat))
+    results.update(bench_construction(repeat))
+    client = _client('stand-in')
+    try:
+        results.update(bench_marshalling(client, n, repeat))
+        results.update(bench_ingestion(client, n, repeat))
+    finally:
+        client.disconnect()
+    results.update(bench_decode(n * 10, repeat))
+    results.update(bench_counting(n * 10, repeat))
+    results.update(bench_fan_in(n_boards, n))
+    return {
+        'pymetawear': pymetawear.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.time(),
+        'results': results,
+    }
+
+
+def compare(output, baseline, tolerance=0.2):
+    """Find the results that are worse than in a baseline.
+
+    :param dict output: Output of :func:`run`.
+    :param dict baseline: Output of an earlier :func:`run`.
+    :param float tolerance: Allowed relative deterioration.
+    :return: List of tuples of name, baseline value and value.
+    :rtype: list
+
+    """
+    regressions = []
+    for name, r in sorted(output['results'].items()):
+        b = baseline['results'].get(name)
+        if b is None:
+            continue
+        if r['better'] == 'lower':
+            worse = r['value'] > b['value'] * (1 + tolerance)
+        else:
+            worse = r['value'] < b['value'] * (1 - tolerance)
+        if worse:
+            regressions.append((name, b['value'], r['value']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('-o', '--output', default=None,
+                        help="File to write the results to, as JSON.")
+    parser.add_argument('-n', '--n-operations', type=int, default=10000)
+    parser.add_argument('--boards', type=int, default=4)
+    parser.add_argument('--baseline', default=None,
+                        help="Results of an earlier run to compare with.")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed relative deterioration.")
+    args = parser.parse_args(argv)
+
+    output = run(args.n_operations, args.boards)
+    for name, r in sorted(output['results'].items()):
+        print("{0:<32} {1:12.3f} {2}".format(name, r['value'], r['unit']))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(output, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print("Regression in {0}: {1:.3f} -> {2:.3f}".format(
+                name, before, after))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`arrow`
+============
+
+Columnar export of data streams to Arrow IPC and Parquet files.
+
+Samples are collected into chunks of ``row_group_size`` samples, which
+are turned into Arrow record batches directly from the NumPy arrays,
+without a Python object per sample. Every chunk is written as a record
+batch of an Arrow IPC stream, or as a row group of a Parquet file, when
+it is full. The board timestamps are stored in an ``epoch`` column of
+millisecond timestamps.
+
+An Arrow IPC stream can be read, e.g. with :func:`pyarrow.ipc.open_stream`,
+while it is being written, up to the last written record batch. A Parquet
+file can only be read after it has been closed, since its footer with the
+locations of the row groups is written on close.
+
+Requires `pyarrow <https://arrow.apache.org/docs/python/>`_, installed
+with ``pip install pymetawear[arrow]``.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-27
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from pymetawear.batching import SampleBatcher
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.recording import MODULE_COLUMNS
+
+#: File extensions of the formats.
+EXTENSIONS = {
+    'ipc': '.arrows',
+    'parquet': '.parquet',
+}
+
+
+def _require(format):
+    if pa is None:
+        raise PyMetaWearException(
+            "pyarrow is required for Arrow export: "
+            "pip install pymetawear[arrow]")
+    if format == 'parquet' and pq is None:
+        raise PyMetaWearException(
+            "pyarrow is not built with Parquet support.")
+    if format not in EXTENSIONS:
+        raise PyMetaWearException(
+            "Unknown format: {0}. Use one of {1}".format(
+                format, sorted(EXTENSIONS)))
+
+
+def schema(columns):
+    """Get the Arrow schema of a stream.
+
+    :param tuple columns: Tuples of column name and NumPy data type.
+    :rtype: :class:`pyarrow.Schema`
+
+    """
+    return pa.schema(
+        [pa.field(str('epoch'), pa.timestamp(str('ms')))] +
+        [pa.field(str(c), pa.from_numpy_dtype(np.dtype(d)))
+         for c, d in columns])
+
+
+class ArrowStreamWriter(object):
+    """Writes samples of one stream to an Arrow IPC stream or a
+    Parquet file. The Parquet file is readable only after :meth:`close`.
+
+    Created by :meth:`ArrowSink.stream`.
+
+    """
+
+    def __init__(self, path, columns, format='parquet', row_group_size=65536,
+                 compression='snappy'):
+        _require(format)
+        self.path = path
+        self.columns = tuple((c, np.dtype(d)) for c, d in columns)
+        self.format = format
+        self.row_group_size = int(row_group_size)
+        self.schema = schema(self.columns)
+        self.n_samples = 0
+
+        if format == 'parquet':
+            self._writer = pq.ParquetWriter(path, self.schema,
+                                            compression=compression)
+        else:
+            self._writer = pa.RecordBatchStreamWriter(path, self.schema)
+        self._batcher = SampleBatcher(self.write_chunk, self.row_group_size,
+                                      n_columns=len(self.columns))
+
+    def __str__(self):
+        return "ArrowStreamWriter: {0} [{1}]".format(
+            self.path, ", ".join([c for c, _ in self.columns]))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def receiver(self):
+        """Get a notification callback, taking an epoch and a value,
+        for exporting a module's notifications.
+
+        :rtype: callable
+
+        """
+        return self.append
+
+    def append(self, epoch, value):
+        """Add one sample.
+
+        :param int epoch: Board timestamp in milliseconds.
+        :param value: Tuple of values, or a single value for
+            streams with one column.
+
+        """
+        self._batcher.append(epoch, value)
+
+    def append_batch(self, epochs, values):
+        """Add a batch of samples, e.g. from a
+        :class:`~pymetawear.batching.SampleBatcher`.
+
+        :param array_like epochs: Board timestamps in milliseconds.
+        :param array_like values: Array of shape ``(n, n_columns)``.
+
+        """
+        self._batcher.flush()
+        epochs = np.asarray(epochs)
+        values = np.asarray(values).reshape((len(epochs), len(self.columns)))
+        for i in range(0, len(epochs), self.row_group_size):
+            self.write_chunk(epochs[i:i + self.row_group_size],
+                             values[i:i + self.row_group_size])
+
+    def record_batch(self, epochs, values):
+        """Convert samples to an Arrow record batch.
+
+        :param array_like epochs: Board timestamps in milliseconds.
+        :param array_like values: Array of shape ``(n, n_columns)``.
+        :rtype: :class:`pyarrow.RecordBatch`
+
+        """
+        arrays = [pa.array(np.asarray(epochs, dtype='int64'),
+                           type=self.schema.field(0).type)]
+        for k, (_, dtype) in enumerate(self.columns):
+            arrays.append(pa.array(np.ascontiguousarray(
+                values[:, k], dtype=dtype)))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def write_chunk(self, epochs, values):
+        """Write a chunk of samples as a record batch or row group."""
+        if not len(epochs):
+            return
+        batch = self.record_batch(epochs, values)
+        if self.format == 'parquet':
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+        self.n_samples += len(epochs)
+
+    def flush(self):
+        """Write samples not yet making up a full row group."""
+        self._batcher.flush()
+
+    def close(self):
+        """Write remaining samples and close the file. For Parquet,
+        this writes the footer that makes the file readable."""
+        self.flush()
+        self._writer.close()
+
+
+class ArrowSink(object):
+    """Exports data streams, e.g. from several boards, to one Arrow IPC
+    stream or Parquet file per stream in a directory.
+
+    Example:
+
+    .. code-block:: python
+
+        sink = ArrowSink('/data/session_1', format='parquet')
+        sink.attach(mwclient_1.accelerometer, 'acc_1')
+        sink.attach(mwclient_2.accelerometer, 'acc_2')
+        # ... Stream for hours, and then
+        sink.close()
+
+    :param str directory: Directory of the files. It is created if
+        it does not exist.
+    :param str format: ``parquet`` or ``ipc``.
+    :param int row_group_size: Number of samples in each row group,
+        or record batch, of the files.
+    :param str compression: Parquet compression codec.
+
+    """
+
+    def __init__(self, directory, format='parquet', row_group_size=65536,
+                 compression='snappy'):
+        _require(format)
+        self.directory = directory
+        self.format = format
+        self.row_group_size = int(row_group_size)
+        self.compression = compression
+        self.writers = {}
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+    def __str__(self):
+        return "ArrowSink: {0}, {1}".format(
+            self.directory, sorted(self.writers))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def path(self, name):
+        """Path of the file of a stream.
+
+        :param str name: Name of the stream.
+        :rtype: str
+
+        """
+        return os.path.join(self.directory, name + EXTENSIONS[self.format])
+
+    def stream(self, name, columns=(('x', '<f4'), ('y', '<f4'), ('z', '<f4'))):
+        """Get the writer for a stream, creating it if needed.
+
+        :param str name: Name of the stream. Used in the file name.
+        :param tuple columns: Tuples of column name and NumPy data type.
+        :return: The writer for the stream.
+        :rtype: :class:`ArrowStreamWriter`
+
+        """
+        if name in self.writers:
+            return self.writers[name]
+        path = self.path(name)
+        if os.path.exists(path):
+            raise PyMetaWearException(
+                "Stream {0} is already exported to {1}.".format(name, path))
+        writer = ArrowStreamWriter(path, columns, self.format,
+                                   self.row_group_size, self.compression)
+        self.writers[name] = writer
+        return writer
+
+    def attach(self, module, name=None, columns=None):
+        """Export notifications from a module.
+
+        :param pymetawear.modules.PyMetaWearModule module: The module
+            to subscribe to, e.g. ``mwclient.accelerometer``.
+        :param str name: Name of the stream. Defaults to the module's
+            lowercase module name.
+        :param tuple columns: Tuples of column name and NumPy data type.
+            Defaults to the columns of the module's data.
+        :return: The writer for the stream.
+        :rtype: :class:`ArrowStreamWriter`
+
+        """
+        name = module.module_name.lower() if name is None else name
+        if columns is None:
+            columns = MODULE_COLUMNS.get(type(module).__name__)
+            if columns is None:
+                raise PyMetaWearException(
+                    "Columns must be given for {0} module.".format(module))
+        writer = self.stream(name, columns)
+        module.notifications(writer.receiver(), with_epoch=True)
+        return writer
+
+    def flush(self):
+        """Write all buffered samples."""
+        for writer in self.writers.values():
+            writer.flush()
+
+    def close(self):
+        """Write all buffered samples and close all files."""
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+
+def export_recording(recording, directory, format='parquet',
+                     row_group_size=65536, compression='snappy'):
+    """Export a recording made by :class:`~pymetawear.recording.Recorder`,
+    with one file per stream.
+
+    The recorded columns are read from the memory maps one row group at
+    a time.
+
+    :param pymetawear.recording.Recording recording: The recording.
+    :param str directory: Directory of the exported files.
+    :param str format: ``parquet`` or ``ipc``.
+    :param int row_group_size: Number of samples in each row group.
+    :param str compression: Parquet compression codec.
+    :return: Paths of the files by stream name.
+    :rtype: dict
+
+    """
+    sink = ArrowSink(directory, format, row_group_size, compression)
+    paths = {}
+    try:
+        for name in recording.streams:
+            stream = recording.stream(name)
+            writer = sink.stream(name, stream.columns)
+            for i in range(0, len(stream), writer.row_group_size):
+                j = i + writer.row_group_size
+                writer.write_chunk(
+                    stream.epochs[i:j],
+                    np.column_stack([stream[c][i:j]
+                                     for c in stream.column_names]))
+            paths[name] = writer.path
+    finally:
+        sink.close()
+    return paths
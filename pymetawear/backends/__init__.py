@@ -12,6 +12,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 
 from ctypes import byref
+import time
 import uuid
 
 from pymetawear import libmetawear
@@ -19,18 +20,32 @@ from pymetawear.exceptions import PyMetaWearException
 from pymetawear.mbientlab.metawear.core import BtleConnection, FnGattCharPtr, \
     FnGattCharPtrByteArray, FnVoid
 from pymetawear.specs import METAWEAR_SERVICE_NOTIFY_CHAR
-from pymetawear.utils import string_types
+from pymetawear.stats import ConnectionStats
+from pymetawear.tracing import TraceEvent, print_hook, READ, WRITE, NOTIFY, \
+    SUBSCRIBE, INIT
 
 
 class BLECommunicationBackend(object):
 
-    def __init__(self, address, async=True, timeout=None, debug=False):
+    #: Time between checks for the end of the board initialization,
+    #: in seconds.
+    poll_interval = 0.1
+
+    def __init__(self, address, async=True, timeout=None, debug=False,
+                 trace_hooks=None):
         self._address = address
         self._async = async
         self._debug = debug
         self._timeout = timeout
 
         self.initialized = False
+        self.capture = None
+        self.stats = ConnectionStats()
+
+        # Functions called with a TraceEvent for all communication.
+        self.trace_hooks = list(trace_hooks or [])
+        if debug and print_hook not in self.trace_hooks:
+            self.trace_hooks.append(print_hook)
 
         self._requester = None
 
@@ -89,10 +104,34 @@ class BLECommunicationBackend(object):
         """
         raise NotImplementedError("Use backend-specific classes instead!")
 
+    def is_connected(self):
+        """Check if the Bluetooth connection to the board is up.
+
+        :rtype: bool
+
+        """
+        raise NotImplementedError("Use backend-specific classes instead!")
+
+    def reconnect(self):
+        """Connect to the board again after the connection has been lost.
+
+        The ``libmetawear`` board object is kept, so the board is not
+        initialized again, and the notification characteristic is
+        subscribed to on the new connection.
+
+        """
+        try:
+            self.disconnect()
+        except Exception:
+            # The old connection is gone already.
+            pass
+        self.subscribe(METAWEAR_SERVICE_NOTIFY_CHAR[1],
+                       self.handle_notify_char_output)
+
     def subscribe(self, characteristic_uuid, callback):
         self._subscribe(characteristic_uuid, callback)
-        if self._debug:
-            self._print_debug_output("Subscribe", characteristic_uuid, [])
+        if self.trace_hooks:
+            self._trace(SUBSCRIBE, characteristic_uuid, b'')
 
     def mbl_mw_read_gatt_char(self, characteristic):
         """Read the desired data from the MetaWear board.
@@ -107,12 +146,13 @@ class BLECommunicationBackend(object):
             service_uuid, characteristic_uuid = self._mbl_mw_characteristic_2_uuids(
                 characteristic.contents)
         response = self.read_gatt_char_by_uuid(characteristic_uuid)
+        self.stats.reads += 1
         sb = self.read_response_to_str(response)
         libmetawear.mbl_mw_connection_char_read(
             self.board, characteristic, sb.raw, len(sb.raw))
 
-        if self._debug:
-            self._print_debug_output("Read", characteristic_uuid, response)
+        if self.trace_hooks:
+            self._trace(READ, characteristic_uuid, response)
 
     def mbl_mw_write_gatt_char(self, characteristic, command, length):
         """Write the desired data to the MetaWear board.
@@ -129,8 +169,10 @@ class BLECommunicationBackend(object):
             service_uuid, characteristic_uuid = self._mbl_mw_characteristic_2_uuids(
                 characteristic.contents)
         data_to_send = self.mbl_mw_command_to_input(command, length)
-        if self._debug:
-            self._print_debug_output("Write", characteristic_uuid, data_to_send)
+        self.stats.packets_out += 1
+        self.stats.bytes_out += length
+        if self.trace_hooks:
+            self._trace(WRITE, characteristic_uuid, data_to_send)
         self.write_gatt_char_by_uuid(characteristic_uuid, data_to_send)
 
     def _subscribe(self, characterisitic_uuid, callback):
@@ -145,19 +187,27 @@ class BLECommunicationBackend(object):
     # Callback methods
 
     def _initialized_fcn(self):
-        if self._debug:
-            print("{0} initialized.".format(self))
+        if self.trace_hooks:
+            self._trace(INIT, None, b'')
         self.initialized = True
 
     def handle_notify_char_output(self, handle, value):
-        if self._debug:
-            self._print_debug_output("Notify", handle, value)
+        if self.trace_hooks:
+            self._trace(NOTIFY, handle, value)
 
+        stats = self.stats
+        stats.packets_in += 1
+        stats.bytes_in += len(value)
         if handle == self._notify_char_handle:
+            if self.capture is not None:
+                self.capture.write(value)
+                if not self.capture.decode:
+                    return
             sb = self.notify_response_to_str(value)
             libmetawear.mbl_mw_connection_notify_char_changed(
                 self.board, sb.raw, len(sb.raw))
         else:
+            stats.errors += 1
             raise PyMetaWearException(
                 "Notification on unexpected handle: {0}".format(handle))
 
@@ -193,17 +243,8 @@ class BLECommunicationBackend(object):
                 uuid.UUID(int=(characteristic.uuid_high << 64) +
                                characteristic.uuid_low))
 
-    def _print_debug_output(self, action, handle_or_char, data):
-        if data and isinstance(data[0], int):
-            data_as_hex = " ".join(["{:02x}".format(b) for b in data])
-        else:
-            data_as_hex = " ".join(["{:02x}".format(ord(b)) for b in data])
-
-        if isinstance(handle_or_char, (uuid.UUID, string_types)):
-            handle = self.get_handle(handle_or_char)
-        elif isinstance(handle_or_char, int):
-            handle = handle_or_char
-        else:
-            handle = -1
-
-        print("{0:<6s} 0x{1:04x}: {2}".format(action, handle, data_as_hex))
+    def _trace(self, kind, characteristic, data):
+        event = TraceEvent(time.time(), kind, self._address,
+                           characteristic, bytes(bytearray(data)))
+        for hook in self.trace_hooks:
+            hook(event)
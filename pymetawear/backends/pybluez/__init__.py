@@ -41,13 +41,15 @@ class PyBluezBackend(BLECommunicationBackend):
     `gattlib <https://bitbucket.org/OscarAcena/pygattlib>`_ for BLE communication.
     """
 
-    def __init__(self, address, async=True, timeout=None, debug=False):
+    def __init__(self, address, async=True, timeout=None, debug=False,
+                 trace_hooks=None):
         self._primary_services = {}
         self._characteristics_cache = {}
         self._response = GATTResponse()
 
         super(PyBluezBackend, self).__init__(
-            address, async, 5.0 if timeout is None else timeout, debug)
+            address, async, 5.0 if timeout is None else timeout, debug,
+            trace_hooks)
 
     def _build_handle_dict(self):
         self._primary_services = {uuid.UUID(x.get('uuid')): (x.get('start'), x.get('end'))
@@ -92,6 +94,14 @@ class PyBluezBackend(BLECommunicationBackend):
             self._requester.disconnect()
             self._requester = None
 
+    def is_connected(self):
+        """Check if the GATTRequester is connected.
+
+        :rtype: bool
+
+        """
+        return self._requester is not None and self._requester.is_connected()
+
     def _subscribe(self, characteristic_uuid, callback):
         # Subscribe to Notify Characteristic.
         handle = self.get_handle(characteristic_uuid, notify_handle=True)
@@ -30,13 +30,14 @@ class PyGattBackend(BLECommunicationBackend):
     for BLE communication.
     """
 
-    def __init__(self, address, async=True, timeout=None, debug=False):
+    def __init__(self, address, async=True, timeout=None, debug=False,
+                 trace_hooks=None):
 
         self._backend = None
         super(PyGattBackend, self).__init__(
             address, async,
             DEFAULT_CONNECT_TIMEOUT_S if timeout is None else timeout,
-            debug)
+            debug, trace_hooks)
 
     @property
     def requester(self):
@@ -76,6 +77,15 @@ class PyGattBackend(BLECommunicationBackend):
         self._backend = None
         self._requester = None
 
+    def is_connected(self):
+        """Check if the connection via the GATTTool process is up.
+
+        :rtype: bool
+
+        """
+        return self._requester is not None and \
+            bool(self._requester._connected)
+
     def _subscribe(self, characteristic_uuid, callback):
         return self.requester.subscribe(str(characteristic_uuid), callback)
 
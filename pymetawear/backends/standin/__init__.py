@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-21
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import struct
+import threading
+from ctypes import create_string_buffer
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from pymetawear import specs
+from pymetawear.utils import range_, bytearray_to_str
+from pymetawear.backends import BLECommunicationBackend
+
+__all__ = ["StandInBackend"]
+
+# Register id of the module info reads, answered for all modules.
+_MODULE_INFO = 0x80
+
+#: Module info responses, implementation, revision and extra bytes,
+#: of a MetaWear RG board. Modules not present answer without any info.
+DEFAULT_MODULE_INFO = {
+    0x01: (0x00, 0x00),  # Switch
+    0x02: (0x00, 0x00),  # LED
+    0x03: (0x01, 0x01),  # Accelerometer, BMI160
+    0x04: (0x01, 0x00, 0x00, 0x03, 0x01, 0x02),  # Temperature, 4 channels
+    0x05: (0x00, 0x02),  # GPIO
+    0x06: (0x00, 0x00),  # NeoPixel
+    0x07: (0x00, 0x00),  # iBeacon
+    0x08: (0x00, 0x00),  # Haptic
+    0x09: (0x00, 0x00),  # Data processor
+    0x0a: (0x00, 0x00),  # Event
+    0x0b: (0x00, 0x02),  # Logging
+    0x0c: (0x00, 0x00),  # Timer
+    0x0d: (0x00, 0x01),  # I2C
+    0x0f: (0x00, 0x00),  # Macro
+    0x11: (0x00, 0x03),  # Settings
+    0x13: (0x00, 0x00),  # Gyroscope, BMI160
+    0xfe: (0x00, 0x00),  # Debug
+}
+
+#: Data of the responses to register reads, by module and register id.
+DEFAULT_RESPONSES = {
+    (0x01, 0x81): b'\x00',  # Switch state, released.
+    (0x0b, 0x84): b'\x00' * 5,  # Logging time reference.
+    (0x11, 0x8c): struct.pack(str('<BH'), 99, 4100),  # Battery state.
+}
+
+
+class StandInBackend(BLECommunicationBackend):
+    """
+    Backend standing in for a MetaWear board, without any Bluetooth
+    communication, for benchmarks and latency measurements offline.
+
+    Commands are answered like a board would answer them: module info
+    reads with the configured modules, and register reads with the
+    configured responses. Responses are delivered from a separate thread,
+    like notifications from a Bluetooth backend, after the configured
+    latency. Sensor data is delivered with :meth:`notify`, and a lost
+    connection is emulated with :meth:`drop`.
+
+    :param str address: A made-up address, to tell stand-ins apart.
+    :param float latency: Time from a command to its response, in seconds.
+    :param dict module_info: Module info responses by module id,
+        defaults to :data:`DEFAULT_MODULE_INFO`.
+    :param dict responses: Response data by module and register id,
+        merged with :data:`DEFAULT_RESPONSES`.
+
+    """
+
+    # The stand-in answers at once, so it is polled more often, to not
+    # dominate the construction time in benchmarks.
+    poll_interval = 0.001
+
+    def __init__(self, address, async=True, timeout=None, debug=False,
+                 trace_hooks=None, latency=0.0, module_info=None,
+                 responses=None):
+        self.latency = latency
+        self.module_info = dict(DEFAULT_MODULE_INFO if module_info is None
+                                else module_info)
+        self.responses = dict(DEFAULT_RESPONSES)
+        self.responses.update(responses or {})
+        self.n_commands = 0
+
+        self._connected = False
+        self._pending = None
+        self._delivery = None
+
+        super(StandInBackend, self).__init__(
+            address, async, timeout, debug, trace_hooks)
+
+    def _build_handle_dict(self):
+        self._handles = {
+            specs.METAWEAR_COMMAND_CHAR[1]: 0x0011,
+            specs.METAWEAR_SERVICE_NOTIFY_CHAR[1]: 0x000e,
+            specs.DEV_INFO_FIRMWARE_CHAR[1]: 0x0018,
+            specs.DEV_INFO_MODEL_CHAR[1]: 0x0016,
+        }
+        self._values = {
+            specs.DEV_INFO_FIRMWARE_CHAR[1]: bytearray(b'1.2.3'),
+            specs.DEV_INFO_MODEL_CHAR[1]: bytearray(b'1'),
+        }
+
+    @property
+    def requester(self):
+        """The stand-in has no requester.
+
+        :return: The backend itself.
+        :rtype: :class:`StandInBackend`
+
+        """
+        return self
+
+    def is_connected(self):
+        """Check if the stand-in board is connected.
+
+        :rtype: bool
+
+        """
+        return self._connected
+
+    def disconnect(self):
+        """Stop delivering responses."""
+        self._connected = False
+        if self._delivery is not None:
+            self._pending.put(None)
+            self._delivery.join()
+            self._delivery = None
+
+    def drop(self):
+        """Emulate a lost connection. Commands and notifications are
+        lost until the connection is restored with
+        :meth:`~pymetawear.backends.BLECommunicationBackend.reconnect`."""
+        self._connected = False
+
+    def notify(self, payload, delay=None):
+        """Deliver a notification, as if sent by the board.
+
+        :param bytearray payload: The notification payload, starting
+            with the module id and register id.
+        :param float delay: If given, the notification is delivered from
+            the response thread after this many seconds. Otherwise, it is
+            delivered in the calling thread before returning.
+
+        """
+        if not self._connected:
+            return
+        if delay is None:
+            self.handle_notify_char_output(self._notify_char_handle, payload)
+        else:
+            self._pending.put((time.time() + delay, bytearray(payload)))
+
+    def _deliver(self, pending):
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            due, payload = item
+            wait = due - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self.handle_notify_char_output(self._notify_char_handle, payload)
+
+    def _respond(self, command):
+        module_id, register = command[0], command[1]
+        if register == _MODULE_INFO:
+            data = bytearray(self.module_info.get(module_id, ()))
+        elif (module_id, register) in self.responses:
+            data = self.responses[(module_id, register)]
+            if callable(data):
+                data = data(command)
+            data = bytearray(data)
+        else:
+            return
+        self.notify(bytearray([module_id, register]) + data, self.latency)
+
+    def _subscribe(self, characteristic_uuid, callback):
+        # Notifications are passed to handle_notify_char_output directly,
+        # so subscribing only connects.
+        if self._delivery is None:
+            self._pending = queue.Queue()
+            self._delivery = threading.Thread(target=self._deliver,
+                                              args=(self._pending, ))
+            self._delivery.daemon = True
+            self._delivery.start()
+        self._connected = True
+
+    def read_gatt_char_by_uuid(self, characteristic_uuid):
+        """Read a device information value of the stand-in board.
+
+        :param uuid.UUID characteristic_uuid: The UUID to read from.
+        :return: The read data.
+        :rtype: bytearray
+
+        """
+        return self._values.get(characteristic_uuid, bytearray())
+
+    def write_gatt_char_by_uuid(self, characteristic_uuid, data_to_send):
+        """Write a command to the stand-in board, which queues the
+        response to it, if any.
+
+        :param uuid.UUID characteristic_uuid: The UUID to the characteristic
+            to write to.
+        :param bytearray data_to_send: Data to send.
+
+        """
+        if not self._connected:
+            return
+        self.n_commands += 1
+        if characteristic_uuid == specs.METAWEAR_COMMAND_CHAR[1] and \
+                len(data_to_send) >= 2:
+            self._respond(bytearray(data_to_send))
+
+    def get_handle(self, uuid, notify_handle=False):
+        """Get handle from characteristic UUID.
+
+        :param uuid.UUID uuid: The UUID to find handle to.
+        :param bool notify_handle:
+        :return: Integer handle.
+        :rtype: int
+
+        """
+        return self._handles.get(uuid, -1) + int(notify_handle)
+
+    @staticmethod
+    def mbl_mw_command_to_input(command, length):
+        return bytearray([command[i] for i in range_(length)])
+
+    @staticmethod
+    def read_response_to_str(response):
+        return create_string_buffer(bytearray_to_str(response), len(response))
+
+    @staticmethod
+    def notify_response_to_str(response):
+        return create_string_buffer(bytearray_to_str(response), len(response))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`batching`
+===============
+
+Accumulation of single samples into batches of NumPy arrays.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-03
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+
+
+class SampleBatcher(object):
+    """Collects timestamped samples into preallocated arrays.
+
+    When ``batch_size`` samples have been collected, the callback is called
+    with a ``(n, )`` array of epochs in milliseconds and a ``(n, m)`` array
+    of values. The arrays are handed over to the callback and are not
+    reused by the batcher, so they can be kept without copying.
+
+    Unless it is given, the number of values per sample is determined by
+    the first sample.
+
+    :param callable callback: Function to call with full batches.
+    :param int batch_size: Number of samples in each batch.
+    :param str dtype: NumPy data type of the value array.
+    :param int n_columns: Number of values per sample.
+
+    """
+
+    def __init__(self, callback, batch_size=1000, dtype='float64',
+                 n_columns=None):
+        self.callback = callback
+        self.batch_size = int(batch_size)
+        self.dtype = dtype
+        self.n_columns = None if n_columns is None else int(n_columns)
+        self.n_samples = 0
+
+        self._epochs = None
+        self._values = None
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def append(self, epoch, value):
+        """Add a sample.
+
+        :param int epoch: Timestamp of the sample, in milliseconds.
+        :param value: Tuple of sample values, or a single value.
+
+        """
+        if self._epochs is None:
+            if self.n_columns is None:
+                self.n_columns = len(value) \
+                    if isinstance(value, (tuple, list)) else 1
+            self._allocate()
+        self._epochs[self._n] = epoch
+        self._values[self._n] = value
+        self._n += 1
+        if self._n == self.batch_size:
+            self.flush()
+
+    def attach(self, module, **kwargs):
+        """Subscribe to notifications from a module, delivering
+        its samples in batches.
+
+        Example:
+
+        .. code-block:: python
+
+            batcher = SampleBatcher(handle_batch, batch_size=500)
+            batcher.attach(mwclient.magnetometer, packed=True)
+
+        :param pymetawear.modules.PyMetaWearModule module: The module
+            to subscribe to, e.g. ``mwclient.accelerometer``.
+        :param kwargs: Further keyword arguments to the module's
+            ``notifications`` method.
+
+        """
+        module.notifications(self.append, with_epoch=True, **kwargs)
+
+    def flush(self):
+        """Deliver collected samples, even if the batch is not full."""
+        if not self._n:
+            return
+        epochs, values = self._epochs[:self._n], self._values[:self._n]
+        self.n_samples += self._n
+        self._epochs, self._values, self._n = None, None, 0
+        self.callback(epochs, values)
+
+    def _allocate(self):
+        self._epochs = np.empty((self.batch_size, ), dtype='int64')
+        self._values = np.empty((self.batch_size, self.n_columns),
+                                dtype=self.dtype)
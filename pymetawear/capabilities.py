@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`capabilities`
+===================
+
+Registry of the possible settings of the sensors, parsed once per sensor
+class from the ``libmetawear`` constants and shared by all clients.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-16
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import re
+import threading
+from bisect import bisect_left
+
+from pymetawear.utils import string_types
+
+#: Setting names, allowed deviation of requested values and default unit,
+#: per prefix of the constants in the ``libmetawear`` sensor classes.
+#: A tolerance of ``None`` means the setting has named values.
+SETTINGS = {
+    'ODR': ('data_rate', 0.5),
+    'FSR': ('data_range', 0.1),
+    'GAIN': ('gain', 0.1),
+    'INTEGRATION_TIME': ('integration_time', 0.1),
+    'MEASUREMENT_RATE': ('measurement_rate', 0.1),
+    'OVERSAMPLING': ('oversampling', 0.1),
+    'PRESET': ('preset', None),
+}
+
+_NUMBER = re.compile('^([0-9]+(?:_[0-9]+)?)([A-Z]*)$')
+
+_lock = threading.Lock()
+_registry = {}
+_extras = {}
+
+
+class Capability(object):
+    """The possible values of one setting of a sensor.
+
+    Numeric values are kept sorted, so the nearest possible value of a
+    request is found by bisection.
+
+    :param str name: Name of the setting, e.g. ``data_rate``.
+    :param dict mapping: Dictionary from possible values to the
+        ``libmetawear`` constants to set them with.
+    :param float tolerance: Maximal deviation of a requested value from
+        a possible value. ``None`` for named values, which are matched
+        case insensitively.
+    :param str unit: Unit of the values, e.g. ``Hz``.
+
+    """
+
+    def __init__(self, name, mapping, tolerance=None, unit=None):
+        self.name = name
+        self.tolerance = tolerance
+        self.unit = unit
+        if tolerance is None:
+            self.mapping = {k.lower(): v for k, v in mapping.items()}
+            self.values = tuple(sorted(self.mapping))
+        else:
+            self.mapping = {float(k): v for k, v in mapping.items()}
+            self.values = tuple(sorted(self.mapping))
+            self._bounds = tuple((a + b) / 2 for a, b in
+                                 zip(self.values[:-1], self.values[1:]))
+
+    def __str__(self):
+        return "{0}: {1}{2}".format(
+            self.name, list(self.values),
+            " ({0})".format(self.unit) if self.unit else '')
+
+    def __repr__(self):
+        return "<Capability {0}>".format(str(self))
+
+    def __contains__(self, value):
+        try:
+            self.nearest(value)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    def nearest(self, value):
+        """Get the possible value nearest to a requested value.
+
+        :param value: The requested value.
+        :return: The possible value.
+        :raises ValueError: If no possible value is within tolerance.
+
+        """
+        if self.tolerance is None:
+            if isinstance(value, string_types) and \
+                    value.lower() in self.mapping:
+                return value.lower()
+        else:
+            k = self.values[bisect_left(self._bounds, value)]
+            if abs(value - k) <= self.tolerance:
+                return k
+        raise ValueError("Requested {0} ({1}) was not part of "
+                         "possible values: {2}".format(
+            self.name, value, list(self.values)))
+
+    def constant(self, value):
+        """Get the ``libmetawear`` constant for a requested value.
+
+        :param value: The requested value.
+        :return: The constant of the nearest possible value.
+        :raises ValueError: If no possible value is within tolerance.
+
+        """
+        return self.mapping[self.nearest(value)]
+
+    def as_dict(self):
+        """Get the capability as structured data.
+
+        :rtype: dict
+
+        """
+        return {
+            'name': self.name,
+            'values': list(self.values),
+            'unit': self.unit,
+            'tolerance': self.tolerance,
+        }
+
+
+def _parse(sensor_class):
+    mappings = {}
+    for k in dir(sensor_class):
+        for prefix, (name, tolerance) in SETTINGS.items():
+            if not k.startswith(prefix + '_'):
+                continue
+            value = k[len(prefix) + 1:]
+            if tolerance is None:
+                unit = None
+            else:
+                match = _NUMBER.match(value)
+                if match is None:
+                    continue
+                value, unit = match.groups()
+                value = float(value.replace('_', '.'))
+                unit = {'HZ': 'Hz', 'X': None}.get(unit, unit.lower())
+            mappings.setdefault((name, tolerance, unit), {})[value] = \
+                getattr(sensor_class, k)
+    return {name: Capability(name, mapping, tolerance, unit)
+            for (name, tolerance, unit), mapping in mappings.items()}
+
+
+def register(sensor_class, **capabilities):
+    """Register capabilities of a sensor class that are not described by
+    its constants, e.g. a range shared with another sensor class.
+
+    Must be called before the first call to :func:`get_capabilities`
+    for the sensor class.
+
+    :param sensor_class: The sensor class.
+    :param capabilities: :class:`Capability` objects by setting name.
+
+    """
+    with _lock:
+        _extras.setdefault(sensor_class, {}).update(capabilities)
+        _registry.pop(sensor_class, None)
+
+
+def get_capabilities(sensor_class):
+    """Get the capabilities of a sensor class, computed on first use.
+
+    The returned dictionary is shared and must not be modified.
+
+    :param sensor_class: The sensor class, e.g.
+        ``mbientlab.metawear.sensor.GyroBmi160``.
+    :return: Dictionary of :class:`Capability` objects by setting name.
+    :rtype: dict
+
+    """
+    capabilities = _registry.get(sensor_class)
+    if capabilities is None:
+        with _lock:
+            capabilities = _registry.get(sensor_class)
+            if capabilities is None:
+                capabilities = _parse(sensor_class)
+                capabilities.update(_extras.get(sensor_class, {}))
+                _registry[sensor_class] = capabilities
+    return capabilities
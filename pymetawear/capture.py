@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`capture`
+==============
+
+Capture of raw MetaWear notifications to file, and offline decoding
+of such captures.
+
+A capture file starts with a header of the magic bytes ``PYMWCAP``,
+a version byte and the record payload size as an unsigned 16 bit integer.
+It is followed by fixed-size records of the host time of reception,
+as a double, the payload length, as a byte, and the payload, padded
+with zeros to the payload size. The fixed record size lets the decoder
+read an entire capture as one NumPy array, without any parsing.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-06
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+import time
+import struct
+
+import numpy as np
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.packets import ACC_LSB_PER_G, GYRO_LSB_PER_DPS, \
+    decode_accelerometer, decode_gyroscope
+
+CAPTURE_MAGIC = b'PYMWCAP'
+CAPTURE_VERSION = 1
+_FILE_HEADER = struct.Struct(str('<7sBH'))
+_RECORD_HEADER = struct.Struct(str('<dB'))
+
+#: Largest notification payload with the default BLE MTU.
+DEFAULT_PAYLOAD_SIZE = 20
+
+# Module and register ids of the notifications handled by the decoder.
+_SWITCH_STATE = (0x01, 0x01)
+_BATTERY_STATE = (0x11, 0x8c)
+
+
+def record_dtype(payload_size=DEFAULT_PAYLOAD_SIZE):
+    """The NumPy data type of a capture record.
+
+    :param int payload_size: Payload size of the capture.
+    :rtype: :class:`numpy.dtype`
+
+    """
+    return np.dtype([(str('time'), '<f8'), (str('length'), 'u1'),
+                     (str('payload'), 'u1', (payload_size, ))])
+
+
+class NotificationCapture(object):
+    """Append-only capture of raw notifications to a file.
+
+    Enable on a client with :meth:`MetaWearClient.start_capture`, which
+    makes the backend pass every notification to :meth:`write`.
+
+    :param str path: Path to the capture file. An existing capture
+        is appended to.
+    :param bool decode: If ``False``, captured notifications are not
+        passed on to ``libmetawear`` for decoding, so no module callbacks
+        are called during capture.
+    :param int payload_size: Maximal payload length to store. Longer
+        payloads are truncated.
+
+    """
+
+    def __init__(self, path, decode=False,
+                 payload_size=DEFAULT_PAYLOAD_SIZE):
+        self.path = path
+        self.decode = decode
+        self.n_records = 0
+        self.n_truncated = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                _, _, self.payload_size = _read_file_header(f)
+            self._file = open(path, 'ab')
+        else:
+            self.payload_size = int(payload_size)
+            self._file = open(path, 'ab')
+            self._file.write(_FILE_HEADER.pack(
+                CAPTURE_MAGIC, CAPTURE_VERSION, self.payload_size))
+        self._padding = b'\x00' * self.payload_size
+
+    def __str__(self):
+        return "NotificationCapture: {0}, {1} records".format(
+            self.path, self.n_records)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def write(self, value):
+        """Store a notification payload with the current host time.
+
+        :param bytearray value: The notification payload.
+
+        """
+        n = len(value)
+        if n > self.payload_size:
+            value = value[:self.payload_size]
+            n = self.payload_size
+            self.n_truncated += 1
+        if not isinstance(value, (bytes, bytearray)):
+            value = value.encode('latin1')
+        self._file.write(_RECORD_HEADER.pack(time.time(), n))
+        self._file.write(value)
+        self._file.write(self._padding[n:])
+        self.n_records += 1
+
+    def close(self):
+        """Flush and close the capture file."""
+        self._file.close()
+
+
+def _read_file_header(f):
+    header = f.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size:
+        raise PyMetaWearException("Not a PyMetaWear capture file.")
+    magic, version, payload_size = _FILE_HEADER.unpack(header)
+    if magic != CAPTURE_MAGIC:
+        raise PyMetaWearException("Not a PyMetaWear capture file.")
+    if version != CAPTURE_VERSION:
+        raise PyMetaWearException(
+            "Unsupported capture file version: {0}".format(version))
+    return magic, version, payload_size
+
+
+def read_capture(path):
+    """Read all records of a capture file.
+
+    The records are memory-mapped, so reading is fast even
+    for very large captures.
+
+    :param str path: Path to the capture file.
+    :return: A record array with fields ``time``, ``length``
+        and ``payload``.
+    :rtype: :class:`numpy.ndarray`
+
+    """
+    with open(path, 'rb') as f:
+        _, _, payload_size = _read_file_header(f)
+    dtype = record_dtype(payload_size)
+    n = (os.path.getsize(path) - _FILE_HEADER.size) // dtype.itemsize
+    if n == 0:
+        return np.empty((0, ), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r',
+                     offset=_FILE_HEADER.size, shape=(n, ))
+
+
+def _select(records, module_register, length):
+    payloads = records['payload']
+    mask = ((payloads[:, 0] == module_register[0]) &
+            (payloads[:, 1] == module_register[1]) &
+            (records['length'] == length))
+    return records['time'][mask], payloads[mask]
+
+
+def _int16_columns(payloads, start, n_columns):
+    raw = np.ascontiguousarray(payloads[:, start:start + 2 * n_columns])
+    return raw.view('<i2').reshape((len(payloads), n_columns))
+
+
+def decode_capture(path, acc_range=2.0, gyro_range=2000.0):
+    """Decode the notifications of a capture file into arrays per signal.
+
+    Decodes BMI160 and BMA255 accelerometer data, BMI160 gyroscope data,
+    both unpacked and packed, switch states and battery states. The
+    accelerometer and gyroscope ranges used during the capture must be
+    given, since they are not part of the notifications.
+
+    :param str path: Path to the capture file.
+    :param float acc_range: The accelerometer data range in ``g``.
+    :param float gyro_range: The gyroscope data range in ``dps``.
+    :return: Dictionary with keys ``accelerometer``, ``gyroscope``,
+        ``switch`` and ``battery``, each with a tuple of an array of
+        host times, in seconds, and an array of values.
+    :rtype: dict
+
+    """
+    if float(acc_range) not in ACC_LSB_PER_G:
+        raise ValueError("Unknown accelerometer range: {0}".format(acc_range))
+    if float(gyro_range) not in GYRO_LSB_PER_DPS:
+        raise ValueError("Unknown gyroscope range: {0}".format(gyro_range))
+
+    records = read_capture(path)
+    output = {}
+
+    output['accelerometer'] = decode_accelerometer(
+        records['payload'], records['length'], acc_range, records['time'])
+    output['gyroscope'] = decode_gyroscope(
+        records['payload'], records['length'], gyro_range, records['time'])
+
+    t, payloads = _select(records, _SWITCH_STATE, 3)
+    output['switch'] = (t, payloads[:, 2:3].astype('uint8'))
+
+    t, payloads = _select(records, _BATTERY_STATE, 5)
+    battery = np.empty((len(t), 2), dtype='uint16')
+    battery[:, 0] = _int16_columns(payloads, 3, 1)[:, 0].view('<u2')
+    battery[:, 1] = payloads[:, 2]
+    output['battery'] = (t, battery)
+
+    return output
@@ -21,8 +21,11 @@ import signal
 from pymetawear import libmetawear, specs
 from pymetawear.exceptions import *
 from pymetawear import modules
+from pymetawear.capture import NotificationCapture
+from pymetawear.reconnect import AutoReconnect
 from pymetawear.backends.pygatt import PyGattBackend
 from pymetawear.backends.pybluez import PyBluezBackend
+from pymetawear.backends.standin import StandInBackend
 
 
 def discover_devices(timeout=5, only_metawear=True):
@@ -85,26 +88,42 @@ class MetaWearClient(object):
 
     :param str address: A Bluetooth MAC address to a MetaWear board.
     :param str backend: Either ``pygatt`` or ``pybluez``, designating which
-        BLE communication backend that should be used.
+        BLE communication backend that should be used, or ``standin``
+        for a board emulated without Bluetooth, see
+        :class:`pymetawear.backends.standin.StandInBackend`.
     :param float timeout: Timeout for connecting to the MetaWear board. If
         ``None`` timeout defaults to the backend default.
     :param bool debug: If printout of all sent and received
         data should be done.
+    :param list trace_hooks: Functions to call with a
+        :class:`pymetawear.tracing.TraceEvent` for all communication
+        with the board, including the initialization.
+    :param bool auto_reconnect: If ``True``, the client reconnects when
+        the connection is lost, see :meth:`~enable_auto_reconnect`.
 
     """
 
-    def __init__(self, address, backend='pygatt', timeout=None, debug=False):
+    def __init__(self, address, backend='pygatt', timeout=None, debug=False,
+                 trace_hooks=None, auto_reconnect=False):
         """Constructor."""
         self._address = address
         self._debug = debug
         self._initialized = False
+        self._disconnected = False
+        self.reconnector = None
 
         if backend == 'pygatt':
             self._backend = PyGattBackend(
-                self._address, timeout=timeout, debug=debug)
+                self._address, timeout=timeout, debug=debug,
+                trace_hooks=trace_hooks)
         elif backend == 'pybluez':
             self._backend = PyBluezBackend(
-                self._address, timeout=timeout, debug=debug)
+                self._address, timeout=timeout, debug=debug,
+                trace_hooks=trace_hooks)
+        elif backend == 'standin':
+            self._backend = StandInBackend(
+                self._address, timeout=timeout, debug=debug,
+                trace_hooks=trace_hooks)
         else:
             raise PyMetaWearException("Unknown backend: {0}".format(backend))
 
@@ -113,7 +132,7 @@ class MetaWearClient(object):
 
         while not (libmetawear.mbl_mw_metawearboard_is_initialized(
                 self.board) and self.backend.initialized):
-            time.sleep(0.1)
+            time.sleep(self.backend.poll_interval)
 
         self.firmware_version = tuple(
             [int(x) for x in self.backend.read_gatt_char_by_uuid(
@@ -132,10 +151,45 @@ class MetaWearClient(object):
             libmetawear.mbl_mw_metawearboard_lookup_module(
                 self.board, modules.Modules.MBL_MW_MODULE_GYRO),
             debug=self._debug)
+        self.magnetometer = modules.MagnetometerModule(
+            self.board,
+            libmetawear.mbl_mw_metawearboard_lookup_module(
+                self.board, modules.Modules.MBL_MW_MODULE_MAGNETOMETER),
+            debug=self._debug)
+        self.barometer = modules.BarometerModule(
+            self.board,
+            libmetawear.mbl_mw_metawearboard_lookup_module(
+                self.board, modules.Modules.MBL_MW_MODULE_BAROMETER),
+            debug=self._debug)
+        self.timer = modules.TimerModule(self.board, debug=self._debug)
+        self.temperature = modules.TemperatureModule(
+            self.board,
+            libmetawear.mbl_mw_metawearboard_lookup_module(
+                self.board, modules.Modules.MBL_MW_MODULE_TEMPERATURE),
+            debug=self._debug, timer_module=self.timer)
+        self.humidity = modules.HumidityModule(
+            self.board,
+            libmetawear.mbl_mw_metawearboard_lookup_module(
+                self.board, modules.Modules.MBL_MW_MODULE_HUMIDITY),
+            debug=self._debug, timer_module=self.timer)
+        self.ambient_light = modules.AmbientLightModule(
+            self.board,
+            libmetawear.mbl_mw_metawearboard_lookup_module(
+                self.board, modules.Modules.MBL_MW_MODULE_AMBIENT_LIGHT),
+            debug=self._debug)
         self.switch = modules.SwitchModule(self.board, debug=self._debug)
         self.battery = modules.BatteryModule(self.board, debug=self._debug)
+        self.settings = modules.SettingsModule(self.board, debug=self._debug)
         self.haptic = modules.HapticModule(self.board, debug=self._debug)
         self.led = modules.LEDModule(self.board, debug=self._debug)
+        self.logging = modules.LoggingModule(self.board, debug=self._debug)
+        self.dataprocessor = modules.DataProcessorModule(
+            self.board, debug=self._debug)
+        self.event = modules.EventModule(self.board, debug=self._debug)
+        self.macro = modules.MacroModule(self.board, debug=self._debug)
+
+        if auto_reconnect:
+            self.enable_auto_reconnect()
 
     def __str__(self):
         return "MetaWearClient, {0}".format(self._address)
@@ -158,11 +212,64 @@ class MetaWearClient(object):
         return self.backend.board
 
     def disconnect(self):
-        """Disconnects this client from the MetaWear board."""
+        """Disconnects this client from the MetaWear board. The board
+        is freed on the first call only."""
+        if self._disconnected:
+            return
+        self._disconnected = True
+        self.disable_auto_reconnect()
         libmetawear.mbl_mw_metawearboard_tear_down(self.board)
         libmetawear.mbl_mw_metawearboard_free(self.board)
         self.backend.disconnect()
 
+    def enable_auto_reconnect(self, **kwargs):
+        """Reconnect automatically when the connection is lost, with
+        backoff between attempts, and restore the session of the client.
+
+        .. code-block:: python
+
+            def report(event):
+                print("Down for {0:.1f} s, {1} writes to restore".format(
+                    event.downtime, event.writes))
+
+            mwclient.enable_auto_reconnect(callback=report)
+
+        :param kwargs: Keyword arguments to
+            :class:`pymetawear.reconnect.AutoReconnect`, e.g.
+            ``check_interval``, ``max_delay`` or ``callback``.
+        :return: The reconnection watchdog, with the reconnection
+            events in ``events``.
+        :rtype: :class:`pymetawear.reconnect.AutoReconnect`
+
+        """
+        self.disable_auto_reconnect()
+        self.reconnector = AutoReconnect(self, **kwargs)
+        self.reconnector.start()
+        return self.reconnector
+
+    def disable_auto_reconnect(self):
+        """Stop reconnecting automatically."""
+        if self.reconnector is not None:
+            self.reconnector.stop()
+
+    def restore_session(self):
+        """Write the settings shadow and subscriptions of all modules
+        to the board again, e.g. after a reconnection.
+
+        Settings are written before subscriptions, so that sampling is
+        started with the restored settings. Only settings set by this
+        client and active subscriptions are written, but all of them,
+        since the host cannot tell which of them the board still holds,
+        e.g. if it has been reset while disconnected.
+
+        """
+        active = [m for m in vars(self).values()
+                  if isinstance(m, modules.PyMetaWearModule)]
+        for module in active:
+            module.reapply(subscription=False)
+        for module in active:
+            module.reapply(settings=False)
+
     def get_handle(self, uuid, notify_handle=False):
         """Get handle for a characteristic UUID.
 
@@ -174,15 +281,97 @@ class MetaWearClient(object):
         """
         return self.backend.get_handle(uuid, notify_handle=notify_handle)
 
-    def _set_logging_state(self, enabled=False):
-        if enabled:
-            libmetawear.mbl_mw_logging_start(self.board)
-        else:
-            libmetawear.mbl_mw_logging_stop(self.board)
+    def add_trace_hook(self, hook):
+        """Register a function to call with a
+        :class:`pymetawear.tracing.TraceEvent` for all communication
+        with the board.
+
+        :param callable hook: The function.
+
+        """
+        if hook not in self.backend.trace_hooks:
+            self.backend.trace_hooks.append(hook)
+
+    def remove_trace_hook(self, hook):
+        """Unregister a trace hook.
 
-    def _download_log(self, n_notifies):
-        libmetawear.mbl_mw_logging_download(self.board, n_notifies)
+        :param callable hook: The function.
+
+        """
+        if hook in self.backend.trace_hooks:
+            self.backend.trace_hooks.remove(hook)
+
+    def start_capture(self, path, decode=False):
+        """Start capturing raw notifications from the board to file.
+
+        The capture can be decoded afterwards with
+        :func:`pymetawear.capture.decode_capture`. Set up all
+        subscriptions before starting the capture, since ``libmetawear``
+        receives no notifications during it unless ``decode`` is ``True``.
+
+        :param str path: Path to the capture file.
+        :param bool decode: If notifications should also be decoded
+            and delivered to module callbacks during capture.
+        :return: The capture object.
+        :rtype: :class:`pymetawear.capture.NotificationCapture`
+
+        """
+        if self.backend.capture is not None:
+            raise PyMetaWearException("A capture is already running.")
+        self.backend.capture = NotificationCapture(path, decode=decode)
+        return self.backend.capture
+
+    def stop_capture(self):
+        """Stop capturing raw notifications and close the capture file."""
+        capture, self.backend.capture = self.backend.capture, None
+        if capture is not None:
+            capture.close()
+
+    def stats(self, reset=False):
+        """Get runtime statistics of the connection and of the module
+        signals that have delivered samples.
+
+        .. code-block:: python
+
+            s = mwclient.stats()
+            acc = s['signals']['accelerometer']
+            print("{0:.1f} Hz of {1} Hz".format(
+                acc['rate'], acc['configured_rate']))
+
+        :param bool reset: If ``True``, counting is restarted after
+            the statistics have been collected.
+        :return: Dictionary with the connection counters under
+            ``connection``, see
+            :meth:`pymetawear.stats.ConnectionStats.as_dict`, and the
+            signal counters by module attribute name under ``signals``,
+            see :meth:`pymetawear.stats.SignalStats.as_dict`, with the
+            counters of :meth:`pymetawear.monitor.SignalMonitor.as_dict`
+            for monitored signals.
+        :rtype: dict
+
+        """
+        signals = {}
+        for name, module in vars(self).items():
+            if not isinstance(module, modules.PyMetaWearModule):
+                continue
+            if module.stats.samples or module.stats.errors:
+                signals[name] = module.stats.as_dict(
+                    module.get_current_settings().get('data_rate'))
+                if module.monitor is not None:
+                    signals[name].update(module.monitor.as_dict())
+            if reset:
+                module.stats.reset()
+                if module.monitor is not None:
+                    module.monitor.reset()
+        output = {'connection': self.backend.stats.as_dict(),
+                  'signals': signals}
+        if reset:
+            self.backend.stats.reset()
+        return output
 
     def soft_reset(self):
         """Issues a soft reset to the board."""
         libmetawear.mbl_mw_debug_reset(self.board)
+        for module in vars(self).values():
+            if isinstance(module, modules.PyMetaWearModule):
+                module.clear_settings()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`decoding`
+===============
+
+Decoding of ``libmetawear`` data pointers in notification callbacks.
+
+Each :class:`~pymetawear.mbientlab.metawear.core.DataTypeId` has a
+precompiled :class:`struct.Struct`, reading all fields of a value in one
+call instead of building a ctypes object per field.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-17
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import struct
+from functools import wraps
+from ctypes import string_at
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+
+#: Structs of the values, and if they are delivered as a single value,
+#: per data type id.
+READERS = {
+    DataTypeId.CARTESIAN_FLOAT: (struct.Struct(str('<fff')), False),
+    DataTypeId.BATTERY_STATE: (struct.Struct(str('<HB')), False),
+    DataTypeId.UINT32: (struct.Struct(str('<I')), True),
+    DataTypeId.INT32: (struct.Struct(str('<i')), True),
+    DataTypeId.FLOAT: (struct.Struct(str('<f')), True),
+}
+
+
+def _incorrect_type(contents):
+    raise PyMetaWearException('Incorrect data type id: {0}'.format(
+        contents.type_id))
+
+
+def read_value(data):
+    """Read the value of a data pointer as a tuple, whatever its type.
+
+    :param data: A :class:`ctypes.POINTER` to a ``Data`` structure.
+    :return: The value(s) of the data.
+    :rtype: tuple
+
+    """
+    contents = data.contents
+    reader = READERS.get(contents.type_id)
+    if reader is None:
+        _incorrect_type(contents)
+    return reader[0].unpack(string_at(contents.value, reader[0].size))
+
+
+def data_handler(func, type_id, with_epoch=False):
+    """Wrap a callback to receive decoded data of one type.
+
+    Data of a single value, e.g. ``UINT32``, is delivered as that value,
+    and other data as a tuple.
+
+    :param callable func: The callback.
+    :param int type_id: The expected data type id.
+    :param bool with_epoch: If ``True``, the callback is called with
+        the board timestamp in milliseconds as first argument and
+        the data as second.
+    :return: Function taking a data pointer.
+    :rtype: callable
+
+    """
+    reader, scalar = READERS[type_id]
+    size = reader.size
+    unpack = reader.unpack
+
+    if scalar and with_epoch:
+        @wraps(func)
+        def wrapper(data):
+            contents = data.contents
+            if contents.type_id != type_id:
+                _incorrect_type(contents)
+            func(contents.epoch, unpack(string_at(contents.value, size))[0])
+    elif scalar:
+        @wraps(func)
+        def wrapper(data):
+            contents = data.contents
+            if contents.type_id != type_id:
+                _incorrect_type(contents)
+            func(unpack(string_at(contents.value, size))[0])
+    elif with_epoch:
+        @wraps(func)
+        def wrapper(data):
+            contents = data.contents
+            if contents.type_id != type_id:
+                _incorrect_type(contents)
+            func(contents.epoch, unpack(string_at(contents.value, size)))
+    else:
+        @wraps(func)
+        def wrapper(data):
+            contents = data.contents
+            if contents.type_id != type_id:
+                _incorrect_type(contents)
+            func(unpack(string_at(contents.value, size)))
+    return wrapper
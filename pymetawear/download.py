@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`download`
+===============
+
+Resumable log downloads, persisted to disk in chunks.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-04
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+import json
+
+import numpy as np
+
+from pymetawear.exceptions import PyMetaWearException
+
+MANIFEST_FILE_NAME = 'manifest.json'
+
+
+def _fsync_directory(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _durable_write(path, write_func):
+    """Write a file via a temporary file, so it is either
+    completely written to disk or not present at all."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write_func(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+class ResumableLogDownload(object):
+    """Downloads logged entries to disk, surviving dropped connections.
+
+    Entries are collected per logger and every ``chunk_size`` entries are
+    written as a chunk file to ``directory``, after which a manifest
+    keeping track of the stored entries per logger is updated. Only
+    entries that are durably written count as downloaded.
+
+    If the connection drops during the download, create a new download
+    with the same directory once the board is reconnected and run it
+    again. The board can only download its log from the start, so the
+    entries already stored are downloaded again, but they are not stored
+    twice: the entries of each logger arrive in the same order in every
+    download, so the first as many entries as are stored for a logger
+    are skipped. The entries are cleared from the board only after a
+    download has completed and every chunk is written, so the log is
+    unchanged between the downloads.
+
+    Example:
+
+    .. code-block:: python
+
+        dl = ResumableLogDownload(mwclient.logging, '/data/board_1')
+        dl.run()
+        epochs, values = dl.load('acc')
+
+    :param pymetawear.modules.LoggingModule logging_module: The logging
+        module of a connected client, with its loggers added.
+    :param str directory: Directory to store chunks and manifest in.
+    :param int chunk_size: Number of entries in each chunk file.
+
+    """
+
+    def __init__(self, logging_module, directory, chunk_size=10000):
+        self.logging_module = logging_module
+        self.directory = directory
+        self.chunk_size = int(chunk_size)
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self._manifest_path = os.path.join(self.directory, MANIFEST_FILE_NAME)
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'loggers': {}, 'completed': False}
+        self._skip = {}
+
+    def __str__(self):
+        return "ResumableLogDownload: {0}, {1}".format(
+            self.directory, self.progress())
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    @property
+    def completed(self):
+        """If a download has completed and the board has been cleared.
+
+        :rtype: bool
+
+        """
+        return self.manifest.get('completed', False)
+
+    def progress(self):
+        """The number of stored entries, per logger.
+
+        :rtype: dict
+
+        """
+        return {name: logger['n_entries'] for name, logger in
+                self.manifest['loggers'].items()}
+
+    def run(self, progress_callback=None, n_notifies=100, timeout=30.0,
+            clear=True):
+        """Download all logged entries not already stored.
+
+        :param callable progress_callback: Function to call with the
+            number of entries left and the total number of entries on
+            the board as the download progresses.
+        :param int n_notifies: How many progress updates the board
+            should send during the download.
+        :param float timeout: Maximal time without entries or progress
+            updates from the board, in seconds. If ``None``, wait
+            indefinitely.
+        :param bool clear: If the entries should be removed from the
+            board after they have all been stored.
+
+        """
+        names = list(self.logging_module.loggers.keys())
+        for name in names:
+            self.manifest['loggers'].setdefault(name, {
+                'n_entries': 0,
+                'chunks': []
+            })
+        self.manifest['completed'] = False
+        self._write_manifest()
+        # Number of entries to skip per logger, being the entries stored
+        # by an earlier download.
+        self._skip = {name: logger['n_entries']
+                      for name, logger in self.manifest['loggers'].items()}
+
+        self.logging_module.download(
+            {name: self._chunk_writer(name) for name in names},
+            batch_size=self.chunk_size,
+            progress_callback=progress_callback,
+            n_notifies=n_notifies, timeout=timeout)
+
+        if clear:
+            self.logging_module.clear_entries()
+        self.manifest['completed'] = True
+        self._write_manifest()
+
+    def load(self, name):
+        """Load all stored entries for a logger.
+
+        :param str name: Name of the logger.
+        :return: Array of epochs and array of values.
+        :rtype: tuple
+
+        """
+        logger = self.manifest['loggers'].get(name)
+        if logger is None:
+            raise PyMetaWearException(
+                "No stored entries for logger {0}.".format(name))
+        chunks = [np.load(os.path.join(self.directory, chunk_file))
+                  for chunk_file in logger['chunks']]
+        if not chunks:
+            return np.empty((0, ), 'int64'), np.empty((0, 0), 'float64')
+        data = np.concatenate(chunks)
+        return data['epoch'], data['value']
+
+    def _chunk_writer(self, name):
+        def write_chunk(epochs, values):
+            logger = self.manifest['loggers'][name]
+            epochs, values = self._skip_stored(name, epochs, values)
+            if not len(epochs):
+                return
+            chunk = np.empty((len(epochs), ), dtype=[
+                ('epoch', 'int64'), ('value', values.dtype, values.shape[1:])])
+            chunk['epoch'] = epochs
+            chunk['value'] = values
+            chunk_file = "{0}_{1:06d}.npy".format(name, len(logger['chunks']))
+            _durable_write(os.path.join(self.directory, chunk_file),
+                           lambda f: np.save(f, chunk))
+
+            logger['n_entries'] += len(epochs)
+            logger['chunks'].append(chunk_file)
+            self._write_manifest()
+        return write_chunk
+
+    def _skip_stored(self, name, epochs, values):
+        # Entries are downloaded in the order of the log, so the stored
+        # entries are the first ones of the logger.
+        n_skip = min(self._skip.get(name, 0), len(epochs))
+        if n_skip:
+            self._skip[name] -= n_skip
+        return epochs[n_skip:], values[n_skip:]
+
+    def _write_manifest(self):
+        content = json.dumps(self.manifest, indent=2, sort_keys=True)
+        _durable_write(self._manifest_path,
+                       lambda f: f.write(content.encode('utf-8')))
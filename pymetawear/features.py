@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`features`
+===============
+
+Incremental extraction of windowed features from data streams.
+
+Features are computed over windows of ``window`` samples, starting every
+``hop`` samples. Every sample is added once to aggregates of blocks of
+``gcd(window, hop)`` samples, and the features of a window are combined
+from the aggregates of its blocks. Only the aggregates of the blocks of
+the last window are kept, so raw samples can be dropped as they arrive.
+
+The features are delivered in batches of a ``(n, )`` array of the epochs
+of the last sample of each window, and a ``(n, m)`` array of features, in
+the order of :attr:`WindowedFeatures.column_names`. They can thereby be
+passed on to e.g. :meth:`pymetawear.recording.StreamWriter.append_batch`.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-28
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+
+import numpy as np
+
+from pymetawear.batching import SampleBatcher
+from pymetawear.exceptions import PyMetaWearException
+
+#: Features that can be extracted.
+FEATURES = ('rms', 'peak', 'variance', 'zero_crossings')
+
+
+class WindowedFeatures(object):
+    """Extracts features over sliding windows of a data stream.
+
+    Example:
+
+    .. code-block:: python
+
+        def handle_features(epochs, features):
+            # Handle (n, 12) array of RMS, peak, variance and zero
+            # crossings of x, y and z of windows ending at epochs.
+            print(features[-1])
+
+        extractor = WindowedFeatures(handle_features, window=256, hop=128)
+        extractor.attach(mwclient.accelerometer)
+
+    :param callable callback: Function to call with the epochs and
+        features of completed windows.
+    :param int window: Number of samples in each window.
+    :param int hop: Number of samples between the starts of windows.
+    :param tuple features: Features to extract, of :data:`FEATURES`.
+    :param tuple columns: Names of the values of a sample.
+
+    """
+
+    def __init__(self, callback, window=256, hop=128, features=FEATURES,
+                 columns=('x', 'y', 'z')):
+        self.callback = callback
+        self.window = int(window)
+        self.hop = int(hop)
+        if self.window < 1 or self.hop < 1:
+            raise ValueError("Window and hop must be positive.")
+        for feature in features:
+            if feature not in FEATURES:
+                raise PyMetaWearException(
+                    "Unknown feature: {0}. Use any of {1}".format(
+                        feature, FEATURES))
+        self.features = tuple(features)
+        self.columns = tuple(columns)
+        self.n_windows = 0
+
+        self._block_size = gcd(self.window, self.hop)
+        self._window_blocks = self.window // self._block_size
+        self._hop_blocks = self.hop // self._block_size
+        self._batcher = SampleBatcher(self.append_batch, self.hop,
+                                      n_columns=len(self.columns))
+        self.reset()
+
+    def __str__(self):
+        return "WindowedFeatures: {0} over {1} samples every {2}".format(
+            ", ".join(self.features), self.window, self.hop)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    @property
+    def column_names(self):
+        """Names of the feature columns, e.g. ``x_rms``.
+
+        :rtype: list
+
+        """
+        return ["{0}_{1}".format(c, f)
+                for c in self.columns for f in self.features]
+
+    def reset(self):
+        """Discard all samples and aggregates, starting the next window
+        with the next sample."""
+        n_columns = len(self.columns)
+        self._pending_epochs = np.empty((0, ), dtype='int64')
+        self._pending = np.empty((0, n_columns))
+        self._last_negative = None
+        # Aggregates of the blocks of the last window:
+        # sum, sum of squares, peak, crossings and crossing at first sample.
+        self._blocks = [np.empty((0, n_columns)) for _ in range(5)]
+        self._n_blocks = 0
+
+    def append(self, epoch, value):
+        """Add a sample.
+
+        :param int epoch: Timestamp of the sample, in milliseconds.
+        :param value: Tuple of sample values, or a single value.
+
+        """
+        self._batcher.append(epoch, value)
+
+    def attach(self, module, **kwargs):
+        """Subscribe to notifications from a module, extracting
+        features from its samples.
+
+        :param pymetawear.modules.PyMetaWearModule module: The module
+            to subscribe to, e.g. ``mwclient.accelerometer``.
+        :param kwargs: Further keyword arguments to the module's
+            ``notifications`` method.
+
+        """
+        module.notifications(self.append, with_epoch=True, **kwargs)
+
+    def append_batch(self, epochs, values):
+        """Add a batch of samples, e.g. from a
+        :class:`~pymetawear.batching.SampleBatcher`, and deliver the
+        features of the windows completed by it.
+
+        :param array_like epochs: Timestamps in milliseconds.
+        :param array_like values: Array of shape ``(n, n_columns)``.
+
+        """
+        values = np.asarray(values, dtype='float64').reshape(
+            (-1, len(self.columns)))
+        if len(self._pending):
+            epochs = np.concatenate((self._pending_epochs, epochs))
+            values = np.concatenate((self._pending, values))
+        else:
+            epochs = np.asarray(epochs)
+
+        g = self._block_size
+        n_blocks = len(values) // g
+        n = n_blocks * g
+        self._pending_epochs, self._pending = epochs[n:], values[n:]
+        if not n_blocks:
+            return
+
+        x = values[:n]
+        negative = np.signbit(x)
+        crossings = np.empty(negative.shape, dtype='float64')
+        crossings[1:] = negative[1:] != negative[:-1]
+        crossings[0] = False if self._last_negative is None else \
+            negative[0] != self._last_negative
+        self._last_negative = negative[-1]
+
+        blocks = x.reshape((n_blocks, g, -1))
+        new = (blocks.sum(axis=1),
+               np.square(blocks).sum(axis=1),
+               np.abs(blocks).max(axis=1),
+               crossings.reshape((n_blocks, g, -1)).sum(axis=1),
+               crossings[::g])
+        aggregates = [np.concatenate((old, a))
+                      for old, a in zip(self._blocks, new)]
+
+        # Positions in the aggregates of the last blocks of windows.
+        kw, kh = self._window_blocks, self._hop_blocks
+        n_old = len(self._blocks[0])
+        first = self._n_blocks - n_old
+        ends = np.arange(n_old, n_old + n_blocks)
+        complete = first + ends + 1 - kw
+        ends = ends[(complete >= 0) & (complete % kh == 0)]
+
+        self._n_blocks += n_blocks
+        self._blocks = [a[len(a) - kw + 1:] if kw > 1 else a[:0]
+                        for a in aggregates]
+        if not len(ends):
+            return
+
+        starts = ends - kw + 1
+        sums, squares, peaks, block_crossings, first_crossings = aggregates
+
+        def window_sum(a):
+            cs = np.concatenate((np.zeros((1, a.shape[1])),
+                                 np.cumsum(a, axis=0)))
+            return cs[ends + 1] - cs[starts]
+
+        output = {}
+        mean_square = window_sum(squares) / self.window
+        if 'rms' in self.features:
+            output['rms'] = np.sqrt(mean_square)
+        if 'peak' in self.features:
+            output['peak'] = peaks[
+                ends[:, None] - np.arange(kw)[None, :]].max(axis=1)
+        if 'variance' in self.features:
+            mean = window_sum(sums) / self.window
+            output['variance'] = np.maximum(mean_square - mean ** 2, 0.0)
+        if 'zero_crossings' in self.features:
+            output['zero_crossings'] = np.round(
+                window_sum(block_crossings) - first_crossings[starts])
+
+        features = np.empty((len(ends), len(self.columns) *
+                             len(self.features)))
+        for k, feature in enumerate(self.features):
+            features[:, k::len(self.features)] = output[feature]
+        window_epochs = epochs[:n][(ends - n_old + 1) * g - 1]
+        self.n_windows += len(ends)
+        self.callback(window_epochs, features)
@@ -0,0 +1,594 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`gateway`
+==============
+
+Publishing of module streams to local consumers over sockets.
+
+Only one process can own the Bluetooth connection to a board. A
+:class:`GatewayServer` in that process publishes the streams of its
+modules over TCP or Unix sockets, to any number of subscribers, and a
+:class:`GatewayClient` in each consumer receives them with the same
+``notifications`` API as :class:`~pymetawear.client.MetaWearClient`.
+
+Samples are sent in batches. Every frame starts with a header of the
+frame kind, the stream id, the number of values per sample, the sequence
+number of the frame in its stream and the payload length. The payload of
+a data frame is the little-endian ``int64`` board timestamps in
+milliseconds of the ``n`` samples, followed by their ``float32`` values,
+row by row.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-26
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+import json
+import stat
+import socket
+import struct
+import threading
+from collections import deque
+
+import numpy as np
+
+from pymetawear.batching import SampleBatcher
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.utils import string_types
+from pymetawear.workers import STREAM_COLUMNS
+
+#: Frame kinds.
+HELLO = 1
+DATA = 2
+SUBSCRIBE = 3
+UNSUBSCRIBE = 4
+
+#: Frame header: kind, stream id, number of values per sample, sequence
+#: number and payload length in bytes.
+HEADER = struct.Struct(str('<BBHII'))
+
+# Sequence numbers wrap around at 2 ** 32.
+_SEQUENCE_MASK = 0xffffffff
+
+
+def encode_frame(stream_id, epochs, values, sequence=0):
+    """Encode a batch of samples as a data frame.
+
+    :param int stream_id: Id of the stream.
+    :param numpy.ndarray epochs: ``(n, )`` array of timestamps.
+    :param numpy.ndarray values: ``(n, m)`` array of values.
+    :param int sequence: Sequence number of the frame in its stream.
+    :rtype: bytes
+
+    """
+    epochs = np.ascontiguousarray(epochs, dtype='<i8')
+    values = np.ascontiguousarray(values, dtype='<f4')
+    n_columns = values.shape[1] if values.ndim > 1 else 1
+    return b''.join((
+        HEADER.pack(DATA, stream_id, n_columns, sequence & _SEQUENCE_MASK,
+                    epochs.nbytes + values.nbytes),
+        epochs.tobytes(), values.tobytes()))
+
+
+def decode_payload(payload, n_columns):
+    """Decode the payload of a data frame.
+
+    :param bytes payload: The payload.
+    :param int n_columns: Number of values per sample.
+    :return: A ``(n, )`` array of timestamps and a ``(n, n_columns)``
+        array of values.
+    :rtype: tuple
+
+    """
+    n = len(payload) // (8 + 4 * n_columns)
+    epochs = np.frombuffer(payload, dtype='<i8', count=n)
+    values = np.frombuffer(payload, dtype='<f4', offset=8 * n).reshape(
+        (n, n_columns))
+    return epochs, values
+
+
+def _control_frame(kind, stream_id=0, payload=b''):
+    return HEADER.pack(kind, stream_id, 0, 0, len(payload)) + payload
+
+
+def _recv_exactly(sock, n):
+    chunks = []
+    while n:
+        chunk = sock.recv(n)
+        if not chunk:
+            raise EOFError("Gateway connection closed.")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_frame(sock):
+    """Read a frame from a socket.
+
+    :param socket.socket sock: The socket.
+    :return: The kind, stream id, number of values per sample, sequence
+        number and payload.
+    :rtype: tuple
+
+    """
+    kind, stream_id, n_columns, sequence, length = HEADER.unpack(
+        _recv_exactly(sock, HEADER.size))
+    return kind, stream_id, n_columns, sequence, _recv_exactly(sock, length)
+
+
+def _socket(address):
+    if isinstance(address, string_types):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+def _remove_stale_socket(path):
+    """Remove a Unix socket file left by a server that is not running."""
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except OSError:
+        return
+    sock = _socket(path)
+    try:
+        sock.connect(path)
+    except socket.error:
+        os.unlink(path)
+    else:
+        raise PyMetaWearException(
+            "A gateway is already listening on {0}.".format(path))
+    finally:
+        sock.close()
+
+
+class _Subscriber(object):
+    """Connection of a subscriber, with a bounded queue of frames.
+
+    When the queue is full, the oldest frame is dropped, so that a slow
+    subscriber delays neither the board nor the other subscribers.
+
+    """
+
+    def __init__(self, sock, max_queue):
+        self.sock = sock
+        self.streams = set()
+        self.n_sent = 0
+        self.n_dropped = 0
+        self.thread = None
+
+        self._queue = deque()
+        self._max_queue = max_queue
+        self._ready = threading.Condition()
+        self._closed = False
+
+    def put(self, frame):
+        with self._ready:
+            if len(self._queue) >= self._max_queue:
+                self._queue.popleft()
+                self.n_dropped += 1
+            self._queue.append(frame)
+            self._ready.notify()
+
+    def close(self, timeout=0.0):
+        """Stop sending once the queued frames have been sent, waiting
+        at most ``timeout`` seconds for it."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        if self.thread is not None and \
+                self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def send_frames(self):
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    # Closed, and all frames are sent.
+                    return
+                frames = list(self._queue)
+                self._queue.clear()
+            try:
+                self.sock.sendall(b''.join(frames))
+            except socket.error:
+                return
+            self.n_sent += len(frames)
+
+    def as_dict(self):
+        return {'streams': sorted(self.streams), 'sent': self.n_sent,
+                'dropped': self.n_dropped, 'queued': len(self._queue)}
+
+
+class GatewayServer(object):
+    """Server publishing module streams of a client.
+
+    .. code-block:: python
+
+        mwclient = MetaWearClient('DD:3A:7D:4D:56:F0')
+        mwclient.accelerometer.set_settings(data_rate=100.0)
+        server = GatewayServer(mwclient, '/tmp/metawear.sock',
+                               streams={'accelerometer': {'packed': True},
+                                        'switch': {}},
+                               batch_size={'switch': 1})
+        server.start()
+
+    :param pymetawear.client.MetaWearClient client: The client.
+    :param address: Path of a Unix socket, or a ``(host, port)`` tuple
+        to listen on with TCP. Port 0 picks a free port, see
+        :attr:`address` after :meth:`start`.
+    :param streams: Module attribute names to publish, or a dictionary of
+        keyword arguments to the module's ``notifications`` method by
+        module attribute name.
+    :param batch_size: Number of samples per frame, or a dictionary of it
+        by module attribute name. Modules not in it use 100 samples.
+    :param int max_queue: Number of frames kept for a subscriber that
+        does not keep up, before the oldest frame is dropped.
+    :param float max_latency: Maximal time, in seconds, that a sample
+        waits for its batch to fill up before it is sent anyway, e.g. for
+        streams with a low data rate. If ``None``, samples are only sent
+        in full batches.
+
+    """
+
+    def __init__(self, client, address=('127.0.0.1', 0),
+                 streams=('accelerometer', ), batch_size=100, max_queue=64,
+                 max_latency=0.1):
+        self.client = client
+        self.address = address
+        if not isinstance(streams, dict):
+            streams = {name: {} for name in streams}
+        self.streams = streams
+        self.max_queue = max_queue
+        self.max_latency = max_latency
+
+        self._names = sorted(streams)
+        self._batchers = []
+        for stream_id, name in enumerate(self._names):
+            size = batch_size.get(name, 100) \
+                if isinstance(batch_size, dict) else batch_size
+            self._batchers.append(SampleBatcher(
+                self._publisher(stream_id), size, dtype='float32',
+                n_columns=STREAM_COLUMNS.get(name, 1)))
+        self._batch_locks = [threading.Lock() for _ in self._names]
+
+        self.subscribers = []
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+        self._flusher = None
+        self._stop = threading.Event()
+
+    def __str__(self):
+        return "GatewayServer: {0}, {1} subscribers".format(
+            self.address, len(self.subscribers))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def _publisher(self, stream_id):
+        sequence = [0]
+
+        def publish(epochs, values):
+            frame = encode_frame(stream_id, epochs, values, sequence[0])
+            sequence[0] += 1
+            with self._lock:
+                subscribers = list(self.subscribers)
+            for subscriber in subscribers:
+                if stream_id in subscriber.streams:
+                    subscriber.put(frame)
+        return publish
+
+    def _receiver(self, stream_id):
+        batcher = self._batchers[stream_id]
+        lock = self._batch_locks[stream_id]
+
+        def receive(epoch, value):
+            with lock:
+                batcher.append(epoch, value)
+        return receive
+
+    def _flush_stale(self, stop):
+        # Batches that are pending at two checks, half the maximal latency
+        # apart, are flushed. A sample thereby waits at most the maximal
+        # latency, without reading the clock per sample.
+        pending = [None] * len(self._batchers)
+        while not stop.wait(self.max_latency / 2):
+            for k, batcher in enumerate(self._batchers):
+                with self._batch_locks[k]:
+                    state = batcher.n_samples if len(batcher) else None
+                    if state is not None and state == pending[k]:
+                        batcher.flush()
+                        state = None
+                    pending[k] = state
+
+    def start(self):
+        """Subscribe to the module streams and start accepting
+        subscribers.
+
+        A Unix socket file left by a server that is no longer running is
+        removed.
+
+        """
+        if isinstance(self.address, string_types):
+            _remove_stale_socket(self.address)
+        self._sock = _socket(self.address)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        self._sock.listen(8)
+        self.address = self._sock.getsockname()
+
+        for stream_id, name in enumerate(self._names):
+            getattr(self.client, name).notifications(
+                self._receiver(stream_id), with_epoch=True,
+                **self.streams[name])
+
+        self._thread = threading.Thread(target=self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+        if self.max_latency is not None:
+            self._stop = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_stale,
+                                             args=(self._stop, ))
+            self._flusher.daemon = True
+            self._flusher.start()
+
+    def stop(self, timeout=1.0):
+        """Unsubscribe from the module streams and close all
+        connections.
+
+        :param float timeout: Time to wait for the queued frames of each
+            subscriber to be sent, in seconds.
+
+        """
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        for name, batcher in zip(self._names, self._batchers):
+            getattr(self.client, name).notifications(None)
+            batcher.flush()
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            sock.close()
+            if isinstance(self.address, string_types):
+                try:
+                    os.unlink(self.address)
+                except OSError:
+                    pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            subscriber.close(timeout)
+            try:
+                subscriber.sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            subscriber.sock.close()
+
+    def _accept(self):
+        hello = json.dumps({name: [stream_id, STREAM_COLUMNS.get(name, 1)]
+                            for stream_id, name in enumerate(self._names)})
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except (socket.error, AttributeError):
+                # Closed by stop.
+                return
+            subscriber = _Subscriber(sock, self.max_queue)
+            try:
+                sock.sendall(_control_frame(HELLO,
+                                            payload=hello.encode('utf-8')))
+            except socket.error:
+                sock.close()
+                continue
+            with self._lock:
+                self.subscribers.append(subscriber)
+            subscriber.thread = threading.Thread(target=subscriber.send_frames)
+            for t in (subscriber.thread,
+                      threading.Thread(target=self._serve,
+                                       args=(subscriber, ))):
+                t.daemon = True
+                t.start()
+
+    def _serve(self, subscriber):
+        try:
+            while True:
+                kind, stream_id, _, _, _ = read_frame(subscriber.sock)
+                if kind == SUBSCRIBE:
+                    subscriber.streams.add(stream_id)
+                elif kind == UNSUBSCRIBE:
+                    subscriber.streams.discard(stream_id)
+        except (EOFError, socket.error):
+            pass
+        subscriber.close()
+        with self._lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+        subscriber.sock.close()
+
+    def stats(self):
+        """Get the counters of the subscribers.
+
+        :return: List of dictionaries with the stream ids, number of sent
+            and dropped frames and number of queued frames per subscriber.
+        :rtype: list
+
+        """
+        with self._lock:
+            return [s.as_dict() for s in self.subscribers]
+
+
+class GatewayModule(object):
+    """A module stream received from a gateway server, with the
+    ``notifications`` API of the module it publishes.
+
+    Frames dropped by the server, since this client did not keep up,
+    are detected from the sequence numbers of the frames and counted in
+    ``n_lost``.
+
+    """
+
+    def __init__(self, client, name, stream_id, n_columns):
+        self.client = client
+        self.module_name = name
+        self.stream_id = stream_id
+        self.n_columns = n_columns
+        self.callback = None
+        self.batch_callback = None
+        self.n_lost = 0
+
+        self._next_sequence = None
+
+    def __str__(self):
+        return "GatewayModule: {0}".format(self.module_name)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def _update(self):
+        active = self.callback is not None or \
+            self.batch_callback is not None
+        # Frames sent while unsubscribed are not lost.
+        self._next_sequence = None
+        self.client._send(SUBSCRIBE if active else UNSUBSCRIBE,
+                          self.stream_id)
+
+    def notifications(self, callback=None, with_epoch=False):
+        """Subscribe or unsubscribe to samples of the stream, delivered
+        one by one, like the notifications of the module on the board.
+
+        :param callable callback: Function called with the data tuple,
+            or the single value for streams of one value per sample. If
+            `None`, the subscription is removed.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data as second.
+
+        """
+        if callback is None:
+            self.callback = None
+        elif with_epoch:
+            self.callback = callback
+        else:
+            self.callback = lambda epoch, value: callback(value)
+        self._update()
+
+    def batches(self, callback=None):
+        """Subscribe or unsubscribe to samples of the stream, delivered
+        in the batches they are sent in.
+
+        :param callable callback: Function called with a ``(n, )`` array
+            of epochs in milliseconds and a ``(n, m)`` array of values.
+            If `None`, the subscription is removed.
+
+        """
+        self.batch_callback = callback
+        self._update()
+
+    def _deliver(self, sequence, epochs, values):
+        if self._next_sequence is not None:
+            self.n_lost += (sequence - self._next_sequence) & _SEQUENCE_MASK
+        self._next_sequence = (sequence + 1) & _SEQUENCE_MASK
+        if self.batch_callback is not None:
+            self.batch_callback(epochs, values)
+        callback = self.callback
+        if callback is None:
+            return
+        if self.n_columns == 1:
+            for epoch, value in zip(epochs.tolist(), values[:, 0].tolist()):
+                callback(epoch, value)
+        else:
+            for epoch, value in zip(epochs.tolist(), values.tolist()):
+                callback(epoch, tuple(value))
+
+
+class GatewayClient(object):
+    """Client of a :class:`GatewayServer`.
+
+    The published streams are available as attributes, named as on the
+    client of the server:
+
+    .. code-block:: python
+
+        c = GatewayClient('/tmp/metawear.sock')
+        c.accelerometer.notifications(handle_acc_notification)
+
+        batcher = SampleBatcher(handle_batch, batch_size=500)
+        batcher.attach(c.accelerometer)
+
+    :param address: Path of the Unix socket, or ``(host, port)`` tuple
+        of the server.
+    :param float timeout: Timeout for connecting, in seconds.
+
+    """
+
+    def __init__(self, address, timeout=5.0):
+        self.address = address
+        self._sock = _socket(address)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        kind, _, _, _, payload = read_frame(self._sock)
+        if kind != HELLO:
+            raise PyMetaWearException(
+                "Unexpected frame from gateway: {0}".format(kind))
+        self._sock.settimeout(None)
+
+        self.modules = {}
+        self._by_id = {}
+        for name, (stream_id, n_columns) in json.loads(
+                payload.decode('utf-8')).items():
+            module = GatewayModule(self, name, stream_id, n_columns)
+            self.modules[name] = self._by_id[stream_id] = module
+            setattr(self, name, module)
+
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._receive)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __str__(self):
+        return "GatewayClient, {0}".format(self.address)
+
+    def __repr__(self):
+        return "<GatewayClient, {0}>".format(self.address)
+
+    def _send(self, kind, stream_id):
+        with self._lock:
+            self._sock.sendall(_control_frame(kind, stream_id))
+
+    def _receive(self):
+        try:
+            while True:
+                kind, stream_id, n_columns, sequence, payload = read_frame(
+                    self._sock)
+                module = self._by_id.get(stream_id)
+                if kind == DATA and module is not None:
+                    module._deliver(sequence,
+                                    *decode_payload(payload, n_columns))
+        except (EOFError, socket.error):
+            pass
+
+    def disconnect(self):
+        """Close the connection to the gateway server."""
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self._sock.close()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
@@ -17,7 +17,18 @@ from __future__ import absolute_import
 from .base import PyMetaWearModule, Modules
 from .accelerometer import AccelerometerModule
 from .gyroscope import GyroscopeModule
+from .magnetometer import MagnetometerModule
+from .barometer import BarometerModule
+from .temperature import TemperatureModule
+from .humidity import HumidityModule
+from .ambientlight import AmbientLightModule
 from .switch import SwitchModule
 from .battery import BatteryModule
+from .settings import SettingsModule
 from .haptic import HapticModule
 from .led import LEDModule
+from .logging import LoggingModule
+from .dataprocessor import DataProcessorModule
+from .event import EventModule
+from .timer import TimerModule
+from .macro import MacroModule
@@ -13,16 +13,21 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import absolute_import
 
-import re
-from functools import wraps
-from ctypes import c_float, cast, POINTER
+from ctypes import c_float
 
 from pymetawear import libmetawear
+from pymetawear.capabilities import get_capabilities, register
+from pymetawear.decoding import data_handler
 from pymetawear.exceptions import PyMetaWearException
 from pymetawear.mbientlab.metawear import sensor
-from pymetawear.mbientlab.metawear.core import DataTypeId, CartesianFloat
+from pymetawear.mbientlab.metawear.core import DataTypeId
 from pymetawear.modules.base import PyMetaWearModule
 
+# The Bosch accelerometers share ranges, defined in a common class.
+for _acc_class in (sensor.AccelerometerBmi160, sensor.AccelerometerBma255):
+    register(_acc_class, data_range=get_capabilities(
+        sensor.AccelerometerBosch)['data_range'])
+
 
 class AccelerometerModule(PyMetaWearModule):
     """MetaWear accelerometer module implementation.
@@ -37,39 +42,30 @@ class AccelerometerModule(PyMetaWearModule):
     def __init__(self, board, module_id, debug=False):
         super(AccelerometerModule, self).__init__(board, debug)
         self.module_id = module_id
+        self._packed = False
 
         acc_sensors = [
             sensor.AccelerometerBmi160,
             sensor.AccelerometerBma255,
             sensor.AccelerometerMma8452q
         ]
+        self.acc_class = None
         for a in acc_sensors:
             if getattr(a, 'MODULE_TYPE', -1) == module_id:
                 self.acc_class = a
 
         if self.acc_class is not None:
-            # Parse possible output data rates for this accelerometer.
-            self.odr = {".".join(re.search(
-                '^ODR_([0-9]+)\_*([0-9]*)HZ', k).groups()):
-                            getattr(self.acc_class, k, None) for k in filter(
-                lambda x: x.startswith('ODR'), vars(self.acc_class))}
-
-            # Parse possible output data ranges for this accelerometer.
-            if len(list(filter(lambda x: x.startswith('FSR'),
-                               vars(self.acc_class)))) == 0:
-                acc_class = sensor.AccelerometerBosch
-            else:
-                acc_class = self.acc_class
-            self.fsr = {float(re.search('^FSR_([0-9]+)G', k).groups()[0]):
-                            getattr(acc_class, k, None) for k in
-                        filter(lambda x: x.startswith('FSR'), vars(acc_class))}
+            self.capabilities = get_capabilities(self.acc_class)
+            self.odr = self.capabilities['data_rate'].mapping
+            self.fsr = self.capabilities['data_range'].mapping
 
     def __str__(self):
+        if self.acc_class is None:
+            return "{0}: Not present".format(self.module_name)
         return "{0} {1}: Data rates (Hz): {2}, Data ranges (g): {3}".format(
             self.module_name, self.sensor_name,
-            [float(k) for k in sorted(self.odr.keys(),
-                                      key=lambda x:(float(x)))],
-            [k for k in sorted(self.fsr.keys())])
+            list(self.capabilities['data_rate'].values),
+            list(self.capabilities['data_range'].values))
 
     def __repr__(self):
         return str(self)
@@ -84,38 +80,26 @@ class AccelerometerModule(PyMetaWearModule):
 
     @property
     def data_signal(self):
+        if self._packed:
+            return self.packed_data_signal
         return self._data_signal_preprocess(
             libmetawear.mbl_mw_acc_get_acceleration_data_signal)
 
-    def _get_odr(self, value):
-        sorted_ord_keys = sorted(self.odr.keys(), key=lambda x:(float(x)))
-        diffs = [abs(value - float(k)) for k in sorted_ord_keys]
-        min_diffs = min(diffs)
-        if min_diffs > 0.5:
-            raise ValueError("Requested ODR ({0}) was not part of "
-                             "possible values: {1}".format(
-                value, [float(x) for x in sorted_ord_keys]))
-        return float(value)
-
-    def _get_fsr(self, value):
-        sorted_ord_keys = sorted(self.fsr.keys(), key=lambda x:(float(x)))
-        diffs = [abs(value - float(k)) for k in sorted_ord_keys]
-        min_diffs = min(diffs)
-        if min_diffs > 0.1:
-            raise ValueError("Requested FSR ({0}) was not part of "
-                             "possible values: {1}".format(
-                value, [x for x in sorted(self.fsr.keys())]))
-        return float(value)
-
-    def get_current_settings(self):
-        raise NotImplementedError()
-
-    def get_possible_settings(self):
-        return {
-            'data_rate': [float(x) for x in sorted(
-                self.odr.keys(), key=lambda x:(float(x)))],
-            'data_range': [x for x in sorted(self.fsr.keys())]
-        }
+    @property
+    def packed_data_signal(self):
+        """The packed data signal, delivering three samples per
+        notification. Only available on the Bosch accelerometers.
+
+        :returns: The pointer value. (Long if on x64 architecture.)
+        :rtype: :py:class:`ctypes.c_long` or :py:class:`ctypes.c_int`
+
+        """
+        if self.acc_class not in (sensor.AccelerometerBmi160,
+                                  sensor.AccelerometerBma255):
+            raise PyMetaWearException(
+                "Packed acceleration data requires a Bosch accelerometer.")
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_acc_get_packed_acceleration_data_signal)
 
     def set_settings(self, data_rate=None, data_range=None):
         """Set accelerometer settings.
@@ -134,6 +118,7 @@ class AccelerometerModule(PyMetaWearModule):
             mwclient.set_accelerometer_settings(data_range=8.0)
 
         albeit that the latter example makes two writes to the board.
+        Settings equal to the current settings are not written again.
 
         Call :meth:`~get_possible_settings` to see which values
         that can be set for this sensor.
@@ -142,21 +127,27 @@ class AccelerometerModule(PyMetaWearModule):
         :param float data_range: The measurement range in the unit ``g``.
 
         """
-        if data_rate is not None:
-            odr = self._get_odr(data_rate)
+        settings = self._changed_settings(
+            data_rate=None if data_rate is None else
+            self.capabilities['data_rate'].nearest(data_rate),
+            data_range=None if data_range is None else
+            self.capabilities['data_range'].nearest(data_range))
+        if 'data_rate' in settings:
+            odr = settings['data_rate']
             if self._debug:
                 print("Setting Accelerometer ODR to {0}".format(odr))
             libmetawear.mbl_mw_acc_set_odr(self.board, c_float(odr))
-        if data_range is not None:
-            fsr = self._get_fsr(data_range)
+        if 'data_range' in settings:
+            fsr = settings['data_range']
             if self._debug:
                 print("Setting Accelerometer FSR to {0}".format(fsr))
             libmetawear.mbl_mw_acc_set_range(self.board, c_float(fsr))
 
-        if (data_rate is not None) or (data_range is not None):
+        if settings:
             libmetawear.mbl_mw_acc_write_acceleration_config(self.board)
+            self._store_settings(settings)
 
-    def notifications(self, callback=None):
+    def notifications(self, callback=None, with_epoch=False, packed=False):
         """Subscribe or unsubscribe to accelerometer notifications.
 
         Convenience method for handling accelerometer usage.
@@ -173,6 +164,12 @@ class AccelerometerModule(PyMetaWearModule):
 
         :param callable callback: Accelerometer notification callback function.
             If `None`, unsubscription to accelerometer notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data tuple as second.
+        :param bool packed: If ``True``, the packed data signal is used,
+            sending three samples in each notification, which allows
+            for higher data rates over Bluetooth.
 
         """
 
@@ -180,12 +177,18 @@ class AccelerometerModule(PyMetaWearModule):
             super(AccelerometerModule, self).notifications(None)
             self.stop()
             self.toggle_sampling(False)
+            self._packed = False
         else:
+            self._packed = packed
             super(AccelerometerModule, self).notifications(
-                sensor_data(callback))
+                data_handler(callback, DataTypeId.CARTESIAN_FLOAT, with_epoch))
             self.start()
             self.toggle_sampling(True)
 
+    def _resume_sampling(self):
+        self.start()
+        self.toggle_sampling(True)
+
     def start(self):
         """Switches the accelerometer to active mode."""
         libmetawear.mbl_mw_acc_start(self.board)
@@ -204,17 +207,3 @@ class AccelerometerModule(PyMetaWearModule):
             libmetawear.mbl_mw_acc_enable_acceleration_sampling(self.board)
         else:
             libmetawear.mbl_mw_acc_disable_acceleration_sampling(self.board)
-
-
-def sensor_data(func):
-    @wraps(func)
-    def wrapper(data):
-        if data.contents.type_id == DataTypeId.CARTESIAN_FLOAT:
-            data_ptr = cast(data.contents.value, POINTER(CartesianFloat))
-            func((data_ptr.contents.x,
-                  data_ptr.contents.y,
-                  data_ptr.contents.z))
-        else:
-            raise PyMetaWearException('Incorrect data type id: {0}'.format(
-                data.contents.type_id))
-    return wrapper
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created on 2016-05-14
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+
+from pymetawear import libmetawear
+from pymetawear.capabilities import get_capabilities
+from pymetawear.decoding import data_handler
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+from pymetawear.modules.base import PyMetaWearModule, Modules
+
+
+class AmbientLightLtr329(object):
+    """Settings of the LTR329 ambient light sensor, from ``libmetawear``."""
+
+    GAIN_1X = 0
+    GAIN_2X = 1
+    GAIN_4X = 2
+    GAIN_8X = 3
+    GAIN_48X = 4
+    GAIN_96X = 5
+
+    INTEGRATION_TIME_100MS = 0
+    INTEGRATION_TIME_50MS = 1
+    INTEGRATION_TIME_200MS = 2
+    INTEGRATION_TIME_400MS = 3
+    INTEGRATION_TIME_150MS = 4
+    INTEGRATION_TIME_250MS = 5
+    INTEGRATION_TIME_300MS = 6
+    INTEGRATION_TIME_350MS = 7
+
+    MEASUREMENT_RATE_50MS = 0
+    MEASUREMENT_RATE_100MS = 1
+    MEASUREMENT_RATE_200MS = 2
+    MEASUREMENT_RATE_500MS = 3
+    MEASUREMENT_RATE_1000MS = 4
+    MEASUREMENT_RATE_2000MS = 5
+
+
+def require_ltr329(f):
+    def wrapper(*args, **kwargs):
+        if getattr(args[0], 'als_class', None) is None:
+            raise PyMetaWearException("There is not Ambient Light "
+                                      "module on your MetaWear board!")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+class AmbientLightModule(PyMetaWearModule):
+    """MetaWear ambient light module implementation.
+
+    The sensor measures by itself, with the measurement rate set in
+    :meth:`~set_settings`.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param int module_id: The module id of this ambient light
+        component, obtained from ``libmetawear``.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, module_id, debug=False):
+        super(AmbientLightModule, self).__init__(board, debug)
+        self.module_id = module_id
+
+        if self.module_id == Modules.MBL_MW_MODULE_NA:
+            # No ambient light sensor present!
+            self.als_class = None
+        else:
+            self.als_class = AmbientLightLtr329
+
+        if self.als_class is not None:
+            self.capabilities = get_capabilities(self.als_class)
+            self.gain = self.capabilities['gain'].mapping
+            self.integration_time = \
+                self.capabilities['integration_time'].mapping
+            self.measurement_rate = \
+                self.capabilities['measurement_rate'].mapping
+
+    def __str__(self):
+        if self.als_class is None:
+            return "{0}: Not present".format(self.module_name)
+        return "{0} {1}: Gains: {2}, Measurement rates (ms): {3}".format(
+            self.module_name, self.sensor_name,
+            list(self.capabilities['gain'].values),
+            list(self.capabilities['measurement_rate'].values))
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return "Ambient Light"
+
+    @property
+    def sensor_name(self):
+        if self.als_class is not None:
+            return self.als_class.__name__.replace('AmbientLight', '')
+        else:
+            return ''
+
+    @property
+    @require_ltr329
+    def data_signal(self):
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_als_ltr329_get_illuminance_data_signal)
+
+    @require_ltr329
+    def set_settings(self, gain=None, integration_time=None,
+                     measurement_rate=None):
+        """Set ambient light sensor settings.
+
+        Example:
+
+        .. code-block:: python
+
+            mwclient.ambient_light.set_settings(gain=4,
+                                                measurement_rate=1000)
+
+        Settings equal to the current settings are not written again.
+        Call :meth:`~get_possible_settings` to see which values
+        that can be set for this sensor.
+
+        :param int gain: Gain factor, higher for dimmer light.
+        :param int integration_time: Time the sensor integrates light
+            for each measurement, in milliseconds.
+        :param int measurement_rate: Time between measurements, in
+            milliseconds. Must not be shorter than the integration time.
+
+        """
+        settings = self._changed_settings(**{
+            k: None if v is None else self.capabilities[k].nearest(v)
+            for k, v in (('gain', gain),
+                         ('integration_time', integration_time),
+                         ('measurement_rate', measurement_rate))})
+        if 'gain' in settings:
+            g = self.gain[settings['gain']]
+            if self._debug:
+                print("Setting Ambient Light gain to {0}".format(g))
+            libmetawear.mbl_mw_als_ltr329_set_gain(self.board, g)
+        if 'integration_time' in settings:
+            t = self.integration_time[settings['integration_time']]
+            if self._debug:
+                print("Setting Ambient Light integration time "
+                      "to {0}".format(t))
+            libmetawear.mbl_mw_als_ltr329_set_integration_time(self.board, t)
+        if 'measurement_rate' in settings:
+            r = self.measurement_rate[settings['measurement_rate']]
+            if self._debug:
+                print("Setting Ambient Light measurement rate "
+                      "to {0}".format(r))
+            libmetawear.mbl_mw_als_ltr329_set_measurement_rate(self.board, r)
+
+        if settings:
+            libmetawear.mbl_mw_als_ltr329_write_config(self.board)
+            self._store_settings(settings)
+
+    @require_ltr329
+    def notifications(self, callback=None, with_epoch=False):
+        """Subscribe or unsubscribe to ambient light notifications.
+
+        Convenience method for handling ambient light usage.
+
+        Example:
+
+        .. code-block:: python
+
+            def handle_notification(data):
+                # Handle an illuminance value, in milli lux.
+                print("Illuminance: {0}".format(data))
+
+            mwclient.ambient_light.notifications(handle_notification)
+
+        :param callable callback: Ambient light notification callback
+            function. If `None`, unsubscription to ambient light
+            notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the value as second.
+
+        """
+        if callback is None:
+            self.stop()
+            super(AmbientLightModule, self).notifications(None)
+        else:
+            super(AmbientLightModule, self).notifications(
+                data_handler(callback, DataTypeId.UINT32, with_epoch))
+            self.start()
+
+    @require_ltr329
+    def _resume_sampling(self):
+        self.start()
+
+    @require_ltr329
+    def start(self):
+        """Starts illuminance sampling."""
+        libmetawear.mbl_mw_als_ltr329_start(self.board)
+
+    @require_ltr329
+    def stop(self):
+        """Stops illuminance sampling."""
+        libmetawear.mbl_mw_als_ltr329_stop(self.board)
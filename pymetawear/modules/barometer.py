@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created on 2016-05-14
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_float
+
+from pymetawear import libmetawear
+from pymetawear.capabilities import Capability, get_capabilities, register
+from pymetawear.decoding import data_handler
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+from pymetawear.modules.base import PyMetaWearModule
+
+
+class BarometerBosch(object):
+    """Settings of the Bosch BMP280 and BME280 barometers,
+    from ``libmetawear``."""
+
+    OVERSAMPLING_SKIP = 0
+    OVERSAMPLING_ULTRA_LOW_POWER = 1
+    OVERSAMPLING_LOW_POWER = 2
+    OVERSAMPLING_STANDARD = 3
+    OVERSAMPLING_HIGH = 4
+    OVERSAMPLING_ULTRA_HIGH = 5
+
+    IIR_FILTER_OFF = 0
+    IIR_FILTER_AVG_2 = 1
+    IIR_FILTER_AVG_4 = 2
+    IIR_FILTER_AVG_8 = 3
+    IIR_FILTER_AVG_16 = 4
+
+
+class BarometerBmp280(BarometerBosch):
+    STANDBY_TIMES = (0.5, 62.5, 125.0, 250.0, 500.0, 1000.0, 2000.0, 4000.0)
+
+
+class BarometerBme280(BarometerBosch):
+    STANDBY_TIMES = (0.5, 10.0, 20.0, 62.5, 125.0, 250.0, 500.0, 1000.0)
+
+
+for _baro_class in (BarometerBmp280, BarometerBme280):
+    register(
+        _baro_class,
+        oversampling=Capability('oversampling', {
+            k[13:]: getattr(_baro_class, k) for k in dir(_baro_class)
+            if k.startswith('OVERSAMPLING_')}),
+        iir_filter=Capability('iir_filter', {
+            (1 if k.endswith('OFF') else int(k[15:])):
+                getattr(_baro_class, k)
+            for k in dir(_baro_class) if k.startswith('IIR_FILTER_')}, 0.1),
+        standby_time=Capability('standby_time', {
+            t: t for t in _baro_class.STANDBY_TIMES}, 0.1, 'ms'))
+
+
+def require_bosch_baro(f):
+    def wrapper(*args, **kwargs):
+        if getattr(args[0], 'baro_class', None) is None:
+            raise PyMetaWearException("There is not Barometer "
+                                      "module on your MetaWear board!")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+class BarometerModule(PyMetaWearModule):
+    """MetaWear barometer module implementation.
+
+    The barometer samples by itself in normal mode, with the standby
+    time between measurements set in :meth:`~set_settings`.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param int module_id: The module id of this barometer
+        component, obtained from ``libmetawear``.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, module_id, debug=False):
+        super(BarometerModule, self).__init__(board, debug)
+        self.module_id = module_id
+        self._altitude = False
+
+        baro_sensors = {
+            0: BarometerBmp280,
+            1: BarometerBme280,
+        }
+        self.baro_class = baro_sensors.get(self.module_id, None)
+
+        if self.baro_class is not None:
+            self.capabilities = get_capabilities(self.baro_class)
+            self.oversampling = self.capabilities['oversampling'].mapping
+            self.iir_filter = self.capabilities['iir_filter'].mapping
+
+    def __str__(self):
+        if self.baro_class is None:
+            return "{0}: Not present".format(self.module_name)
+        return "{0} {1}: Oversampling: {2}, Standby times (ms): {3}".format(
+            self.module_name, self.sensor_name,
+            list(self.capabilities['oversampling'].values),
+            list(self.capabilities['standby_time'].values))
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return "Barometer"
+
+    @property
+    def sensor_name(self):
+        if self.baro_class is not None:
+            return self.baro_class.__name__.replace('Barometer', '')
+        else:
+            return ''
+
+    @property
+    @require_bosch_baro
+    def data_signal(self):
+        if self._altitude:
+            return self.altitude_data_signal
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_baro_bosch_get_pressure_data_signal)
+
+    @property
+    @require_bosch_baro
+    def altitude_data_signal(self):
+        """The altitude data signal, in meters, computed by the board
+        from the pressure.
+
+        :returns: The pointer value. (Long if on x64 architecture.)
+        :rtype: :py:class:`ctypes.c_long` or :py:class:`ctypes.c_int`
+
+        """
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_baro_bosch_get_altitude_data_signal)
+
+    @require_bosch_baro
+    def set_settings(self, oversampling=None, iir_filter=None,
+                     standby_time=None):
+        """Set barometer settings.
+
+        Example:
+
+        .. code-block:: python
+
+            mwclient.barometer.set_settings(oversampling='ultra_high',
+                                            iir_filter=16,
+                                            standby_time=1000.0)
+
+        Settings equal to the current settings are not written again.
+        Call :meth:`~get_possible_settings` to see which values
+        that can be set for this sensor.
+
+        :param str oversampling: Oversampling mode, e.g. ``standard``.
+        :param int iir_filter: Number of samples the IIR filter averages
+            over, 1 for no filtering.
+        :param float standby_time: Time between measurements,
+            in milliseconds.
+
+        """
+        settings = self._changed_settings(**{
+            k: None if v is None else self.capabilities[k].nearest(v)
+            for k, v in (('oversampling', oversampling),
+                         ('iir_filter', iir_filter),
+                         ('standby_time', standby_time))})
+        if 'oversampling' in settings:
+            o = self.oversampling[settings['oversampling']]
+            if self._debug:
+                print("Setting Barometer oversampling to {0}".format(o))
+            libmetawear.mbl_mw_baro_bosch_set_oversampling(self.board, o)
+        if 'iir_filter' in settings:
+            f = self.iir_filter[settings['iir_filter']]
+            if self._debug:
+                print("Setting Barometer IIR filter to {0}".format(f))
+            libmetawear.mbl_mw_baro_bosch_set_iir_filter(self.board, f)
+        if 'standby_time' in settings:
+            t = settings['standby_time']
+            if self._debug:
+                print("Setting Barometer standby time to {0}".format(t))
+            libmetawear.mbl_mw_baro_bosch_set_standby_time(
+                self.board, c_float(t))
+
+        if settings:
+            libmetawear.mbl_mw_baro_bosch_write_config(self.board)
+            self._store_settings(settings)
+
+    @require_bosch_baro
+    def notifications(self, callback=None, with_epoch=False, altitude=False):
+        """Subscribe or unsubscribe to barometer notifications.
+
+        Convenience method for handling barometer usage.
+
+        Example:
+
+        .. code-block:: python
+
+            def handle_notification(data):
+                # Handle a pressure value, in pascal.
+                print("Pressure: {0}".format(data))
+
+            mwclient.barometer.notifications(handle_notification)
+
+        :param callable callback: Barometer notification callback
+            function. If `None`, unsubscription to barometer
+            notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the value as second.
+        :param bool altitude: If ``True``, the altitude in meters is
+            delivered instead of the pressure.
+
+        """
+        if callback is None:
+            self.stop()
+            super(BarometerModule, self).notifications(None)
+            self._altitude = False
+        else:
+            self._altitude = altitude
+            super(BarometerModule, self).notifications(
+                data_handler(callback, DataTypeId.FLOAT, with_epoch))
+            self.start()
+
+    @require_bosch_baro
+    def _resume_sampling(self):
+        self.start()
+
+    @require_bosch_baro
+    def start(self):
+        """Starts pressure and altitude sampling."""
+        libmetawear.mbl_mw_baro_bosch_start(self.board)
+
+    @require_bosch_baro
+    def stop(self):
+        """Stops pressure and altitude sampling."""
+        libmetawear.mbl_mw_baro_bosch_stop(self.board)
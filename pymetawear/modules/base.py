@@ -13,13 +13,34 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import absolute_import
 
-from ctypes import c_long, c_uint8
+import threading
+from collections import deque
+from functools import wraps
+from ctypes import c_long, c_uint8, c_void_p, CFUNCTYPE
 
 from pymetawear import libmetawear
+from pymetawear.decoding import read_value
 from pymetawear.exceptions import PyMetaWearException
 from pymetawear.mbientlab.metawear.core import FnDataPtr
+from pymetawear.monitor import SignalMonitor
+from pymetawear.stats import SignalStats
 from pymetawear.utils import IS_64_BIT
 
+# Callback type for ``libmetawear`` functions that create objects on the
+# board, e.g. loggers and data processors, and report back a pointer.
+FnVoidPtr = CFUNCTYPE(None, c_void_p)
+
+# Callbacks handed to ``libmetawear`` that have not been called yet. The
+# board may answer after the caller has stopped waiting, and calling a
+# freed callback crashes the interpreter, so they are referenced here
+# until they are called, by id. Called callbacks are moved to a short
+# queue, so that they are not freed while they are still returning.
+_pending_callbacks = {}
+_called_callbacks = deque(maxlen=16)
+
+#: Get the value of a data pointer as a tuple, kept for compatibility.
+data_value = read_value
+
 
 class Modules(object):
     """Class for storing PyMetaWear module identifiers."""
@@ -51,6 +72,52 @@ class Modules(object):
     MBL_MW_MODULE_DEBUG = 0xfe
 
 
+# Number of nested command recordings, e.g. macros or event commands, in
+# progress, by board pointer value. Settings written while recording are
+# stored on the board instead of being applied, so they must bypass the
+# settings shadow of the modules of that board.
+_recordings = {}
+_recordings_lock = threading.Lock()
+
+
+def _board_key(board):
+    return getattr(board, 'value', board)
+
+
+def begin_recording(board):
+    """Mark that commands written to a board are being recorded.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+
+    """
+    key = _board_key(board)
+    with _recordings_lock:
+        _recordings[key] = _recordings.get(key, 0) + 1
+
+
+def end_recording(board):
+    """Mark that a command recording on a board has ended.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+
+    """
+    key = _board_key(board)
+    with _recordings_lock:
+        n = _recordings.pop(key, 0) - 1
+        if n > 0:
+            _recordings[key] = n
+
+
+def is_recording(board):
+    """Check if commands written to a board are being recorded.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :rtype: bool
+
+    """
+    return _recordings.get(_board_key(board), 0) > 0
+
+
 class PyMetaWearModule(object):
     """Base class for PyMetaWear module implementations.
 
@@ -64,6 +131,10 @@ class PyMetaWearModule(object):
         self._debug = debug
 
         self.callback = None
+        self.capabilities = {}
+        self.stats = SignalStats()
+        self.monitor = None
+        self._settings = {}
 
     def __str__(self):
         return "PyMetaWear module: {0}".format()
@@ -102,15 +173,129 @@ class PyMetaWearModule(object):
         raise PyMetaWearException(
             "No data signal exists for {0} module.".format(self))
 
+    def read(self):
+        """Request the current value of the module's data signal, which
+        is delivered to the registered notification callback."""
+        libmetawear.mbl_mw_datasignal_read(self.data_signal)
+
     def set_settings(self, **kwargs):
         raise PyMetaWearException(
             "No settings exists for {0} module.".format(self))
 
     def get_current_settings(self):
-        return {}
+        """Get the settings applied to the board by this client.
+
+        The settings are kept in a host-side shadow, so no round trip
+        to the board is made. Settings not yet written are not included.
+
+        :return: Dictionary of the current settings.
+        :rtype: dict
+
+        """
+        return dict(self._settings)
+
+    def restore_settings(self, **settings):
+        """Populate the settings shadow without writing to the board,
+        e.g. after restoring a serialized board state.
+
+        :param settings: Settings known to be applied on the board.
+
+        """
+        self._settings.update(settings)
+
+    def clear_settings(self):
+        """Forget the settings shadow, e.g. after the board has been reset
+        or settings have been changed by a macro. The next call to
+        ``set_settings`` writes all given settings to the board."""
+        self._settings = {}
+
+    def reapply(self, settings=True, subscription=True):
+        """Write the settings shadow and the subscription to the board
+        again, e.g. after the connection has been restored.
+
+        :param bool settings: If the settings should be written.
+        :param bool subscription: If the subscription, if any, should
+            be written.
+
+        """
+        if settings and self._settings:
+            current, self._settings = self._settings, {}
+            self.set_settings(**current)
+        if subscription and self.callback is not None:
+            if self._debug:
+                print("Resubscribing to {0} changes.".format(
+                    self.module_name))
+            libmetawear.mbl_mw_datasignal_subscribe(
+                self.data_signal, self.callback[1])
+            self._resume_sampling()
+
+    def _resume_sampling(self):
+        """Restart sampling after resubscribing, for modules that start
+        sampling when subscribed to."""
+        pass
+
+    def _changed_settings(self, **settings):
+        """Get the given settings that differ from the settings shadow.
+
+        While commands are being recorded, all given settings are
+        returned, since they are not applied to the board directly.
+
+        """
+        recording = is_recording(self.board)
+        return {k: v for k, v in settings.items() if v is not None and
+                (recording or self._settings.get(k) != v)}
+
+    def _store_settings(self, settings):
+        if not is_recording(self.board):
+            self._settings.update(settings)
 
     def get_possible_settings(self):
-        return {}
+        """Get the possible values of each setting of the module.
+
+        :return: Dictionary of possible values by setting name.
+        :rtype: dict
+
+        """
+        return {name: list(c.values)
+                for name, c in self.capabilities.items()}
+
+    def watch(self, data_rate=None, tolerance=0.5, stall_timeout=None,
+              on_gap=None, on_stall=None):
+        """Monitor the data signal for sample gaps and stalls.
+
+        Must be called before subscribing to notifications. Gaps are
+        detected from the board timestamps and the data rate, so the
+        cost per sample is a comparison.
+
+        .. code-block:: python
+
+            mwclient.accelerometer.set_settings(data_rate=100.0)
+            mwclient.accelerometer.watch(stall_timeout=1.0,
+                                         on_gap=print, on_stall=print)
+            mwclient.accelerometer.notifications(handle_acc_notification)
+
+        See :class:`pymetawear.monitor.SignalMonitor` for the parameters.
+        The configured data rate is used if none is given.
+
+        :return: The monitor.
+        :rtype: :class:`pymetawear.monitor.SignalMonitor`
+
+        """
+        if self.callback is not None:
+            raise PyMetaWearException(
+                "Set up monitoring of {0} before subscribing.".format(
+                    self.module_name))
+        self.monitor = SignalMonitor(
+            self.module_name, self.stats, data_rate, tolerance,
+            stall_timeout, on_gap, on_stall)
+        return self.monitor
+
+    def unwatch(self):
+        """Stop monitoring the data signal. Takes effect for gaps on the
+        next subscription."""
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
 
     def notifications(self, callback=None):
         """Toggle notifications/subscriptions to data signals
@@ -129,7 +314,12 @@ class PyMetaWearModule(object):
             if self.callback is not None:
                 raise PyMetaWearException(
                     "Subscription to {0} signal already in place!")
-            self.callback = (callback, FnDataPtr(callback))
+            handler = self.stats.wrap(callback)
+            if self.monitor is not None:
+                handler = self.monitor.wrap(
+                    handler, self._settings.get('data_rate'))
+                self.monitor.start()
+            self.callback = (callback, FnDataPtr(handler))
             libmetawear.mbl_mw_datasignal_subscribe(
                 data_signal, self.callback[1])
         else:
@@ -140,6 +330,8 @@ class PyMetaWearModule(object):
                 return
             libmetawear.mbl_mw_datasignal_unsubscribe(data_signal)
             self.callback = None
+            if self.monitor is not None:
+                self.monitor.stop()
 
     def _data_signal_preprocess(self, data_signal_func):
         if IS_64_BIT:
@@ -148,3 +340,68 @@ class PyMetaWearModule(object):
         else:
             data_signal = data_signal_func(self.board)
         return data_signal
+
+
+def wait_for_board(start_func, callback_type=FnVoidPtr, timeout=5.0):
+    """Start an operation on the board and wait for the board to report
+    its result to a callback.
+
+    The callback is kept alive until it is called, also if the wait
+    times out.
+
+    :param callable start_func: Function calling ``libmetawear`` with
+        the callback to report the result to.
+    :param callback_type: The ``ctypes`` function type of the callback.
+    :param float timeout: Time to wait for the board, in seconds.
+    :return: The arguments of the callback, or ``None`` if the board
+        did not answer in time.
+    :rtype: tuple
+
+    """
+    done = threading.Event()
+    result = []
+
+    def report(*args):
+        result.extend(args)
+        _called_callbacks.append(_pending_callbacks.pop(key, None))
+        done.set()
+
+    callback = callback_type(report)
+    key = id(callback)
+    _pending_callbacks[key] = callback
+    try:
+        start_func(callback)
+    except Exception:
+        del _pending_callbacks[key]
+        raise
+    if not done.wait(timeout):
+        return None
+    return tuple(result)
+
+
+def create_board_object(create_func, timeout=5.0):
+    """Create an object on the board and wait for it to be ready.
+
+    :param callable create_func: Function calling ``libmetawear`` with
+        the callback to report the created object's pointer to.
+    :param float timeout: Time to wait for the board, in seconds.
+    :return: The pointer value, or ``None`` if creation failed.
+        (Long if on x64 architecture.)
+    :rtype: :py:class:`ctypes.c_long` or int
+
+    """
+    result = wait_for_board(create_func, FnVoidPtr, timeout)
+    if not result or not result[0]:
+        return None
+    return c_long(result[0]) if IS_64_BIT else result[0]
+
+
+def generic_data(func, with_epoch=False):
+    """Wrap a callback to receive data of any type as a tuple."""
+    @wraps(func)
+    def wrapper(data):
+        if with_epoch:
+            func(data.contents.epoch, read_value(data))
+        else:
+            func(read_value(data))
+    return wrapper
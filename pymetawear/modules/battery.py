@@ -14,12 +14,11 @@ from __future__ import unicode_literals
 from __future__ import absolute_import
 
 import warnings
-from functools import wraps
-from ctypes import cast, POINTER
 
 from pymetawear import libmetawear
+from pymetawear.decoding import data_handler
 from pymetawear.exceptions import PyMetaWearException
-from pymetawear.mbientlab.metawear.core import DataTypeId, BatteryState
+from pymetawear.mbientlab.metawear.core import DataTypeId
 from pymetawear.modules.base import PyMetaWearModule
 
 
@@ -54,7 +53,7 @@ class BatteryModule(PyMetaWearModule):
         return self._data_signal_preprocess(
             libmetawear.mbl_mw_settings_get_battery_state_data_signal)
 
-    def notifications(self, callback=None):
+    def notifications(self, callback=None, with_epoch=False):
         """Subscribe or unsubscribe to battery notifications.
 
         Convenience method for handling battery notifications.
@@ -77,10 +76,22 @@ class BatteryModule(PyMetaWearModule):
         :param callable callback: Battery data notification callback
             function. If `None`, unsubscription to battery notifications
             is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data tuple as second.
 
         """
         super(BatteryModule, self).notifications(
-            battery_data(callback) if callback is not None else None)
+            data_handler(callback, DataTypeId.BATTERY_STATE, with_epoch)
+            if callback is not None else None)
+
+    def read(self):
+        """Triggers a battery state notification.
+
+        Same as :meth:`~read_battery_state`.
+
+        """
+        self.read_battery_state()
 
     def read_battery_state(self):
         """Triggers a battery state notification.
@@ -93,16 +104,3 @@ class BatteryModule(PyMetaWearModule):
         if self.callback is None:
             warnings.warn("No battery callback is registered!", RuntimeWarning)
         libmetawear.mbl_mw_settings_read_battery_state(self.board)
-
-
-def battery_data(func):
-    @wraps(func)
-    def wrapper(data):
-        if data.contents.type_id == DataTypeId.BATTERY_STATE:
-            data_ptr = cast(data.contents.value, POINTER(BatteryState))
-            func((int(data_ptr.contents.voltage),
-                  int(data_ptr.contents.charge)))
-        else:
-            raise PyMetaWearException('Incorrect data type id: {0}'.format(
-                data.contents.type_id))
-    return wrapper
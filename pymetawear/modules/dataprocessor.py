@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-09
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_long, c_float, c_uint8, c_uint32
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import PyMetaWearModule, create_board_object, \
+    generic_data
+from pymetawear.utils import IS_64_BIT
+
+
+class ThresholdMode(object):
+    """Output modes of the threshold processor."""
+    #: Output the data that crossed the threshold.
+    ABSOLUTE = 0
+    #: Output 1 when crossing upwards and -1 when crossing downwards.
+    BINARY = 1
+
+
+class ComparatorOperation(object):
+    """Comparison operations of the comparator processor."""
+    EQ = 0
+    NEQ = 1
+    LT = 2
+    LTE = 3
+    GT = 4
+    GTE = 5
+
+
+class DeltaMode(object):
+    """Output modes of the delta processor."""
+    #: Output the data that differs enough from the previous output.
+    ABSOLUTE = 0
+    #: Output the difference to the previous output.
+    DIFFERENTIAL = 1
+    #: Output 1 if the difference is positive and -1 if negative.
+    BINARY = 2
+
+
+class TimeMode(object):
+    """Output modes of the time processor."""
+    #: Output the data as is.
+    ABSOLUTE = 0
+    #: Output the difference to the previous output.
+    DIFFERENTIAL = 1
+
+
+def _signal_of(source):
+    if isinstance(source, PyMetaWearModule):
+        return source.data_signal
+    return source
+
+
+class DataSignal(PyMetaWearModule):
+    """A data signal on the board, wrapped to be used like a module.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param str name: Name of the signal.
+    :param ctypes.c_long signal: The data signal pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, name, signal, debug=False):
+        super(DataSignal, self).__init__(board, debug)
+        self.name = name
+        self._signal = signal
+
+    def __str__(self):
+        return "{0}: {1}".format(self.module_name, self.name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'DataSignal'
+
+    @property
+    def data_signal(self):
+        return self._signal
+
+    def notifications(self, callback=None, with_epoch=False):
+        """Subscribe or unsubscribe to notifications from this signal.
+
+        The data to the callback comes as a tuple of values, e.g.
+        ``(x, y, z)`` for accelerometer data or ``(value, )``
+        for scalar data.
+
+        :param callable callback: Notification callback function.
+            If `None`, unsubscription to notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data tuple as second.
+
+        """
+        super(DataSignal, self).notifications(
+            generic_data(callback, with_epoch)
+            if callback is not None else None)
+
+
+class DataProcessor(DataSignal):
+    """A data processor on the board.
+
+    Created by the :class:`DataProcessorModule` methods. A data processor
+    is a data signal in itself, so it can be subscribed to, logged
+    or used as source for another data processor.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param str name: Name of the processor type.
+    :param ctypes.c_long processor: The data processor pointer value.
+    :param source: The source module or signal of the processor.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, name, processor, source, debug=False):
+        super(DataProcessor, self).__init__(board, name, processor, debug)
+        self.source = source
+
+    def __str__(self):
+        return "{0}: {1} of {2}".format(self.module_name, self.name,
+                                        self.source)
+
+    @property
+    def module_name(self):
+        return 'DataProcessor'
+
+    @property
+    def state(self):
+        """The internal state of the processor as a data signal, e.g. the
+        stored value of a buffer processor, which can be read.
+
+        :rtype: :class:`DataSignal`
+
+        """
+        get_state = libmetawear.mbl_mw_dataprocessor_get_state_data_signal
+        if IS_64_BIT:
+            get_state.restype = c_long
+            signal = c_long(get_state(self.data_signal))
+        else:
+            signal = get_state(self.data_signal)
+        return DataSignal(self.board, '{0} state'.format(self.name),
+                          signal, debug=self._debug)
+
+    def remove(self):
+        """Remove the processor, and any processors it feeds,
+        from the board."""
+        if self.callback is not None:
+            self.notifications(None)
+        libmetawear.mbl_mw_dataprocessor_remove(self.data_signal)
+
+
+class DataProcessorModule(PyMetaWearModule):
+    """MetaWear data processor module implementation.
+
+    Builds chains of processors on the board, which filter or reduce
+    data before it is sent, so that less data has to be transferred
+    over Bluetooth. Each method creates a processor taking its input
+    from a module, e.g. ``mwclient.accelerometer``, or another processor.
+
+    Example:
+
+    .. code-block:: python
+
+        # Send the acceleration magnitude, averaged over 8 samples,
+        # at most every 100 ms.
+        rss = mwclient.dataprocessor.rss(mwclient.accelerometer)
+        avg = mwclient.dataprocessor.average(rss, 8)
+        throttled = mwclient.dataprocessor.time(avg, 100)
+        throttled.notifications(lambda data: print(data[0]))
+
+        mwclient.accelerometer.toggle_sampling(True)
+        mwclient.accelerometer.start()
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(DataProcessorModule, self).__init__(board, debug)
+
+    def __str__(self):
+        return "{0}".format(self.module_name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'DataProcessor'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for DataProcessor module.
+
+        Subscribe to the created processors instead.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for DataProcessor module.")
+
+    def average(self, source, size):
+        """Create a running average processor.
+
+        :param source: Module or data processor to average.
+        :param int size: Number of samples to average over.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'average', source, libmetawear.mbl_mw_dataprocessor_average_create,
+            c_uint8(int(size)))
+
+    def threshold(self, source, boundary, hysteresis=0.0,
+                  mode=ThresholdMode.ABSOLUTE):
+        """Create a processor only passing data crossing a threshold.
+
+        :param source: Module or data processor to use.
+        :param float boundary: The threshold value.
+        :param float hysteresis: Minimal distance between the
+            boundary and the data for a crossing to count.
+        :param int mode: A :class:`ThresholdMode` value.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'threshold', source,
+            libmetawear.mbl_mw_dataprocessor_threshold_create,
+            int(mode), c_float(boundary), c_float(hysteresis))
+
+    def comparator(self, source, operation, reference):
+        """Create a processor only passing data fulfilling a comparison.
+
+        :param source: Module or data processor to use.
+        :param int operation: A :class:`ComparatorOperation` value.
+        :param float reference: The value to compare the data with.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'comparator', source,
+            libmetawear.mbl_mw_dataprocessor_comparator_create,
+            int(operation), c_float(reference))
+
+    def delta(self, source, magnitude, mode=DeltaMode.ABSOLUTE):
+        """Create a processor only passing data that has changed enough.
+
+        :param source: Module or data processor to use.
+        :param float magnitude: Minimal change from the previous output.
+        :param int mode: A :class:`DeltaMode` value.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'delta', source, libmetawear.mbl_mw_dataprocessor_delta_create,
+            int(mode), c_float(magnitude))
+
+    def time(self, source, period, mode=TimeMode.ABSOLUTE):
+        """Create a processor passing data at most once per period.
+
+        :param source: Module or data processor to throttle.
+        :param int period: Minimal time between outputs, in milliseconds.
+        :param int mode: A :class:`TimeMode` value.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'time', source, libmetawear.mbl_mw_dataprocessor_time_create,
+            int(mode), c_uint32(int(period)))
+
+    def rms(self, source):
+        """Create a processor computing the root mean square of
+        the components of multi-component data, e.g. (x, y, z).
+
+        :param source: Module or data processor to use.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'rms', source, libmetawear.mbl_mw_dataprocessor_rms_create)
+
+    def rss(self, source):
+        """Create a processor computing the root sum square, i.e.
+        the magnitude, of multi-component data, e.g. (x, y, z).
+
+        :param source: Module or data processor to use.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'rss', source, libmetawear.mbl_mw_dataprocessor_rss_create)
+
+    def buffer(self, source):
+        """Create a processor storing the most recent data, which
+        can be read from its :attr:`~DataProcessor.state`.
+
+        :param source: Module or data processor to use.
+        :rtype: :class:`DataProcessor`
+
+        """
+        return self._create(
+            'buffer', source, libmetawear.mbl_mw_dataprocessor_buffer_create)
+
+    def _create(self, name, source, create_func, *args):
+        signal = _signal_of(source)
+        if self._debug:
+            print("Creating {0} processor. (Sig#: {1})".format(name, signal))
+        processor = create_board_object(
+            lambda cb: create_func(signal, *(args + (cb, ))))
+        if processor is None:
+            raise PyMetaWearException(
+                "Could not create {0} processor.".format(name))
+        return DataProcessor(self.board, name, processor, source,
+                             debug=self._debug)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-10
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_int, c_void_p, CFUNCTYPE
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import PyMetaWearModule, wait_for_board, \
+    begin_recording, end_recording
+
+# Callback type of ``mbl_mw_event_end_record``, called with the event
+# pointer and the status of the recording.
+FnVoidPtrInt = CFUNCTYPE(None, c_void_p, c_int)
+
+#: Status reported by the board when the commands have been stored.
+STATUS_OK = 0
+
+
+def record_commands(board, event, commands, timeout=5.0):
+    """Record commands to be executed by the board when an event fires.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param ctypes.c_long event: The event pointer value, e.g. a data
+        signal or a timer.
+    :param callable commands: Function issuing the commands to record,
+        e.g. ``mwclient.battery.read``.
+    :param float timeout: Time to wait for the board to
+        store the commands, in seconds.
+    :raises: :py:exc:`~PyMetaWearException` if the board does not
+        report the commands as stored.
+
+    """
+    libmetawear.mbl_mw_event_record_commands(event)
+    begin_recording(board)
+    try:
+        commands()
+    finally:
+        end_recording(board)
+    result = wait_for_board(
+        lambda cb: libmetawear.mbl_mw_event_end_record(event, cb),
+        FnVoidPtrInt, timeout)
+    if result is None:
+        raise PyMetaWearException(
+            "Board did not store the commands for event in time.")
+    if result[1] != STATUS_OK:
+        raise PyMetaWearException(
+            "Could not record commands for event, status {0}.".format(
+                result[1]))
+
+
+class Event(object):
+    """Handle to commands recorded for an event.
+
+    Created by :meth:`EventModule.record`.
+
+    :param ctypes.c_long event: The event pointer value.
+    :param source: The module, data signal or timer firing the event.
+
+    """
+
+    def __init__(self, event, source):
+        self.event = event
+        self.source = source
+
+    def __str__(self):
+        return "Event: {0}".format(self.source)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def remove(self):
+        """Remove the commands recorded for the event from the board."""
+        libmetawear.mbl_mw_event_remove_commands(self.event)
+
+
+class EventModule(PyMetaWearModule):
+    """MetaWear event module implementation.
+
+    Lets the board execute commands by itself when a data signal
+    produces data, e.g. playing an LED pattern when the switch
+    is pressed, without involving the client.
+
+    Example:
+
+    .. code-block:: python
+
+        pattern = mwclient.led.load_preset_pattern('blink', repeat_count=3)
+        mwclient.led.write_pattern(pattern, 'g')
+        event = mwclient.event.record(mwclient.switch, mwclient.led.play)
+        # ... and later
+        event.remove()
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(EventModule, self).__init__(board, debug)
+
+    def __str__(self):
+        return "{0}".format(self.module_name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'Event'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for Event module.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for Event module.")
+
+    def record(self, source, commands, timeout=5.0):
+        """Record commands to execute when a data signal produces data.
+
+        :param source: A module, e.g. ``mwclient.switch``, or a data
+            processor whose data signal fires the event.
+        :param callable commands: Function issuing the commands to
+            record, e.g. ``mwclient.led.play``.
+        :param float timeout: Time to wait for the board to
+            store the commands, in seconds.
+        :return: Handle to the recorded commands.
+        :rtype: :class:`Event`
+
+        """
+        event = source.data_signal
+        if self._debug:
+            print("Recording commands for {0}. (Sig#: {1})".format(
+                source, event))
+        record_commands(self.board, event, commands, timeout)
+        return Event(event, source)
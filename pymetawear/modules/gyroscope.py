@@ -13,14 +13,14 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import absolute_import
 
-import re
-from functools import wraps
-from ctypes import c_float, cast, POINTER
+from ctypes import c_float
 
 from pymetawear import libmetawear
+from pymetawear.capabilities import get_capabilities
+from pymetawear.decoding import data_handler
 from pymetawear.exceptions import PyMetaWearException
 from pymetawear.mbientlab.metawear import sensor
-from pymetawear.mbientlab.metawear.core import DataTypeId, CartesianFloat
+from pymetawear.mbientlab.metawear.core import DataTypeId
 from pymetawear.modules.base import PyMetaWearModule, Modules
 
 
@@ -46,6 +46,7 @@ class GyroscopeModule(PyMetaWearModule):
     def __init__(self, board, module_id, debug=False):
         super(GyroscopeModule, self).__init__(board, debug)
         self.module_id = module_id
+        self._packed = False
 
         if self.module_id == Modules.MBL_MW_MODULE_NA:
             # No gyroscope present!
@@ -54,21 +55,17 @@ class GyroscopeModule(PyMetaWearModule):
             self.gyro_class = sensor.GyroBmi160
 
         if self.gyro_class is not None:
-            # Parse possible output data rates for this accelerometer.
-            self.odr = {int(re.search('^ODR_([0-9]+)HZ', k).groups()[0]):
-                            getattr(self.gyro_class, k, None) for k in filter(
-                lambda x: x.startswith('ODR'), vars(self.gyro_class))}
-            self.fsr = {int(re.search('^FSR_([0-9]+)DPS', k).groups()[0]):
-                            getattr(self.gyro_class, k, None) for k in
-                        filter(lambda x: x.startswith('FSR'),
-                               vars(self.gyro_class))}
+            self.capabilities = get_capabilities(self.gyro_class)
+            self.odr = self.capabilities['data_rate'].mapping
+            self.fsr = self.capabilities['data_range'].mapping
 
     def __str__(self):
+        if self.gyro_class is None:
+            return "{0}: Not present".format(self.module_name)
         return "{0} {1}: Data rates (Hz): {2}, Data ranges (dps): {3}".format(
             self.module_name, self.sensor_name,
-            [float(k) for k in sorted(self.odr.keys(),
-                                      key=lambda x:(float(x)))],
-            [k for k in sorted(self.fsr.keys())])
+            list(self.capabilities['data_rate'].values),
+            list(self.capabilities['data_range'].values))
 
     def __repr__(self):
         return str(self)
@@ -87,42 +84,24 @@ class GyroscopeModule(PyMetaWearModule):
     @property
     @require_bmi160
     def data_signal(self):
+        if self._packed:
+            return self.packed_data_signal
         return self._data_signal_preprocess(
             libmetawear.mbl_mw_gyro_bmi160_get_rotation_data_signal)
 
-    def _get_odr(self, value):
-        sorted_ord_keys = sorted(self.odr.keys(), key=lambda x:(float(x)))
-        diffs = [abs(value - float(k)) for k in sorted_ord_keys]
-        min_diffs = min(diffs)
-        if min_diffs > 0.5:
-            raise ValueError("Requested ODR ({0}) was not part of "
-                             "possible values: {1}".format(
-                value, [float(x) for x in sorted_ord_keys]))
-        k = int(sorted_ord_keys[diffs.index(min_diffs)])
-        return self.odr.get(k)
-
-    def _get_fsr(self, value):
-        sorted_ord_keys = sorted(self.fsr.keys(), key=lambda x:(float(x)))
-        diffs = [abs(value - float(k)) for k in sorted_ord_keys]
-        min_diffs = min(diffs)
-        if min_diffs > 0.1:
-            raise ValueError("Requested FSR ({0}) was not part of "
-                             "possible values: {1}".format(
-                value, [float(x) for x in sorted(self.fsr.keys())]))
-        k = int(sorted_ord_keys[diffs.index(min_diffs)])
-        return self.fsr.get(k)
-
+    @property
     @require_bmi160
-    def get_current_settings(self):
-        raise NotImplementedError()
+    def packed_data_signal(self):
+        """The packed data signal, delivering three samples per
+        notification. The samples still arrive to the callback
+        one by one.
 
-    @require_bmi160
-    def get_possible_settings(self):
-        return {
-            'data_rate': [float(x) for x in sorted(
-                self.odr.keys(), key=lambda x:(float(x)))],
-            'data_range': [x for x in sorted(self.fsr.keys())]
-        }
+        :returns: The pointer value. (Long if on x64 architecture.)
+        :rtype: :py:class:`ctypes.c_long` or :py:class:`ctypes.c_int`
+
+        """
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_gyro_bmi160_get_packed_rotation_data_signal)
 
     @require_bmi160
     def set_settings(self, data_rate=None, data_range=None):
@@ -142,6 +121,7 @@ class GyroscopeModule(PyMetaWearModule):
             mwclient.gyroscope.set_settings(data_range=1000.0)
 
         albeit that the latter example makes two writes to the board.
+        Settings equal to the current settings are not written again.
 
         Call :meth:`~get_possible_settings` to see which values
         that can be set for this sensor.
@@ -151,22 +131,28 @@ class GyroscopeModule(PyMetaWearModule):
             degrees per second.
 
         """
-        if data_rate is not None:
-            odr = self._get_odr(data_rate)
+        settings = self._changed_settings(
+            data_rate=None if data_rate is None else
+            self.capabilities['data_rate'].nearest(data_rate),
+            data_range=None if data_range is None else
+            self.capabilities['data_range'].nearest(data_range))
+        if 'data_rate' in settings:
+            odr = self.odr[settings['data_rate']]
             if self._debug:
                 print("Setting Gyroscope ODR to {0}".format(odr))
             libmetawear.mbl_mw_gyro_bmi160_set_odr(self.board, odr)
-        if data_range is not None:
-            fsr = self._get_fsr(data_range)
+        if 'data_range' in settings:
+            fsr = self.fsr[settings['data_range']]
             if self._debug:
                 print("Setting Gyroscope FSR to {0}".format(fsr))
             libmetawear.mbl_mw_gyro_bmi160_set_range(self.board, fsr)
 
-        if (data_rate is not None) or (data_range is not None):
+        if settings:
             libmetawear.mbl_mw_gyro_bmi160_write_config(self.board)
+            self._store_settings(settings)
 
     @require_bmi160
-    def notifications(self, callback=None):
+    def notifications(self, callback=None, with_epoch=False, packed=False):
         """Subscribe or unsubscribe to gyroscope notifications.
 
         Convenience method for handling gyroscope usage.
@@ -183,6 +169,12 @@ class GyroscopeModule(PyMetaWearModule):
 
         :param callable callback: Gyroscope notification callback function.
             If `None`, unsubscription to gyroscope notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data tuple as second.
+        :param bool packed: If ``True``, the packed data signal is used,
+            sending three samples in each notification, which allows
+            for higher data rates over Bluetooth.
 
         """
 
@@ -190,12 +182,19 @@ class GyroscopeModule(PyMetaWearModule):
             super(GyroscopeModule, self).notifications(None)
             self.stop()
             self.toggle_sampling(False)
+            self._packed = False
         else:
+            self._packed = packed
             super(GyroscopeModule, self).notifications(
-                sensor_data(callback))
+                data_handler(callback, DataTypeId.CARTESIAN_FLOAT, with_epoch))
             self.toggle_sampling(True)
             self.start()
 
+    @require_bmi160
+    def _resume_sampling(self):
+        self.toggle_sampling(True)
+        self.start()
+
     @require_bmi160
     def start(self):
         """Switches the gyroscope to active mode."""
@@ -217,17 +216,3 @@ class GyroscopeModule(PyMetaWearModule):
             libmetawear.mbl_mw_gyro_bmi160_enable_rotation_sampling(self.board)
         else:
             libmetawear.mbl_mw_gyro_bmi160_disable_rotation_sampling(self.board)
-
-
-def sensor_data(func):
-    @wraps(func)
-    def wrapper(data):
-        if data.contents.type_id == DataTypeId.CARTESIAN_FLOAT:
-            data_ptr = cast(data.contents.value, POINTER(CartesianFloat))
-            func((data_ptr.contents.x,
-                  data_ptr.contents.y,
-                  data_ptr.contents.z))
-        else:
-            raise PyMetaWearException('Incorrect data type id: {0}'.format(
-                data.contents.type_id))
-    return wrapper
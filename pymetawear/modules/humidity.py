@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created on 2016-05-14
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+
+from pymetawear import libmetawear
+from pymetawear.capabilities import get_capabilities
+from pymetawear.decoding import data_handler
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+from pymetawear.modules.base import PyMetaWearModule, Modules
+
+
+class HumidityBme280(object):
+    """Settings of the BME280 humidity sensor, from ``libmetawear``."""
+
+    OVERSAMPLING_1X = 1
+    OVERSAMPLING_2X = 2
+    OVERSAMPLING_4X = 3
+    OVERSAMPLING_8X = 4
+    OVERSAMPLING_16X = 5
+
+
+def require_bme280(f):
+    def wrapper(*args, **kwargs):
+        if getattr(args[0], 'humidity_class', None) is None:
+            raise PyMetaWearException("There is not Humidity "
+                                      "module on your MetaWear board!")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+class HumidityModule(PyMetaWearModule):
+    """MetaWear humidity module implementation.
+
+    The humidity is only measured when read. Reads can either be
+    requested with :meth:`~read`, or scheduled on the board by passing
+    a period to :meth:`~notifications`, so that no commands have to be
+    sent while streaming.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param int module_id: The module id of this humidity
+        component, obtained from ``libmetawear``.
+    :param bool debug: If ``True``, module prints out debug information.
+    :param pymetawear.modules.TimerModule timer_module: The timer module
+        of the client, used for reads scheduled on the board.
+
+    """
+
+    def __init__(self, board, module_id, debug=False, timer_module=None):
+        super(HumidityModule, self).__init__(board, debug)
+        self.module_id = module_id
+        self._timer_module = timer_module
+        self._timer = None
+
+        if self.module_id == Modules.MBL_MW_MODULE_NA:
+            # No humidity sensor present!
+            self.humidity_class = None
+        else:
+            self.humidity_class = HumidityBme280
+
+        if self.humidity_class is not None:
+            self.capabilities = get_capabilities(self.humidity_class)
+            self.oversampling = self.capabilities['oversampling'].mapping
+
+    def __str__(self):
+        if self.humidity_class is None:
+            return "{0}: Not present".format(self.module_name)
+        return "{0} {1}: Oversampling: {2}".format(
+            self.module_name, self.sensor_name,
+            list(self.capabilities['oversampling'].values))
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return "Humidity"
+
+    @property
+    def sensor_name(self):
+        if self.humidity_class is not None:
+            return self.humidity_class.__name__.replace('Humidity', '')
+        else:
+            return ''
+
+    @property
+    @require_bme280
+    def data_signal(self):
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_humidity_bme280_get_percentage_data_signal)
+
+    @require_bme280
+    def set_settings(self, oversampling=None):
+        """Set humidity settings.
+
+        :param int oversampling: Number of samples averaged in each
+            measurement.
+
+        """
+        settings = self._changed_settings(
+            oversampling=None if oversampling is None else
+            self.capabilities['oversampling'].nearest(oversampling))
+        if settings:
+            o = self.oversampling[settings['oversampling']]
+            if self._debug:
+                print("Setting Humidity oversampling to {0}".format(o))
+            libmetawear.mbl_mw_humidity_bme280_set_oversampling(self.board, o)
+            self._store_settings(settings)
+
+    @require_bme280
+    def notifications(self, callback=None, with_epoch=False, period=None):
+        """Subscribe or unsubscribe to humidity notifications.
+
+        Convenience method for handling humidity usage.
+
+        Example:
+
+        .. code-block:: python
+
+            def handle_notification(data):
+                # Handle a relative humidity value, in percent.
+                print("Humidity: {0}".format(data))
+
+            # Let the board read the humidity every minute.
+            mwclient.humidity.notifications(handle_notification,
+                                            period=60000)
+
+        :param callable callback: Humidity notification callback
+            function. If `None`, unsubscription to humidity
+            notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the value as second.
+        :param int period: If given, a timer on the board reads the
+            humidity with this period, in milliseconds. Otherwise,
+            values are only delivered after calls to :meth:`~read`.
+
+        """
+        if callback is None:
+            if self._timer is not None:
+                self._timer.stop()
+                self._timer.remove()
+                self._timer = None
+            super(HumidityModule, self).notifications(None)
+        else:
+            if period is not None and self._timer_module is None:
+                raise PyMetaWearException(
+                    "No timer module given for scheduled reads.")
+            super(HumidityModule, self).notifications(
+                data_handler(callback, DataTypeId.FLOAT, with_epoch))
+            if period is not None:
+                self._timer = self._timer_module.periodic_read(self, period)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-03
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+from ctypes import byref
+
+from pymetawear import libmetawear
+from pymetawear.batching import SampleBatcher
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import FnDataPtr, LogDownloadHandler
+from pymetawear.modules.base import PyMetaWearModule, create_board_object, \
+    data_value
+
+# Callback types for the log download handler are taken from the
+# structure itself to always match the ``libmetawear`` wrapper.
+_FnProgressUpdate = dict(LogDownloadHandler._fields_)[
+    'received_progress_update']
+_FnUnknownEntry = dict(LogDownloadHandler._fields_)['received_unknown_entry']
+
+
+class LoggingModule(PyMetaWearModule):
+    """MetaWear logging module implementation.
+
+    Data signals are logged to the board's flash memory by loggers
+    created with :meth:`~add_logger`. After logging has been stopped,
+    the entries are downloaded with :meth:`~download` and delivered as
+    NumPy arrays, batch by batch, to one callback per logger.
+
+    Example:
+
+    .. code-block:: python
+
+        def handle_acc_batch(epochs, values):
+            # Handle a (n, ) epochs array and a (n, 3) acceleration array.
+            print(epochs.shape, values.shape)
+
+        mwclient.logging.add_logger('acc', mwclient.accelerometer)
+        mwclient.accelerometer.toggle_sampling(True)
+        mwclient.accelerometer.start()
+        mwclient.logging.start()
+        # ... Disconnect and reconnect at will, and later ...
+        mwclient.logging.stop()
+        mwclient.logging.download({'acc': handle_acc_batch})
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(LoggingModule, self).__init__(board, debug)
+        self.loggers = {}
+
+        self._logger_callbacks = {}
+        self._download_handler = None
+        self._download_done = threading.Event()
+        self._batchers = {}
+        self.n_unknown_entries = 0
+
+    def __str__(self):
+        return "{0}: {1}".format(self.module_name, sorted(self.loggers))
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'Logging'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for Logging module.
+
+        Use :meth:`~download` to receive logged data.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for Logging module.")
+
+    def add_logger(self, name, module_or_signal, timeout=5.0):
+        """Create a logger on the board for a data signal.
+
+        :param str name: Name to identify the logged data with.
+        :param module_or_signal: A PyMetaWear module, e.g.
+            ``mwclient.accelerometer``, or a data signal pointer.
+        :param float timeout: Time to wait for the board to
+            create the logger, in seconds.
+
+        """
+        if name in self.loggers:
+            raise PyMetaWearException(
+                "Logger {0} already exists.".format(name))
+        if isinstance(module_or_signal, PyMetaWearModule):
+            data_signal = module_or_signal.data_signal
+        else:
+            data_signal = module_or_signal
+
+        if self._debug:
+            print("Creating logger {0}. (Sig#: {1})".format(
+                name, data_signal))
+        logger = create_board_object(
+            lambda cb: libmetawear.mbl_mw_datasignal_log(data_signal, cb),
+            timeout)
+        if logger is None:
+            raise PyMetaWearException(
+                "Could not create logger {0}.".format(name))
+
+        self.loggers[name] = logger
+        self._logger_callbacks[name] = FnDataPtr(self._entry_handler(name))
+        libmetawear.mbl_mw_logger_subscribe(
+            logger, self._logger_callbacks[name])
+
+    def remove_logger(self, name):
+        """Remove a logger from the board.
+
+        :param str name: Name of the logger to remove.
+
+        """
+        logger = self.loggers.pop(name, None)
+        if logger is None:
+            raise PyMetaWearException("No logger named {0}.".format(name))
+        if self._debug:
+            print("Removing logger {0}.".format(name))
+        libmetawear.mbl_mw_logger_remove(logger)
+        self._logger_callbacks.pop(name, None)
+
+    def start(self, overwrite=False):
+        """Start logging of data from all loggers.
+
+        :param bool overwrite: If older entries should be overwritten
+            when the log memory is full.
+
+        """
+        libmetawear.mbl_mw_logging_start(self.board, int(bool(overwrite)))
+
+    def stop(self):
+        """Stop logging data."""
+        libmetawear.mbl_mw_logging_stop(self.board)
+
+    def clear_entries(self):
+        """Remove all logged entries from the board."""
+        libmetawear.mbl_mw_logging_clear_entries(self.board)
+
+    def download(self, callbacks, batch_size=1000, progress_callback=None,
+                 n_notifies=100, timeout=30.0):
+        """Download logged entries from the board.
+
+        Entries are collected per logger and delivered in arrays of
+        ``batch_size`` samples to the logger's callback, which is called
+        with an epoch array and a value array. This method blocks until
+        the download is completed.
+
+        :param dict callbacks: Mapping of logger names to callbacks.
+            Entries of loggers without a callback are discarded.
+        :param int batch_size: Number of entries in each batch.
+        :param callable progress_callback: Function to call with the
+            number of entries left and the total number of entries as
+            the download progresses.
+        :param int n_notifies: How many progress updates the board
+            should send during the download.
+        :param float timeout: Maximal time without entries or progress
+            updates from the board, e.g. if it has disconnected, in
+            seconds. If ``None``, wait indefinitely.
+
+        """
+        self._batchers = {
+            name: SampleBatcher(cb, batch_size=batch_size)
+            for name, cb in callbacks.items() if cb is not None}
+        self._download_done.clear()
+        n_updates = [0]
+
+        def progress_update(entries_left, total_entries):
+            n_updates[0] += 1
+            if self._debug:
+                print("Log download: {0}/{1} entries left.".format(
+                    entries_left, total_entries))
+            if progress_callback is not None:
+                progress_callback(entries_left, total_entries)
+            if entries_left == 0:
+                for batcher in self._batchers.values():
+                    batcher.flush()
+                self._download_done.set()
+
+        def unknown_entry(entry_id, epoch, data, length):
+            self.n_unknown_entries += 1
+            if self._debug:
+                print("Unknown log entry with id {0}.".format(entry_id))
+
+        self._download_handler = LogDownloadHandler(
+            received_progress_update=_FnProgressUpdate(progress_update),
+            received_unknown_entry=_FnUnknownEntry(unknown_entry))
+
+        def n_received():
+            return n_updates[0] + sum(b.n_samples + len(b)
+                                      for b in self._batchers.values())
+
+        received = n_received()
+        libmetawear.mbl_mw_logging_download(
+            self.board, int(n_notifies), byref(self._download_handler))
+        while not self._download_done.wait(timeout):
+            if n_received() == received:
+                raise PyMetaWearException("Log download timed out.")
+            received = n_received()
+
+    def _entry_handler(self, name):
+        def handle_entry(data):
+            batcher = self._batchers.get(name)
+            if batcher is not None:
+                batcher.append(data.contents.epoch, data_value(data))
+        return handle_entry
+
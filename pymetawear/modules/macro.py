@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-11
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_int, c_uint8, CFUNCTYPE
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import PyMetaWearModule, wait_for_board, \
+    begin_recording, end_recording
+
+# Callback type of ``mbl_mw_macro_end_record``, called with the macro id,
+# or a negative value if the macro could not be stored.
+FnInt = CFUNCTYPE(None, c_int)
+
+
+class Macro(object):
+    """A block of commands recorded as a macro on the board.
+
+    Used as a context manager, created by :meth:`MacroModule.record`.
+    All commands issued inside the ``with`` block are stored on the board,
+    and the macro id is available in :attr:`id` after the block.
+
+    The board stores the commands as they are issued, and a single macro
+    cannot be removed from it. If the block raises an exception, the
+    commands issued until then are therefore still stored as a macro,
+    which is not added to :attr:`MacroModule.macros` and has no
+    :attr:`id`. If ``exec_on_boot`` is set, it is executed when the board
+    boots, until it is removed with :meth:`MacroModule.erase_all`.
+
+    :param MacroModule module: The macro module of the client.
+    :param bool exec_on_boot: If the macro should be executed
+        when the board boots.
+    :param float timeout: Time to wait for the board to
+        store the macro, in seconds.
+
+    """
+
+    def __init__(self, module, exec_on_boot=False, timeout=5.0):
+        self.module = module
+        self.exec_on_boot = exec_on_boot
+        self.timeout = timeout
+        self.id = None
+
+    def __str__(self):
+        return "Macro: {0}{1}".format(
+            self.id, ', executed on boot' if self.exec_on_boot else '')
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def __enter__(self):
+        libmetawear.mbl_mw_macro_record(
+            self.module.board, c_uint8(int(bool(self.exec_on_boot))))
+        begin_recording(self.module.board)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end_recording(self.module.board)
+        # The recording is ended also if the block failed, to leave the
+        # board usable, but then the stored commands are not waited for.
+        result = wait_for_board(
+            lambda cb: libmetawear.mbl_mw_macro_end_record(
+                self.module.board, cb), FnInt,
+            self.timeout if exc_type is None else 0.0)
+        if exc_type is not None:
+            return False
+        if result is None or result[0] < 0:
+            raise PyMetaWearException("Could not record macro.")
+        self.id = result[0]
+        self.module.macros.append(self)
+        return False
+
+    def execute(self):
+        """Execute the macro's commands on the board."""
+        if self.id is None:
+            raise PyMetaWearException("Macro has not been recorded.")
+        self.module.execute(self.id)
+
+
+class MacroModule(PyMetaWearModule):
+    """MetaWear macro module implementation.
+
+    Stores configuration commands on the board, so they can be replayed
+    with a single command, e.g. after a reconnect, or automatically when
+    the board boots. Calling the module is the same as calling
+    :meth:`~record`.
+
+    Example:
+
+    .. code-block:: python
+
+        with mwclient.macro(exec_on_boot=True) as macro:
+            mwclient.accelerometer.set_settings(data_rate=100.0,
+                                                data_range=4.0)
+            mwclient.gyroscope.set_settings(data_rate=100.0)
+
+        # After a reconnect:
+        macro.execute()
+
+    Note that only the commands written to the board are recorded.
+    Notification callbacks still have to be registered on the client.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(MacroModule, self).__init__(board, debug)
+        self.macros = []
+
+    def __str__(self):
+        return "{0}: {1}".format(self.module_name,
+                                 [m.id for m in self.macros])
+
+    def __repr__(self):
+        return str(self)
+
+    def __call__(self, exec_on_boot=False, timeout=5.0):
+        return self.record(exec_on_boot, timeout)
+
+    @property
+    def module_name(self):
+        return 'Macro'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for Macro module.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for Macro module.")
+
+    def record(self, exec_on_boot=False, timeout=5.0):
+        """Record the commands in a ``with`` block as a macro.
+
+        :param bool exec_on_boot: If the macro should be executed
+            when the board boots.
+        :param float timeout: Time to wait for the board to
+            store the macro, in seconds.
+        :return: The macro context manager.
+        :rtype: :class:`Macro`
+
+        """
+        return Macro(self, exec_on_boot, timeout)
+
+    def execute(self, macro_id):
+        """Execute a macro stored on the board.
+
+        Settings written by the macro are not known by the modules,
+        so call their ``clear_settings`` method if the macro changes
+        settings that are later set again from the client.
+
+        :param int macro_id: The id of the macro.
+
+        """
+        if self._debug:
+            print("Executing macro {0}.".format(macro_id))
+        libmetawear.mbl_mw_macro_execute(self.board, c_uint8(int(macro_id)))
+
+    def erase_all(self):
+        """Remove all macros from the board.
+
+        The macros are erased when the board is next reset.
+
+        """
+        libmetawear.mbl_mw_macro_erase_all(self.board)
+        self.macros = []
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created on 2016-05-13
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_uint16
+
+from pymetawear import libmetawear
+from pymetawear.capabilities import get_capabilities
+from pymetawear.decoding import data_handler
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+from pymetawear.modules.base import PyMetaWearModule, Modules
+
+
+class MagnetometerBmm150(object):
+    """Settings of the BMM150 magnetometer, from ``libmetawear``."""
+
+    PRESET_LOW_POWER = 0
+    PRESET_REGULAR = 1
+    PRESET_ENHANCED_REGULAR = 2
+    PRESET_HIGH_ACCURACY = 3
+
+    ODR_10HZ = 0
+    ODR_2HZ = 1
+    ODR_6HZ = 2
+    ODR_8HZ = 3
+    ODR_15HZ = 4
+    ODR_20HZ = 5
+    ODR_25HZ = 6
+    ODR_30HZ = 7
+
+
+def require_bmm150(f):
+    def wrapper(*args, **kwargs):
+        if getattr(args[0], 'mag_class', None) is None:
+            raise PyMetaWearException("There is not Magnetometer "
+                                      "module on your MetaWear board!")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+class MagnetometerModule(PyMetaWearModule):
+    """MetaWear magnetometer module implementation.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param int module_id: The module id of this magnetometer
+        component, obtained from ``libmetawear``.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    #: Repetitions in the x/y and z axes, per preset.
+    PRESET_REPETITIONS = {
+        'low_power': (3, 3),
+        'regular': (9, 15),
+        'enhanced_regular': (15, 27),
+        'high_accuracy': (47, 83),
+    }
+    #: Data rates, in Hz, set by each preset.
+    PRESET_DATA_RATES = {
+        'low_power': 10.0,
+        'regular': 10.0,
+        'enhanced_regular': 10.0,
+        'high_accuracy': 20.0,
+    }
+
+    def __init__(self, board, module_id, debug=False):
+        super(MagnetometerModule, self).__init__(board, debug)
+        self.module_id = module_id
+        self._packed = False
+
+        if self.module_id == Modules.MBL_MW_MODULE_NA:
+            # No magnetometer present!
+            self.mag_class = None
+        else:
+            self.mag_class = MagnetometerBmm150
+
+        if self.mag_class is not None:
+            self.capabilities = get_capabilities(self.mag_class)
+            self.odr = self.capabilities['data_rate'].mapping
+            self.presets = self.capabilities['preset'].mapping
+
+    def __str__(self):
+        if self.mag_class is None:
+            return "{0}: Not present".format(self.module_name)
+        return "{0} {1}: Data rates (Hz): {2}, Presets: {3}".format(
+            self.module_name, self.sensor_name,
+            list(self.capabilities['data_rate'].values),
+            list(self.capabilities['preset'].values))
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return "Magnetometer"
+
+    @property
+    def sensor_name(self):
+        if self.mag_class is not None:
+            return self.mag_class.__name__.replace('Magnetometer', '')
+        else:
+            return ''
+
+    @property
+    @require_bmm150
+    def data_signal(self):
+        if self._packed:
+            return self.packed_data_signal
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_mag_bmm150_get_b_field_data_signal)
+
+    @property
+    @require_bmm150
+    def packed_data_signal(self):
+        """The packed data signal, delivering three samples per
+        notification. The samples still arrive to the callback
+        one by one.
+
+        :returns: The pointer value. (Long if on x64 architecture.)
+        :rtype: :py:class:`ctypes.c_long` or :py:class:`ctypes.c_int`
+
+        """
+        return self._data_signal_preprocess(
+            libmetawear.mbl_mw_mag_bmm150_get_packed_b_field_data_signal)
+
+    @require_bmm150
+    def set_settings(self, preset=None, data_rate=None):
+        """Set magnetometer settings.
+
+        A preset sets both the data rate and the number of repetitions
+        the sensor averages over, trading power for accuracy:
+
+        .. code-block:: python
+
+            mwclient.magnetometer.set_settings(preset='high_accuracy')
+
+        A data rate can be set in combination with a preset's
+        repetitions, or the current preset's if none is given:
+
+        .. code-block:: python
+
+            mwclient.magnetometer.set_settings(preset='low_power',
+                                               data_rate=25.0)
+
+        Settings equal to the current settings are not written again.
+        Call :meth:`~get_possible_settings` to see which values
+        that can be set for this sensor.
+
+        :param str preset: One of the presets ``low_power``,
+            ``regular``, ``enhanced_regular`` or ``high_accuracy``.
+        :param float data_rate: The frequency of magnetometer
+            updates in Hz.
+
+        """
+        if preset is None:
+            preset = self._settings.get('preset', 'regular')
+        else:
+            preset = self.capabilities['preset'].nearest(preset)
+        if data_rate is None:
+            data_rate = self.PRESET_DATA_RATES[preset]
+            settings = self._changed_settings(preset=preset,
+                                              data_rate=data_rate)
+            if settings:
+                if self._debug:
+                    print("Setting Magnetometer preset to {0}".format(preset))
+                libmetawear.mbl_mw_mag_bmm150_set_preset(
+                    self.board, self.presets[preset])
+        else:
+            data_rate = self.capabilities['data_rate'].nearest(data_rate)
+            settings = self._changed_settings(preset=preset,
+                                              data_rate=data_rate)
+            if settings:
+                odr = self.odr[data_rate]
+                xy_reps, z_reps = self.PRESET_REPETITIONS[preset]
+                if self._debug:
+                    print("Setting Magnetometer ODR to {0}, repetitions to "
+                          "({1}, {2})".format(odr, xy_reps, z_reps))
+                libmetawear.mbl_mw_mag_bmm150_configure(
+                    self.board, c_uint16(xy_reps), c_uint16(z_reps), odr)
+        if settings:
+            self._store_settings({'preset': preset, 'data_rate': data_rate})
+
+    @require_bmm150
+    def notifications(self, callback=None, with_epoch=False, packed=False):
+        """Subscribe or unsubscribe to magnetometer notifications.
+
+        Convenience method for handling magnetometer usage.
+
+        Example:
+
+        .. code-block:: python
+
+            def handle_notification(data):
+                # Handle a (x,y,z) magnetic field tuple, in microtesla.
+                print("X: {0}, Y: {1}, Z: {2}".format(*data))
+
+            mwclient.magnetometer.notifications(handle_notification)
+
+        :param callable callback: Magnetometer notification callback
+            function. If `None`, unsubscription to magnetometer
+            notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the data tuple as second.
+        :param bool packed: If ``True``, the packed data signal is used,
+            sending three samples in each notification, which allows
+            for higher data rates over Bluetooth.
+
+        """
+        if callback is None:
+            super(MagnetometerModule, self).notifications(None)
+            self.stop()
+            self.toggle_sampling(False)
+            self._packed = False
+        else:
+            self._packed = packed
+            super(MagnetometerModule, self).notifications(
+                data_handler(callback, DataTypeId.CARTESIAN_FLOAT, with_epoch))
+            self.toggle_sampling(True)
+            self.start()
+
+    @require_bmm150
+    def _resume_sampling(self):
+        self.toggle_sampling(True)
+        self.start()
+
+    @require_bmm150
+    def start(self):
+        """Switches the magnetometer to active mode."""
+        libmetawear.mbl_mw_mag_bmm150_start(self.board)
+
+    @require_bmm150
+    def stop(self):
+        """Switches the magnetometer to standby mode."""
+        libmetawear.mbl_mw_mag_bmm150_stop(self.board)
+
+    @require_bmm150
+    def toggle_sampling(self, enabled=True):
+        """Enables or disables magnetometer sampling.
+
+        :param bool enabled: Desired state of the magnetometer.
+
+        """
+        if enabled:
+            libmetawear.mbl_mw_mag_bmm150_enable_b_field_sampling(self.board)
+        else:
+            libmetawear.mbl_mw_mag_bmm150_disable_b_field_sampling(self.board)
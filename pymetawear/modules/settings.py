@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-12
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_float, c_int8, c_uint8, c_uint16
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import PyMetaWearModule
+
+#: Transmit power levels, in dBm, supported by the board's radio.
+TX_POWER_LEVELS = (-20, -16, -12, -8, -4, 0, 4)
+
+
+class SettingsModule(PyMetaWearModule):
+    """MetaWear settings module implementation.
+
+    Handles the Bluetooth connection and advertising settings of the
+    board. The battery state is handled by the
+    :class:`~pymetawear.modules.BatteryModule`.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(SettingsModule, self).__init__(board, debug)
+
+    def __str__(self):
+        return "{0}".format(self.module_name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'Settings'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for Settings module.
+
+        Use the ``battery`` attribute of the client for battery
+        state notifications.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for Settings module.")
+
+    def set_connection_parameters(self, min_conn_interval=7.5,
+                                  max_conn_interval=7.5, latency=0,
+                                  timeout=6000):
+        """Request new BLE connection parameters from the host.
+
+        The connection interval bounds the possible throughput, since
+        only a limited number of notifications can be sent per
+        connection event. The host may choose any interval within the
+        requested range, or reject the request.
+
+        :param float min_conn_interval: Minimum connection interval,
+            in milliseconds, in [7.5, 4000].
+        :param float max_conn_interval: Maximum connection interval,
+            in milliseconds, in [7.5, 4000].
+        :param int latency: Number of connection events the board may
+            skip, in [0, 1000].
+        :param int timeout: Supervision timeout, in milliseconds,
+            in [10, 32000].
+
+        """
+        if not (7.5 <= min_conn_interval <= max_conn_interval <= 4000.0):
+            raise ValueError("Invalid connection interval range: "
+                             "[{0}, {1}]".format(min_conn_interval,
+                                                 max_conn_interval))
+        if not (0 <= latency <= 1000):
+            raise ValueError("Invalid latency: {0}".format(latency))
+        if not (10 <= timeout <= 32000):
+            raise ValueError("Invalid timeout: {0}".format(timeout))
+        if self._debug:
+            print("Setting connection parameters: interval [{0}, {1}] ms, "
+                  "latency {2}, timeout {3} ms".format(
+                    min_conn_interval, max_conn_interval, latency, timeout))
+        libmetawear.mbl_mw_settings_set_connection_parameters(
+            self.board, c_float(min_conn_interval),
+            c_float(max_conn_interval), c_uint16(int(latency)),
+            c_uint16(int(timeout)))
+
+    def set_tx_power(self, tx_power):
+        """Set the transmit power of the board's radio.
+
+        :param int tx_power: Transmit power, in dBm. One of
+            :data:`TX_POWER_LEVELS`.
+
+        """
+        if int(tx_power) not in TX_POWER_LEVELS:
+            raise ValueError("Requested TX power ({0}) was not part of "
+                             "possible values: {1}".format(
+                tx_power, list(TX_POWER_LEVELS)))
+        if self._debug:
+            print("Setting TX power to {0} dBm".format(tx_power))
+        libmetawear.mbl_mw_settings_set_tx_power(
+            self.board, c_int8(int(tx_power)))
+
+    def set_ad_interval(self, interval, timeout=0):
+        """Set the advertising interval of the board.
+
+        :param int interval: Advertising interval, in milliseconds.
+        :param int timeout: Advertising timeout, in seconds.
+            0 for no timeout.
+
+        """
+        libmetawear.mbl_mw_settings_set_ad_interval(
+            self.board, c_uint16(int(interval)), c_uint8(int(timeout)))
+
+    def get_possible_settings(self):
+        return {
+            'tx_power': list(TX_POWER_LEVELS),
+            'conn_interval': [7.5, 4000.0],
+            'latency': [0, 1000],
+            'timeout': [10, 32000]
+        }
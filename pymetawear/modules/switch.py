@@ -13,12 +13,10 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import absolute_import
 
-from functools import wraps
-from ctypes import c_uint, cast, POINTER
-
 from pymetawear import libmetawear
+from pymetawear.decoding import data_handler
 from pymetawear.exceptions import PyMetaWearException
-from pymetawear.mbientlab.metawear.core import DataTypeId, CartesianFloat
+from pymetawear.mbientlab.metawear.core import DataTypeId
 from pymetawear.modules.base import PyMetaWearModule
 
 
@@ -49,7 +47,7 @@ class SwitchModule(PyMetaWearModule):
         return self._data_signal_preprocess(
             libmetawear.mbl_mw_switch_get_state_data_signal)
 
-    def notifications(self, callback=None):
+    def notifications(self, callback=None, with_epoch=False):
         """Subscribe or unsubscribe to switch notifications.
 
         Convenience method for handling switch usage.
@@ -68,19 +66,11 @@ class SwitchModule(PyMetaWearModule):
 
         :param callable callback: Switch notification callback function.
             If `None`, unsubscription to switch notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the switch state as second.
 
         """
         super(SwitchModule, self).notifications(
-            switch_data(callback) if callback is not None else None)
-
-
-def switch_data(func):
-    @wraps(func)
-    def wrapper(data):
-        if data.contents.type_id == DataTypeId.UINT32:
-            data_ptr = cast(data.contents.value, POINTER(c_uint))
-            func(data_ptr.contents.value)
-        else:
-            raise PyMetaWearException('Incorrect data type id: {0}'.format(
-                data.contents.type_id))
-    return wrapper
+            data_handler(callback, DataTypeId.UINT32, with_epoch)
+            if callback is not None else None)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created on 2016-05-14
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_long, c_uint8
+
+from pymetawear import libmetawear
+from pymetawear.decoding import data_handler
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import DataTypeId
+from pymetawear.modules.base import PyMetaWearModule, Modules
+from pymetawear.utils import IS_64_BIT
+
+
+class TemperatureSource(object):
+    """Sources of the temperature channels, from ``libmetawear``."""
+
+    INVALID = -1
+    NRF_DIE = 0
+    EXT_THERM = 1
+    BMP280 = 2
+    PRESET_THERM = 3
+
+
+def require_temperature(f):
+    def wrapper(*args, **kwargs):
+        if getattr(args[0], 'channels', None) is None:
+            raise PyMetaWearException("There is not Temperature "
+                                      "module on your MetaWear board!")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+class TemperatureModule(PyMetaWearModule):
+    """MetaWear temperature module implementation.
+
+    The temperature is only measured when read. Reads can either be
+    requested with :meth:`~read`, or scheduled on the board by passing
+    a period to :meth:`~notifications`, so that no commands have to be
+    sent while streaming.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param int module_id: The module id of this temperature
+        component, obtained from ``libmetawear``.
+    :param bool debug: If ``True``, module prints out debug information.
+    :param pymetawear.modules.TimerModule timer_module: The timer module
+        of the client, used for reads scheduled on the board.
+
+    """
+
+    def __init__(self, board, module_id, debug=False, timer_module=None):
+        super(TemperatureModule, self).__init__(board, debug)
+        self.module_id = module_id
+        self._timer_module = timer_module
+        self.channel = 0
+        self._timer = None
+
+        if self.module_id == Modules.MBL_MW_MODULE_NA:
+            # No temperature module present!
+            self.channels = None
+        else:
+            sources = {getattr(TemperatureSource, k): k.lower()
+                       for k in vars(TemperatureSource) if k.isupper()}
+            n_channels = libmetawear.mbl_mw_multi_chnl_temp_get_num_channels(
+                self.board)
+            self.channels = [
+                sources.get(libmetawear.mbl_mw_multi_chnl_temp_get_source(
+                    self.board, c_uint8(k)), 'invalid')
+                for k in range(n_channels)]
+
+    def __str__(self):
+        return "{0}: Channels: {1}".format(self.module_name, self.channels)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return "Temperature"
+
+    @property
+    def sensor_name(self):
+        if self.channels is not None:
+            return self.channels[self.channel]
+        else:
+            return ''
+
+    @property
+    @require_temperature
+    def data_signal(self):
+        data_signal_func = \
+            libmetawear.mbl_mw_multi_chnl_temp_get_temperature_data_signal
+        if IS_64_BIT:
+            data_signal_func.restype = c_long
+            return c_long(data_signal_func(self.board,
+                                           c_uint8(self.channel)))
+        return data_signal_func(self.board, c_uint8(self.channel))
+
+    @require_temperature
+    def get_current_settings(self):
+        return {'channel': self.channel}
+
+    @require_temperature
+    def get_possible_settings(self):
+        return {
+            'channel': list(range(len(self.channels)))
+        }
+
+    @require_temperature
+    def set_settings(self, channel=None):
+        """Set temperature settings.
+
+        Call :meth:`~get_possible_settings` to see which channels
+        that are available, and the ``channels`` attribute for
+        the source of each channel.
+
+        :param int channel: The channel to read temperature from.
+
+        """
+        if channel is not None:
+            if int(channel) not in range(len(self.channels)):
+                raise ValueError("Requested channel ({0}) was not part of "
+                                 "possible values: {1}".format(
+                    channel, list(range(len(self.channels)))))
+            if self.callback is not None:
+                raise PyMetaWearException(
+                    "Cannot change channel while subscribed.")
+            self.channel = int(channel)
+
+    @require_temperature
+    def notifications(self, callback=None, with_epoch=False, period=None):
+        """Subscribe or unsubscribe to temperature notifications.
+
+        Convenience method for handling temperature usage.
+
+        Example:
+
+        .. code-block:: python
+
+            def handle_notification(data):
+                # Handle a temperature value, in degrees Celsius.
+                print("Temperature: {0}".format(data))
+
+            # Let the board read the temperature every 10 seconds.
+            mwclient.temperature.notifications(handle_notification,
+                                               period=10000)
+
+        :param callable callback: Temperature notification callback
+            function. If `None`, unsubscription to temperature
+            notifications is registered.
+        :param bool with_epoch: If ``True``, the callback is called with
+            the board timestamp in milliseconds as first argument and
+            the value as second.
+        :param int period: If given, a timer on the board reads the
+            temperature with this period, in milliseconds. Otherwise,
+            values are only delivered after calls to :meth:`~read`.
+
+        """
+        if callback is None:
+            if self._timer is not None:
+                self._timer.stop()
+                self._timer.remove()
+                self._timer = None
+            super(TemperatureModule, self).notifications(None)
+        else:
+            if period is not None and self._timer_module is None:
+                raise PyMetaWearException(
+                    "No timer module given for scheduled reads.")
+            super(TemperatureModule, self).notifications(
+                data_handler(callback, DataTypeId.FLOAT, with_epoch))
+            if period is not None:
+                self._timer = self._timer_module.periodic_read(self, period)
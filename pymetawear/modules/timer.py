@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+.. moduleauthor:: hbldh <henrik.blidh@nedomkull.com>
+
+Created: 2016-05-10
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_uint8, c_uint16, c_uint32
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import PyMetaWearModule, create_board_object
+from pymetawear.modules.event import record_commands
+
+
+class Timer(object):
+    """Handle to a timer on the board.
+
+    Created by :meth:`TimerModule.create`.
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param ctypes.c_long timer: The timer pointer value.
+    :param int period: Timer period, in milliseconds.
+    :param int repetitions: Number of times the timer fires,
+        ``None`` for indefinitely.
+    :param bool debug: If ``True``, prints out debug information.
+
+    """
+
+    def __init__(self, board, timer, period, repetitions=None, debug=False):
+        self.board = board
+        self.timer = timer
+        self.period = period
+        self.repetitions = repetitions
+        self._debug = debug
+
+    def __str__(self):
+        return "Timer: {0} ms, {1}".format(
+            self.period, 'indefinitely' if self.repetitions is None else
+            '{0} times'.format(self.repetitions))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def record(self, commands, timeout=5.0):
+        """Record commands for the board to execute each time
+        the timer fires.
+
+        :param callable commands: Function issuing the commands to
+            record, e.g. ``mwclient.battery.read``.
+        :param float timeout: Time to wait for the board to
+            store the commands, in seconds.
+
+        """
+        if self._debug:
+            print("Recording commands for {0}.".format(self))
+        record_commands(self.board, self.timer, commands, timeout)
+
+    def start(self):
+        """Start the timer."""
+        libmetawear.mbl_mw_timer_start(self.timer)
+
+    def stop(self):
+        """Stop the timer."""
+        libmetawear.mbl_mw_timer_stop(self.timer)
+
+    def remove(self):
+        """Remove the timer, and the commands recorded for it,
+        from the board."""
+        libmetawear.mbl_mw_timer_remove(self.timer)
+
+
+class TimerModule(PyMetaWearModule):
+    """MetaWear timer module implementation.
+
+    Lets the board execute commands periodically by itself, e.g. reading
+    the battery state or any other readable data signal, instead of
+    the client polling it.
+
+    Example:
+
+    .. code-block:: python
+
+        mwclient.battery.notifications(battery_callback)
+        timer = mwclient.timer.periodic_read(mwclient.battery, 60000)
+        # ... and later
+        timer.stop()
+        timer.remove()
+
+    :param ctypes.c_long board: The MetaWear board pointer value.
+    :param bool debug: If ``True``, module prints out debug information.
+
+    """
+
+    def __init__(self, board, debug=False):
+        super(TimerModule, self).__init__(board, debug)
+
+    def __str__(self):
+        return "{0}".format(self.module_name)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def module_name(self):
+        return 'Timer'
+
+    def notifications(self, callback=None):
+        """No subscriptions possible for Timer module.
+
+        :raises: :py:exc:`~PyMetaWearException`
+
+        """
+        raise PyMetaWearException(
+            "No notifications available for Timer module.")
+
+    def create(self, period, repetitions=None, delay=False, timeout=5.0):
+        """Create a timer on the board.
+
+        :param int period: Timer period, in milliseconds.
+        :param int repetitions: Number of times the timer fires.
+            If ``None``, it fires until stopped.
+        :param bool delay: If the first firing should be delayed one
+            period after start, instead of firing immediately.
+        :param float timeout: Time to wait for the board to
+            create the timer, in seconds.
+        :return: Handle to the timer.
+        :rtype: :class:`Timer`
+
+        """
+        if repetitions is None:
+            timer = create_board_object(
+                lambda cb: libmetawear.mbl_mw_timer_create_indefinite(
+                    self.board, c_uint32(int(period)),
+                    c_uint8(int(bool(delay))), cb), timeout)
+        else:
+            timer = create_board_object(
+                lambda cb: libmetawear.mbl_mw_timer_create(
+                    self.board, c_uint32(int(period)),
+                    c_uint16(int(repetitions)),
+                    c_uint8(int(bool(delay))), cb), timeout)
+        if timer is None:
+            raise PyMetaWearException("Could not create timer.")
+        return Timer(self.board, timer, int(period), repetitions,
+                     debug=self._debug)
+
+    def schedule(self, period, commands, repetitions=None, start=True):
+        """Create a timer executing commands periodically.
+
+        :param int period: Timer period, in milliseconds.
+        :param callable commands: Function issuing the commands to
+            execute each period.
+        :param int repetitions: Number of times the timer fires.
+            If ``None``, it fires until stopped.
+        :param bool start: If the timer should be started directly.
+        :return: Handle to the timer.
+        :rtype: :class:`Timer`
+
+        """
+        timer = self.create(period, repetitions)
+        try:
+            timer.record(commands)
+        except Exception:
+            # Free the timer slot on the board.
+            timer.remove()
+            raise
+        if start:
+            timer.start()
+        return timer
+
+    def periodic_read(self, source, period, repetitions=None, start=True):
+        """Create a timer reading a data signal periodically.
+
+        The read data is delivered to the source's notification
+        callback, which should be registered beforehand.
+
+        :param source: The module, e.g. ``mwclient.battery``, or data
+            processor to read from.
+        :param int period: Time between reads, in milliseconds.
+        :param int repetitions: Number of reads. If ``None``,
+            reads until stopped.
+        :param bool start: If the timer should be started directly.
+        :return: Handle to the timer.
+        :rtype: :class:`Timer`
+
+        """
+        return self.schedule(period, source.read, repetitions, start)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`monitor`
+==============
+
+Detection of sample gaps and stalls of data signals.
+
+Gaps are detected from the board timestamps of consecutive samples,
+compared with the period of the configured data rate. Stalls are detected
+by a watchdog thread, from the sample counter of the signal statistics,
+so they add nothing to the handling of each sample.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-24
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+from collections import namedtuple
+
+from pymetawear.stats import _clock
+
+#: Samples missing in a signal. ``previous`` and ``epoch`` are the board
+#: timestamps, in milliseconds, of the samples around the gap, and
+#: ``missing`` the estimated number of samples lost between them.
+GapEvent = namedtuple('GapEvent', ['signal', 'previous', 'epoch', 'missing'])
+
+#: A signal that has delivered no samples for ``duration`` seconds.
+StallEvent = namedtuple('StallEvent', ['signal', 'duration'])
+
+
+class SignalMonitor(object):
+    """Monitor of a data signal, set up with
+    :meth:`pymetawear.modules.base.PyMetaWearModule.watch`.
+
+    :param str name: Name of the signal, used in the events.
+    :param pymetawear.stats.SignalStats stats: The statistics of the
+        signal, for the number of samples delivered.
+    :param float data_rate: Rate of the signal, in Hz. If ``None``, the
+        configured data rate of the module is used, and if there is none,
+        gaps are not detected.
+    :param float tolerance: Allowed deviation from the period between two
+        samples, as a fraction of the period, before it is counted as
+        a gap.
+    :param float stall_timeout: Time without samples, in seconds, that
+        is a stall. If ``None``, stalls are not detected.
+    :param callable on_gap: Function called with a :class:`GapEvent`.
+    :param callable on_stall: Function called with a :class:`StallEvent`
+        when a stall begins.
+
+    """
+
+    def __init__(self, name, stats, data_rate=None, tolerance=0.5,
+                 stall_timeout=None, on_gap=None, on_stall=None):
+        self.name = name
+        self.stats = stats
+        self.data_rate = data_rate
+        self.tolerance = tolerance
+        self.stall_timeout = stall_timeout
+        self.on_gap = on_gap
+        self.on_stall = on_stall
+
+        self.stalled = False
+        self._period = None
+        self.reset()
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def __str__(self):
+        return "SignalMonitor: {0}, {1} gaps, {2} stalls".format(
+            self.name, self.n_gaps, self.n_stalls)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def reset(self):
+        """Restart counting gaps and stalls."""
+        self.n_gaps = 0
+        self.n_missing = 0
+        self.n_stalls = 0
+
+    def wrap(self, callback, data_rate=None):
+        """Wrap a data callback with gap detection.
+
+        :param callable callback: Function taking a data pointer.
+        :param float data_rate: Rate of the signal, in Hz, if not
+            given to the monitor.
+        :return: The monitoring function.
+        :rtype: callable
+
+        """
+        data_rate = self.data_rate if self.data_rate is not None \
+            else data_rate
+        if not data_rate:
+            self._period = None
+            return callback
+        self._period = 1000.0 / data_rate
+        max_delta = self._period * (1 + self.tolerance)
+        last = [float('inf')]
+
+        def wrapper(data):
+            epoch = data.contents.epoch
+            if epoch - last[0] > max_delta:
+                self._gap(last[0], epoch)
+            last[0] = epoch
+            callback(data)
+        return wrapper
+
+    def _gap(self, previous, epoch):
+        missing = max(int(round((epoch - previous) / self._period)) - 1, 1)
+        self.n_gaps += 1
+        self.n_missing += missing
+        if self.on_gap is not None:
+            self.on_gap(GapEvent(self.name, previous, epoch, missing))
+
+    def start(self):
+        """Start the stall watchdog, if a stall timeout is set."""
+        self._started = _clock()
+        self.stalled = False
+        if self.stall_timeout is None or self._thread is not None:
+            return
+        # Each watchdog has its own stop event, so that a watchdog
+        # stopped from its stall callback is not restarted by a new one.
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch,
+                                        args=(self._stop, ))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the stall watchdog. May be called from the stall
+        callback, in which case the watchdog ends when it returns."""
+        self._stop.set()
+        if self._thread is not None and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _watch(self, stop):
+        # Samples are noticed from the sample counter, since their
+        # arrival times are only recorded when the callback is timed.
+        last = self._started
+        n_samples = self.stats.samples
+        while not stop.wait(self.stall_timeout / 4):
+            if self.stats.samples != n_samples:
+                n_samples = self.stats.samples
+                last = _clock()
+            idle = _clock() - last
+            if idle > self.stall_timeout:
+                if not self.stalled:
+                    self.stalled = True
+                    self.n_stalls += 1
+                    if self.on_stall is not None:
+                        self.on_stall(StallEvent(self.name, idle))
+            else:
+                self.stalled = False
+
+    def as_dict(self):
+        """Get the monitor counters as structured data.
+
+        :return: Dictionary of the number of gaps, missing samples and
+            stalls, and if the signal is stalled.
+        :rtype: dict
+
+        """
+        return {
+            'gaps': self.n_gaps,
+            'missing': self.n_missing,
+            'stalls': self.n_stalls,
+            'stalled': self.stalled,
+        }
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`packets`
+==============
+
+Vectorized decoding of raw accelerometer and gyroscope notification
+payloads, as an alternative to decoding them one at a time through
+``libmetawear`` and a Python callback.
+
+A notification payload starts with the module id and the register id,
+followed by the data. A data notification holds one sample of three
+little endian 16 bit integers, and a packed notification three such
+samples. The integers are scaled to ``g`` and ``dps`` with the
+sensitivity of the data range in use, like ``libmetawear`` does.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-18
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import create_string_buffer
+
+import numpy as np
+
+from pymetawear import libmetawear
+
+#: Accelerometer sensitivity in LSB/g, per data range in g.
+ACC_LSB_PER_G = {2.0: 16384.0, 4.0: 8192.0, 8.0: 4096.0, 16.0: 2048.0}
+#: Gyroscope sensitivity in LSB/dps, per data range in dps.
+GYRO_LSB_PER_DPS = {125.0: 262.4, 250.0: 131.2, 500.0: 65.6,
+                    1000.0: 32.8, 2000.0: 16.4}
+
+#: Module id, data register id and packed data register id of the
+#: BMI160 and BMA255 accelerometer notifications.
+ACC_REGISTERS = (0x03, 0x04, 0x1c)
+#: Module id, data register id and packed data register id of the
+#: BMI160 gyroscope notifications.
+GYRO_REGISTERS = (0x13, 0x05, 0x07)
+
+#: Samples per packed notification.
+PACKED_SAMPLES = 3
+_SAMPLE_SIZE = 6
+_DATA_LENGTH = 2 + _SAMPLE_SIZE
+_PACKED_LENGTH = 2 + PACKED_SAMPLES * _SAMPLE_SIZE
+
+
+def as_payload_array(payloads, payload_size=_PACKED_LENGTH):
+    """Convert notification payloads to a zero padded array.
+
+    :param list payloads: Payloads as :class:`bytearray` or :class:`bytes`.
+    :param int payload_size: Row size of the array. Longer payloads
+        are truncated.
+    :return: Array of shape ``(n, payload_size)`` of ``uint8``, and
+        array of the payload lengths.
+    :rtype: tuple
+
+    """
+    lengths = np.array([min(len(p), payload_size) for p in payloads],
+                       dtype='uint8')
+    padding = b'\x00' * payload_size
+    raw = b''.join(bytes(p[:payload_size]) + padding[len(p):]
+                   for p in payloads)
+    array = np.frombuffer(raw, dtype='uint8').reshape(
+        (len(lengths), payload_size))
+    return array, lengths
+
+
+def _prepare(payloads, lengths):
+    if lengths is None:
+        payloads, lengths = as_payload_array(payloads)
+    payloads = np.asarray(payloads, dtype='uint8')
+    lengths = np.asarray(lengths)
+    if payloads.ndim != 2:
+        raise ValueError("Payloads must be a two dimensional array.")
+    if payloads.shape[1] < _PACKED_LENGTH:
+        padded = np.zeros((len(payloads), _PACKED_LENGTH), dtype='uint8')
+        padded[:, :payloads.shape[1]] = payloads
+        payloads = padded
+    return payloads, lengths
+
+
+def decode_cartesian(payloads, lengths, registers, scale, times=None):
+    """Decode the cartesian data and packed data notifications of one
+    sensor in a batch of payloads.
+
+    Payloads of other sensors or registers, or with unexpected lengths,
+    are skipped. Samples are returned in the order they were sent.
+
+    :param payloads: Array of shape ``(n, payload_size)`` of ``uint8``,
+        or a list of payloads if ``lengths`` is ``None``.
+    :param lengths: Array of the ``n`` payload lengths.
+    :param tuple registers: Module id, data register id and
+        packed data register id of the sensor.
+    :param float scale: The sensitivity, in LSB per unit.
+    :param times: Optional array of the ``n`` times of reception.
+        The samples of a packed notification get the time of
+        their notification.
+    :return: Array of the times of the samples, or ``None`` if no
+        times were given, and array of shape ``(m, 3)`` of the samples.
+    :rtype: tuple
+
+    """
+    payloads, lengths = _prepare(payloads, lengths)
+    module_id, data_register, packed_register = registers
+
+    from_module = payloads[:, 0] == module_id
+    data = from_module & (payloads[:, 1] == data_register) & \
+        (lengths == _DATA_LENGTH)
+    packed = from_module & (payloads[:, 1] == packed_register) & \
+        (lengths == _PACKED_LENGTH)
+    index = np.flatnonzero(data | packed)
+    n_samples = np.where(packed[index], PACKED_SAMPLES, 1)
+
+    raw = np.ascontiguousarray(payloads[index, 2:_PACKED_LENGTH])
+    raw = raw.view('<i2').reshape((len(index), PACKED_SAMPLES, 3))
+    valid = np.arange(PACKED_SAMPLES)[None, :] < n_samples[:, None]
+    values = raw[valid] / scale
+
+    if times is not None:
+        times = np.repeat(np.asarray(times)[index], n_samples)
+    return times, values
+
+
+def decode_accelerometer(payloads, lengths=None, data_range=2.0, times=None):
+    """Decode BMI160 and BMA255 accelerometer notifications, in ``g``.
+
+    See :func:`decode_cartesian` for the parameters and return value.
+
+    :param float data_range: The accelerometer data range in ``g``.
+
+    """
+    if float(data_range) not in ACC_LSB_PER_G:
+        raise ValueError("Unknown accelerometer range: {0}".format(
+            data_range))
+    return decode_cartesian(payloads, lengths, ACC_REGISTERS,
+                            ACC_LSB_PER_G[float(data_range)], times)
+
+
+def decode_gyroscope(payloads, lengths=None, data_range=2000.0, times=None):
+    """Decode BMI160 gyroscope notifications, in ``dps``.
+
+    See :func:`decode_cartesian` for the parameters and return value.
+
+    :param float data_range: The gyroscope data range in ``dps``.
+
+    """
+    if float(data_range) not in GYRO_LSB_PER_DPS:
+        raise ValueError("Unknown gyroscope range: {0}".format(data_range))
+    return decode_cartesian(payloads, lengths, GYRO_REGISTERS,
+                            GYRO_LSB_PER_DPS[float(data_range)], times)
+
+
+def decode_with_libmetawear(module, payloads, packed=False):
+    """Decode notification payloads through ``libmetawear``, for
+    validation of the decoders in this module against it.
+
+    The module is subscribed to, each payload is passed to ``libmetawear``
+    as if it had been received from the board, and the module is then
+    unsubscribed from. The board must be connected, since subscribing
+    writes to it.
+
+    :param module: An accelerometer or gyroscope module of a client.
+    :param list payloads: Payloads as :class:`bytearray` or :class:`bytes`.
+    :param bool packed: If the payloads are packed notifications.
+    :return: Array of shape ``(m, 3)`` of the samples.
+    :rtype: :class:`numpy.ndarray`
+
+    """
+    values = []
+    module.notifications(values.append, packed=packed)
+    try:
+        for payload in payloads:
+            sb = create_string_buffer(bytes(payload), len(payload))
+            libmetawear.mbl_mw_connection_notify_char_changed(
+                module.board, sb.raw, len(sb.raw))
+    finally:
+        module.notifications(None)
+    return np.array(values, dtype='float').reshape((len(values), 3))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`reconnect`
+================
+
+Automatic reconnection of clients that have lost their connection.
+
+The ``libmetawear`` board object of the client is kept, so the board is
+not discovered or initialized again. Once connected, the settings shadow
+and the subscription of every module are written to the board again, see
+:meth:`pymetawear.modules.base.PyMetaWearModule.reapply`. Settings the
+client has not changed are not written, but the changed settings and the
+subscriptions are written whether or not the board still holds them, since
+that cannot be known without a round trip per setting.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-23
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import threading
+from collections import namedtuple
+
+#: A lost and restored connection. ``lost`` is the host time the lost
+#: connection was detected, ``connected`` the time the connection was up
+#: again and ``restored`` the time settings and subscriptions had been
+#: written. ``downtime`` is the time from ``lost`` to ``restored``, in
+#: seconds, ``attempts`` the number of connection attempts and ``writes``
+#: the number of commands written to restore the session. If reconnection
+#: failed, ``connected`` and ``restored`` are ``None``. ``error`` is the
+#: exception of the last failed attempt, or ``None``.
+ReconnectEvent = namedtuple('ReconnectEvent', ['lost', 'connected',
+                                               'restored', 'downtime',
+                                               'attempts', 'writes',
+                                               'error'])
+
+
+class AutoReconnect(object):
+    """Watchdog reconnecting a client when its connection is lost.
+
+    The connection is checked in a separate thread. When it is lost,
+    reconnection is attempted with exponential backoff between attempts.
+    An attempt fails if either connecting or restoring the session fails,
+    e.g. if the connection is lost again while restoring.
+
+    :param pymetawear.client.MetaWearClient client: The client.
+    :param float check_interval: Time between connection checks,
+        in seconds.
+    :param float initial_delay: Time to wait after the first failed
+        attempt, in seconds.
+    :param float max_delay: Maximal time between attempts, in seconds.
+    :param float factor: Factor to multiply the time between attempts
+        with after each failed attempt.
+    :param int max_attempts: Number of attempts before giving up and
+        stopping the watchdog, or ``None`` to never give up.
+    :param callable callback: Function called with a
+        :class:`ReconnectEvent` after each lost connection.
+
+    """
+
+    def __init__(self, client, check_interval=1.0, initial_delay=0.5,
+                 max_delay=30.0, factor=2.0, max_attempts=None,
+                 callback=None):
+        self.client = client
+        self.check_interval = check_interval
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.max_attempts = max_attempts
+        self.callback = callback
+        self.events = []
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __str__(self):
+        return "AutoReconnect: {0}, {1} reconnections".format(
+            self.client, len(self.events))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start watching the connection."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching the connection, and any ongoing reconnection."""
+        self._stop.set()
+        if self._thread is not None and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                if self.client.backend.is_connected():
+                    continue
+                event = self.reconnect()
+            except Exception:
+                # E.g. an error in the callback, which must not end the
+                # watchdog.
+                continue
+            if event.connected is None and not self._stop.is_set():
+                # Given up on the board.
+                return
+
+    def reconnect(self):
+        """Reconnect the client and restore its session.
+
+        :return: The reconnection event.
+        :rtype: :class:`ReconnectEvent`
+
+        """
+        backend = self.client.backend
+        lost = time.time()
+        delay = self.initial_delay
+        attempts = 0
+        connected = None
+        error = None
+        while not self._stop.is_set():
+            attempts += 1
+            try:
+                backend.reconnect()
+                connected = time.time()
+                n_writes = backend.stats.packets_out
+                self.client.restore_session()
+                break
+            except Exception as e:
+                connected, error = None, e
+                if self.max_attempts is not None and \
+                        attempts >= self.max_attempts:
+                    break
+                self._stop.wait(delay)
+                delay = min(delay * self.factor, self.max_delay)
+
+        if connected is None:
+            event = ReconnectEvent(lost, None, None, None, attempts, 0,
+                                   error)
+        else:
+            restored = time.time()
+            event = ReconnectEvent(lost, connected, restored,
+                                   restored - lost, attempts,
+                                   backend.stats.packets_out - n_writes,
+                                   error)
+        self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+        return event
@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`recording`
+================
+
+Chunked, columnar on-disk recording of data streams, read back
+through memory maps.
+
+A recording is a directory with a ``recording.json`` file describing
+the streams in it. Each stream is stored as one raw binary file per
+column, e.g. ``acc.epoch.bin``, ``acc.x.bin``, ``acc.y.bin`` and
+``acc.z.bin``, which are appended to in chunks of samples, and an
+index file, ``acc.index.bin``, with the number of samples and the
+first and last epoch of every chunk.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-05
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+import json
+
+import numpy as np
+
+from pymetawear.batching import SampleBatcher
+from pymetawear.exceptions import PyMetaWearException
+
+RECORDING_FILE_NAME = 'recording.json'
+
+#: Index entries: number of samples, first epoch and last epoch of a chunk.
+INDEX_DTYPE = np.dtype([(str('n'), '<i8'), (str('first_epoch'), '<i8'),
+                        (str('last_epoch'), '<i8')])
+
+#: Default columns for the streams of PyMetaWear modules.
+MODULE_COLUMNS = {
+    'AccelerometerModule': (('x', '<f4'), ('y', '<f4'), ('z', '<f4')),
+    'GyroscopeModule': (('x', '<f4'), ('y', '<f4'), ('z', '<f4')),
+    'MagnetometerModule': (('x', '<f4'), ('y', '<f4'), ('z', '<f4')),
+    'BatteryModule': (('voltage', '<u2'), ('charge', '<u1')),
+    'SwitchModule': (('state', '<u1'), ),
+    'BarometerModule': (('pressure', '<f4'), ),
+    'TemperatureModule': (('temperature', '<f4'), ),
+    'HumidityModule': (('humidity', '<f4'), ),
+    'AmbientLightModule': (('illuminance', '<u4'), ),
+}
+
+
+def _column_path(directory, stream_name, column_name):
+    return os.path.join(directory, "{0}.{1}.bin".format(
+        stream_name, column_name))
+
+
+class StreamWriter(object):
+    """Appends samples of one stream to its column files.
+
+    Created by :meth:`Recorder.stream`.
+
+    """
+
+    def __init__(self, directory, name, columns, chunk_size):
+        self.directory = directory
+        self.name = name
+        self.columns = tuple((c, np.dtype(d)) for c, d in columns)
+        self.chunk_size = chunk_size
+
+        self._truncate()
+        self._epoch_file = open(
+            _column_path(directory, name, 'epoch'), 'ab')
+        self._column_files = [open(_column_path(directory, name, c), 'ab')
+                              for c, _ in self.columns]
+        self._index_file = open(
+            _column_path(directory, name, 'index'), 'ab')
+        self._batcher = SampleBatcher(self.write_chunk, chunk_size,
+                                      n_columns=len(self.columns))
+
+    def __str__(self):
+        return "StreamWriter: {0} [{1}]".format(
+            self.name, ", ".join([c for c, _ in self.columns]))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def _truncate(self):
+        # Data written after the last complete index entry, e.g. before a
+        # crash, is cut off, so that appended chunks follow the indexed ones.
+        index_path = _column_path(self.directory, self.name, 'index')
+        if not os.path.exists(index_path):
+            n_index = n = 0
+        else:
+            n_index = os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+            n = int(np.fromfile(index_path, dtype=INDEX_DTYPE,
+                                count=n_index)['n'].sum())
+        for path, size in [(index_path, n_index * INDEX_DTYPE.itemsize),
+                           (_column_path(self.directory, self.name,
+                                         'epoch'), n * 8)] + \
+                [(_column_path(self.directory, self.name, c),
+                  n * d.itemsize) for c, d in self.columns]:
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def receiver(self):
+        """Get a notification callback, taking an epoch and a value,
+        for recording a module's notifications.
+
+        :rtype: callable
+
+        """
+        return self.append
+
+    def append(self, epoch, value):
+        """Record one sample.
+
+        :param int epoch: Board timestamp in milliseconds.
+        :param value: Tuple of values, or a single value for
+            streams with one column.
+
+        """
+        if not isinstance(value, (tuple, list)):
+            value = (value, )
+        self._batcher.append(epoch, value)
+
+    def append_batch(self, epochs, values):
+        """Record a batch of samples.
+
+        :param array_like epochs: Board timestamps in milliseconds.
+        :param array_like values: Array of shape ``(n, n_columns)``.
+
+        """
+        self._batcher.flush()
+        epochs = np.asarray(epochs)
+        values = np.asarray(values).reshape((len(epochs), len(self.columns)))
+        for i in range(0, len(epochs), self.chunk_size):
+            self.write_chunk(epochs[i:i + self.chunk_size],
+                             values[i:i + self.chunk_size])
+
+    def write_chunk(self, epochs, values):
+        """Write a chunk of samples to the column files and index."""
+        if not len(epochs):
+            return
+        np.asarray(epochs, dtype='<i8').tofile(self._epoch_file)
+        for k, (f, (_, dtype)) in enumerate(
+                zip(self._column_files, self.columns)):
+            np.asarray(values[:, k], dtype=dtype).tofile(f)
+        for f in [self._epoch_file] + self._column_files:
+            f.flush()
+        # The index is written last, so that it only covers complete chunks.
+        index = np.array([(len(epochs), epochs[0], epochs[-1])],
+                         dtype=INDEX_DTYPE)
+        index.tofile(self._index_file)
+        self._index_file.flush()
+
+    def flush(self):
+        """Write samples not yet making up a full chunk."""
+        self._batcher.flush()
+
+    def close(self):
+        """Write remaining samples and close the files."""
+        self.flush()
+        for f in [self._epoch_file, self._index_file] + self._column_files:
+            f.close()
+
+
+class Recorder(object):
+    """Records data streams, e.g. from several boards, to a directory.
+
+    Example:
+
+    .. code-block:: python
+
+        rec = Recorder('/data/session_1')
+        rec.attach(mwclient_1.accelerometer, 'acc_1')
+        rec.attach(mwclient_2.accelerometer, 'acc_2')
+        # ... Record for hours, and then
+        rec.close()
+
+    :param str directory: Directory of the recording. It is created if
+        it does not exist. Streams in an existing recording are
+        appended to.
+    :param int chunk_size: Number of samples to collect before
+        writing them to disk.
+
+    """
+
+    def __init__(self, directory, chunk_size=4096):
+        self.directory = directory
+        self.chunk_size = int(chunk_size)
+        self.writers = {}
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self._meta_path = os.path.join(self.directory, RECORDING_FILE_NAME)
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, 'r') as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {'streams': {}}
+
+    def __str__(self):
+        return "Recorder: {0}, {1}".format(
+            self.directory, sorted(self.writers))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def stream(self, name, columns=(('x', '<f4'), ('y', '<f4'), ('z', '<f4'))):
+        """Get the writer for a stream, creating it if needed.
+
+        :param str name: Name of the stream. Used in the file names.
+        :param tuple columns: Tuples of column name and NumPy data type.
+        :return: The writer for the stream.
+        :rtype: :class:`StreamWriter`
+
+        """
+        if name in self.writers:
+            return self.writers[name]
+        columns = [(c, np.dtype(d).str) for c, d in columns]
+        for c, _ in columns:
+            if c in ('epoch', 'index'):
+                raise PyMetaWearException(
+                    "Column name {0} is reserved.".format(c))
+        stream_meta = self.meta['streams'].get(name)
+        if stream_meta is None:
+            self.meta['streams'][name] = {'columns': columns}
+            self._write_meta()
+        elif [tuple(c) for c in stream_meta['columns']] != \
+                [tuple(c) for c in columns]:
+            raise PyMetaWearException(
+                "Stream {0} is recorded with other columns: {1}".format(
+                    name, stream_meta['columns']))
+        writer = StreamWriter(self.directory, name, columns, self.chunk_size)
+        self.writers[name] = writer
+        return writer
+
+    def attach(self, module, name=None, columns=None):
+        """Record notifications from a module.
+
+        :param pymetawear.modules.PyMetaWearModule module: The module
+            to subscribe to, e.g. ``mwclient.accelerometer``.
+        :param str name: Name of the stream. Defaults to the module's
+            lowercase module name.
+        :param tuple columns: Tuples of column name and NumPy data type.
+            Defaults to the columns of the module's data.
+        :return: The writer for the stream.
+        :rtype: :class:`StreamWriter`
+
+        """
+        name = module.module_name.lower() if name is None else name
+        if columns is None:
+            columns = MODULE_COLUMNS.get(type(module).__name__)
+            if columns is None:
+                raise PyMetaWearException(
+                    "Columns must be given for {0} module.".format(module))
+        writer = self.stream(name, columns)
+        module.notifications(writer.receiver(), with_epoch=True)
+        return writer
+
+    def flush(self):
+        """Write all buffered samples to disk."""
+        for writer in self.writers.values():
+            writer.flush()
+
+    def close(self):
+        """Write all buffered samples to disk and close all files."""
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+    def _write_meta(self):
+        tmp_path = self._meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f, indent=2, sort_keys=True)
+        os.rename(tmp_path, self._meta_path)
+
+
+def _memmap(path, dtype, n):
+    if n == 0:
+        return np.empty((0, ), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(n, ))
+
+
+class RecordedStream(object):
+    """Memory-mapped view of one recorded stream.
+
+    Created by :meth:`Recording.stream`. No data is read until it is
+    accessed, and slicing returns views into the memory maps.
+
+    """
+
+    def __init__(self, directory, name, columns):
+        self.name = name
+        self.columns = tuple((c, np.dtype(d)) for c, d in columns)
+
+        index_path = _column_path(directory, name, 'index')
+        n_index = os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+        self.index = _memmap(index_path, INDEX_DTYPE, n_index)
+        n = int(self.index['n'].sum()) if n_index else 0
+        self.epochs = _memmap(
+            _column_path(directory, name, 'epoch'), '<i8', n)
+        self._columns = {c: _memmap(_column_path(directory, name, c), d, n)
+                         for c, d in self.columns}
+
+    def __str__(self):
+        return "RecordedStream: {0}, {1} samples".format(
+            self.name, len(self))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __getitem__(self, column):
+        return self._columns[column]
+
+    @property
+    def column_names(self):
+        return [c for c, _ in self.columns]
+
+    def time_slice(self, start=None, stop=None):
+        """Get the samples in a time range.
+
+        :param int start: First epoch, in milliseconds, to include.
+        :param int stop: Epoch, in milliseconds, to stop before.
+        :return: A view of the epochs and a dictionary of column views.
+        :rtype: tuple
+
+        """
+        i0 = 0 if start is None else int(
+            np.searchsorted(self.epochs, start, side='left'))
+        i1 = len(self) if stop is None else int(
+            np.searchsorted(self.epochs, stop, side='left'))
+        return self.epochs[i0:i1], {c: v[i0:i1] for c, v in
+                                    self._columns.items()}
+
+
+class Recording(object):
+    """Read access to a recording made by :class:`Recorder`.
+
+    Example:
+
+    .. code-block:: python
+
+        rec = Recording('/data/session_1')
+        epochs, columns = rec['acc_1'].time_slice(t_start, t_start + 60000)
+        print(columns['x'].mean())
+
+    :param str directory: Directory of the recording.
+
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        meta_path = os.path.join(self.directory, RECORDING_FILE_NAME)
+        if not os.path.exists(meta_path):
+            raise PyMetaWearException(
+                "No recording in {0}.".format(self.directory))
+        with open(meta_path, 'r') as f:
+            self.meta = json.load(f)
+
+    def __str__(self):
+        return "Recording: {0}, {1}".format(self.directory, self.streams)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def __getitem__(self, name):
+        return self.stream(name)
+
+    @property
+    def streams(self):
+        """Names of the recorded streams.
+
+        :rtype: list
+
+        """
+        return sorted(self.meta['streams'])
+
+    def stream(self, name):
+        """Memory-map a recorded stream.
+
+        :param str name: Name of the stream.
+        :rtype: :class:`RecordedStream`
+
+        """
+        stream_meta = self.meta['streams'].get(name)
+        if stream_meta is None:
+            raise PyMetaWearException(
+                "No stream {0} in recording.".format(name))
+        return RecordedStream(self.directory, name, stream_meta['columns'])
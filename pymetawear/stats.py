@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`stats`
+============
+
+Runtime counters of a connection and of the signals subscribed to,
+kept as plain attributes so that counting a packet or a sample costs
+no more than a few additions.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-19
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+
+# Highest resolution clock for durations available.
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class LatencyHistogram(object):
+    """Histogram of durations, in buckets of powers of two microseconds.
+
+    Bucket ``k`` counts durations shorter than ``2 ** k`` microseconds
+    that did not fit into bucket ``k - 1``. The last bucket also
+    counts all longer durations.
+
+    """
+
+    N_BUCKETS = 24
+
+    def __init__(self):
+        self.counts = [0] * self.N_BUCKETS
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def reset(self):
+        """Forget all counted durations."""
+        self.counts[:] = [0] * self.N_BUCKETS
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __str__(self):
+        return "LatencyHistogram: {0} durations, mean {1:.1f} us".format(
+            self.n, self.mean * 1e6)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    @property
+    def mean(self):
+        """The mean duration, in seconds."""
+        return self.total / self.n if self.n else 0.0
+
+    def add(self, seconds):
+        """Count a duration.
+
+        :param float seconds: The duration.
+
+        """
+        k = int(seconds * 1e6).bit_length()
+        if k >= self.N_BUCKETS:
+            k = self.N_BUCKETS - 1
+        self.counts[k] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Get an upper bound of a percentile of the durations.
+
+        :param float q: The percentile, between 0 and 100.
+        :return: The upper bound of the bucket of the percentile,
+            in seconds, or ``None`` if no durations have been counted.
+        :rtype: float
+
+        """
+        if self.n == 0:
+            return None
+        target = q / 100.0 * self.n
+        cumulative = 0
+        for k, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                return min((1 << k) * 1e-6, self.max)
+        return self.max
+
+    def as_dict(self):
+        """Get the histogram as structured data.
+
+        :return: Dictionary of the number of durations, the mean and
+            maximal duration, the 50th, 90th and 99th percentiles, all
+            in seconds, and the non-empty buckets as a dictionary from
+            upper bound, in microseconds, to count.
+        :rtype: dict
+
+        """
+        return {
+            'count': self.n,
+            'mean': self.mean,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': {1 << k: c for k, c in enumerate(self.counts) if c},
+        }
+
+
+class ConnectionStats(object):
+    """Counters of the traffic of a connection, kept by the backend."""
+
+    def __init__(self):
+        self.reset()
+
+    def __str__(self):
+        return "ConnectionStats: {0} packets in, {1} packets out".format(
+            self.packets_in, self.packets_out)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def reset(self):
+        """Restart counting."""
+        self.started = time.time()
+        self.packets_in = 0
+        self.bytes_in = 0
+        self.packets_out = 0
+        self.bytes_out = 0
+        self.reads = 0
+        self.errors = 0
+
+    def as_dict(self):
+        """Get the counters as structured data.
+
+        :return: Dictionary of the counters, the seconds counted for
+            and the incoming packets per second.
+        :rtype: dict
+
+        """
+        elapsed = time.time() - self.started
+        return {
+            'elapsed': elapsed,
+            'packets_in': self.packets_in,
+            'bytes_in': self.bytes_in,
+            'packets_out': self.packets_out,
+            'bytes_out': self.bytes_out,
+            'reads': self.reads,
+            'errors': self.errors,
+            'packets_in_per_second':
+                self.packets_in / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class SignalStats(object):
+    """Counters of the samples delivered to a module's callback.
+
+    By default, only the samples are counted. With ``timing``, also the
+    errors raised in the callback and its durations are counted, and the
+    arrival time of every sample is recorded, at the cost of two clock
+    reads per sample. Timing must be turned on before subscribing:
+
+    .. code-block:: python
+
+        mwclient.accelerometer.stats.timing = True
+        mwclient.accelerometer.notifications(handle_acc_notification)
+
+    :param bool timing: If the callback should be timed.
+
+    """
+
+    def __init__(self, timing=False):
+        self.timing = timing
+        self.callback_latency = LatencyHistogram()
+        self.reset()
+
+    def __str__(self):
+        return "SignalStats: {0} samples, {1:.1f} Hz".format(
+            self.samples, self.rate or 0.0)
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    def reset(self):
+        """Restart counting."""
+        self.samples = 0
+        self.errors = 0
+        self.started = _clock()
+        self.first = None
+        self.last = None
+        self.callback_latency.reset()
+
+    @property
+    def rate(self):
+        """The effective rate of samples, in Hz, or ``None`` if too few
+        samples have been delivered. With timing, it is measured from the
+        first to the last sample, and otherwise from the start of
+        counting until now."""
+        if self.first is not None:
+            if self.samples > 1 and self.last > self.first:
+                return (self.samples - 1) / (self.last - self.first)
+        elif self.samples > 1:
+            return self.samples / (_clock() - self.started)
+        return None
+
+    def wrap(self, callback):
+        """Wrap a data callback to count its calls, and with ``timing``
+        its errors and durations.
+
+        :param callable callback: Function taking a data pointer.
+        :return: The counting function.
+        :rtype: callable
+
+        """
+        if not self.timing:
+            if not self.samples:
+                # Count from the subscription.
+                self.started = _clock()
+
+            def counter(data):
+                self.samples += 1
+                callback(data)
+            return counter
+
+        histogram = self.callback_latency
+        counts = histogram.counts
+        last_bucket = histogram.N_BUCKETS - 1
+        clock = _clock
+
+        # The histogram update is inlined, since this runs per sample.
+        def wrapper(data):
+            t0 = clock()
+            try:
+                callback(data)
+            except Exception:
+                self.errors += 1
+                raise
+            duration = clock() - t0
+            k = int(duration * 1e6).bit_length()
+            counts[k if k < last_bucket else last_bucket] += 1
+            histogram.n += 1
+            histogram.total += duration
+            if duration > histogram.max:
+                histogram.max = duration
+            if self.samples == 0:
+                self.first = t0
+            self.last = t0
+            self.samples += 1
+        return wrapper
+
+    def as_dict(self, configured_rate=None):
+        """Get the counters as structured data.
+
+        :param float configured_rate: The rate the signal is configured
+            for, in Hz, if applicable.
+        :return: Dictionary of the number of samples and errors, the
+            effective and configured rates and the callback latency
+            histogram.
+        :rtype: dict
+
+        """
+        return {
+            'samples': self.samples,
+            'errors': self.errors,
+            'rate': self.rate,
+            'configured_rate': configured_rate,
+            'callback_latency': self.callback_latency.as_dict(),
+        }
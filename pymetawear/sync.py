@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`sync`
+===========
+
+Timestamp-aligned merging of data streams from MetaWear modules.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-02
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+
+import numpy as np
+
+from pymetawear.exceptions import PyMetaWearException
+
+
+class _StreamBuffer(object):
+    """Bounded buffer of timestamped samples for one data stream."""
+
+    def __init__(self, name, n_columns, capacity):
+        self.name = name
+        self.n_columns = n_columns
+        self.capacity = capacity
+        self.epochs = np.empty((capacity, ), dtype='float64')
+        self.values = np.empty((capacity, n_columns), dtype='float64')
+        self.n = 0
+        self.n_dropped = 0
+
+    @property
+    def first(self):
+        return self.epochs[0] if self.n else None
+
+    @property
+    def last(self):
+        return self.epochs[self.n - 1] if self.n else None
+
+    def append(self, epochs, values):
+        n_new = len(epochs)
+        if n_new > self.capacity:
+            # Only the newest samples can ever be kept.
+            self.n_dropped += n_new - self.capacity
+            epochs, values = epochs[-self.capacity:], values[-self.capacity:]
+            n_new = self.capacity
+        overflow = self.n + n_new - self.capacity
+        if overflow > 0:
+            self._discard(overflow)
+            self.n_dropped += overflow
+        self.epochs[self.n:self.n + n_new] = epochs
+        self.values[self.n:self.n + n_new] = values
+        self.n += n_new
+
+    def interpolate(self, grid):
+        """Linear interpolation of all columns onto the grid.
+
+        Grid points outside of the buffered time span, or all grid points
+        if the buffer is empty, are set to ``nan``.
+
+        """
+        if not self.n:
+            return np.full((len(grid), self.n_columns), np.nan)
+        out = np.empty((len(grid), self.n_columns), dtype='float64')
+        t = self.epochs[:self.n]
+        for k in range(self.n_columns):
+            out[:, k] = np.interp(grid, t, self.values[:self.n, k],
+                                  left=np.nan, right=np.nan)
+        return out
+
+    def prune(self, epoch):
+        """Discard all samples but the last one at or before ``epoch``."""
+        i = np.searchsorted(self.epochs[:self.n], epoch, side='right') - 1
+        if i > 0:
+            self._discard(i)
+
+    def _discard(self, n):
+        remaining = self.n - n
+        self.epochs[:remaining] = self.epochs[n:self.n]
+        self.values[:remaining] = self.values[n:self.n]
+        self.n = remaining
+
+
+class StreamSynchronizer(object):
+    """Merges data streams by board timestamp onto a common fixed-rate grid.
+
+    Samples from each stream are buffered and linearly interpolated onto
+    the time grid ``k / rate`` once all streams have delivered data past
+    a grid point. The aligned frames are delivered to the callback in
+    batches, as a ``(n, )`` array of epochs (in milliseconds) and a
+    ``(n, m)`` array of values, where the columns are the columns of
+    every stream, in the order the streams were added.
+
+    If one stream falls behind the others by more than ``max_latency``
+    seconds, frames are emitted anyway and that stream's columns are set
+    to ``nan`` for the grid points it has not covered.
+
+    At most ``buffer_size`` frames, plus the frames of ``max_latency``
+    seconds, are emitted at once. If a board timestamp jumps further
+    ahead, the grid points before that are skipped, and counted in
+    ``n_skipped``.
+
+    Example:
+
+    .. code-block:: python
+
+        def frame_callback(epochs, frames):
+            # frames[:, :3] is acceleration, frames[:, 3:] rotation.
+            print(epochs[-1], frames[-1, :])
+
+        sync = StreamSynchronizer(rate=100.0, callback=frame_callback)
+        sync.attach(mwclient.accelerometer)
+        sync.attach(mwclient.gyroscope)
+
+    :param float rate: The output frequency in Hz.
+    :param callable callback: Function to call with aligned frames.
+    :param float max_latency: The maximal time, in seconds, that a
+        stream can lag behind before frames are emitted without it.
+    :param int buffer_size: The maximal number of samples to buffer
+        per stream. The oldest samples are discarded when it is full.
+
+    """
+
+    def __init__(self, rate, callback, max_latency=0.5, buffer_size=1024):
+        if rate <= 0:
+            raise ValueError("Rate must be positive: {0}".format(rate))
+        self.rate = float(rate)
+        self.callback = callback
+        self.max_latency = float(max_latency)
+        self.buffer_size = int(buffer_size)
+
+        self._period = 1000.0 / self.rate
+        self._max_frames = self.buffer_size + \
+            int(np.ceil(self.max_latency * self.rate)) + 1
+        self.n_skipped = 0
+        self._streams = []
+        self._streams_by_name = {}
+        self._next_epoch = None
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return "StreamSynchronizer: {0} Hz, [{1}]".format(
+            self.rate, ", ".join([s.name for s in self._streams]))
+
+    def __repr__(self):
+        return "<{0}>".format(str(self))
+
+    @property
+    def streams(self):
+        """The names of the synchronized streams, in column order.
+
+        :rtype: list
+
+        """
+        return [s.name for s in self._streams]
+
+    @property
+    def n_columns(self):
+        """The number of columns in emitted frames.
+
+        :rtype: int
+
+        """
+        return sum([s.n_columns for s in self._streams])
+
+    @property
+    def n_dropped(self):
+        """Number of samples discarded due to full buffers, per stream.
+
+        :rtype: dict
+
+        """
+        return {s.name: s.n_dropped for s in self._streams}
+
+    def add_stream(self, name, n_columns=3):
+        """Add a stream to synchronize.
+
+        :param str name: Name of the stream.
+        :param int n_columns: Number of values in each sample.
+
+        """
+        if name in self._streams_by_name:
+            raise PyMetaWearException(
+                "Stream {0} already added to synchronizer.".format(name))
+        if self._next_epoch is not None:
+            raise PyMetaWearException(
+                "Cannot add streams after frames have been emitted.")
+        stream = _StreamBuffer(name, n_columns, self.buffer_size)
+        self._streams.append(stream)
+        self._streams_by_name[name] = stream
+
+    def attach(self, module, name=None, n_columns=3):
+        """Add a stream and subscribe to notifications from a module.
+
+        :param pymetawear.modules.PyMetaWearModule module: The module
+            to subscribe to, e.g. ``mwclient.accelerometer``.
+        :param str name: Name of the stream. Defaults to the module's
+            lowercase module name.
+        :param int n_columns: Number of values in each sample.
+
+        """
+        name = module.module_name.lower() if name is None else name
+        self.add_stream(name, n_columns)
+        module.notifications(self.receiver(name), with_epoch=True)
+
+    def receiver(self, name):
+        """Get a notification callback feeding one stream.
+
+        :param str name: Name of the stream.
+        :return: A function taking an epoch and a tuple of values.
+        :rtype: callable
+
+        """
+        def receive(epoch, value):
+            self.feed(name, epoch, value)
+        return receive
+
+    def feed(self, name, epoch, value):
+        """Add a sample to a stream.
+
+        :param str name: Name of the stream.
+        :param int epoch: Board timestamp in milliseconds.
+        :param tuple value: The sample values.
+
+        """
+        self.feed_batch(name, [epoch], [value])
+
+    def feed_batch(self, name, epochs, values):
+        """Add several samples to a stream.
+
+        :param str name: Name of the stream.
+        :param array_like epochs: Board timestamps in milliseconds,
+            in increasing order.
+        :param array_like values: Array of shape ``(n, n_columns)``.
+
+        """
+        stream = self._streams_by_name.get(name)
+        if stream is None:
+            raise PyMetaWearException(
+                "Unknown stream to synchronize: {0}".format(name))
+        epochs = np.asarray(epochs, dtype='float64')
+        values = np.asarray(values, dtype='float64').reshape(
+            (len(epochs), stream.n_columns))
+        with self._lock:
+            stream.append(epochs, values)
+            frames = self._collect()
+        if frames is not None:
+            self.callback(*frames)
+
+    def flush(self):
+        """Emit all frames covered by buffered data of every stream."""
+        with self._lock:
+            frames = self._collect(force=True)
+        if frames is not None:
+            self.callback(*frames)
+
+    def _collect(self, force=False):
+        lasts = [s.last for s in self._streams]
+        available = [t for t in lasts if t is not None]
+        if not available:
+            return None
+
+        # Grid points up to the horizon can be emitted. Normally, that is
+        # the point every stream has reached, but lagging streams are
+        # not waited for longer than the maximal latency.
+        newest = max(available)
+        if force:
+            horizon = newest
+        elif len(available) == len(lasts):
+            horizon = max(min(available), newest - self.max_latency * 1000.0)
+        else:
+            horizon = newest - self.max_latency * 1000.0
+
+        next_epoch = self._next_epoch
+        if next_epoch is None:
+            firsts = [s.first for s in self._streams if s.n]
+            start = max(firsts) if len(firsts) == len(self._streams) \
+                else min(firsts)
+            next_epoch = np.ceil(start / self._period) * self._period
+        if horizon < next_epoch:
+            return None
+
+        n = int(np.floor((horizon - next_epoch) / self._period)) + 1
+        if n > self._max_frames:
+            # A jump of a board timestamp would call for an unbounded
+            # number of frames. Frames before what the buffers and the
+            # maximal latency can cover are skipped instead.
+            skipped = n - self._max_frames
+            next_epoch += skipped * self._period
+            self.n_skipped += skipped
+            n = self._max_frames
+        grid = next_epoch + self._period * np.arange(n)
+        frames = np.hstack([s.interpolate(grid) for s in self._streams])
+        self._next_epoch = grid[-1] + self._period
+        for s in self._streams:
+            s.prune(grid[-1])
+        return grid, frames
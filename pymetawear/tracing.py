@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`tracing`
+==============
+
+Hooks for tracing the communication with a MetaWear board.
+
+A hook is a callable that is called with a :class:`TraceEvent` for every
+read, write, notification, subscription and initialization of a backend.
+When no hook is registered, the backend does not build any events, so
+tracing costs nothing unless it is used.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-20
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import io
+import uuid
+import logging
+from collections import namedtuple
+
+from pymetawear.utils import string_types
+
+#: Trace event kinds.
+READ = 'read'
+WRITE = 'write'
+NOTIFY = 'notify'
+SUBSCRIBE = 'subscribe'
+INIT = 'init'
+
+#: An event of the communication with a board. ``time`` is the host time
+#: in seconds, ``characteristic`` the characteristic UUID or handle, as
+#: given to the backend, or ``None``, and ``data`` the raw bytes.
+TraceEvent = namedtuple('TraceEvent',
+                        ['time', 'kind', 'address', 'characteristic', 'data'])
+
+
+def format_event(event):
+    """Format an event as a line of text, with the data in hex.
+
+    Characteristic UUIDs are not looked up as handles, since that may
+    require communication with the board.
+
+    :param TraceEvent event: The event.
+    :rtype: str
+
+    """
+    if isinstance(event.characteristic, int):
+        characteristic = "0x{0:04x}".format(event.characteristic)
+    elif isinstance(event.characteristic, (uuid.UUID, string_types)):
+        characteristic = str(event.characteristic)
+    else:
+        characteristic = '-'
+    return "{0:.6f} {1} {2:<9s} {3}: {4}".format(
+        event.time, event.address, event.kind.capitalize(), characteristic,
+        " ".join("{0:02x}".format(b) for b in bytearray(event.data)))
+
+
+def print_hook(event):
+    """Hook printing every event, used for clients created with
+    ``debug=True``."""
+    print(format_event(event))
+
+
+class LoggingHook(object):
+    """Hook passing events to a :mod:`logging` logger.
+
+    :param logging.Logger logger: The logger. Defaults to
+        the ``pymetawear.tracing`` logger.
+    :param int level: The level to log events with.
+
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger if logger is not None else \
+            logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, event):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, format_event(event))
+
+
+class FileHook(object):
+    """Hook writing events to a text file, one line per event.
+
+    :param str path: Path of the file, which is appended to.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = io.open(path, 'a', encoding='utf-8')
+
+    def __call__(self, event):
+        self._file.write(format_event(event) + '\n')
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
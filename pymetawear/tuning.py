@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`tuning`
+=============
+
+Measurement of the achieved throughput and latency of a connection,
+for tuning connection parameters per deployment.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-12
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import threading
+
+import numpy as np
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.stats import LatencyHistogram, _clock
+
+
+def measure_throughput(client, duration=5.0, data_rate=None):
+    """Measure the number of notifications per second the connection
+    delivers, by streaming accelerometer data.
+
+    The previous data rate of the accelerometer is restored afterwards.
+
+    :param pymetawear.client.MetaWearClient client: A connected client.
+    :param float duration: Measurement time, in seconds.
+    :param float data_rate: Accelerometer data rate to stream at, in Hz.
+        Defaults to the highest possible data rate.
+    :return: Achieved notifications per second.
+    :rtype: float
+
+    """
+    accelerometer = client.accelerometer
+    if accelerometer.callback is not None:
+        raise PyMetaWearException(
+            "{0} notifications are in use, cannot measure throughput.".format(
+                accelerometer.module_name))
+    if data_rate is None:
+        data_rate = max(accelerometer.get_possible_settings()['data_rate'])
+    previous = accelerometer.get_current_settings().get('data_rate')
+    times = []
+    try:
+        accelerometer.set_settings(data_rate=data_rate)
+        accelerometer.notifications(lambda data: times.append(_clock()))
+        time.sleep(duration)
+    finally:
+        accelerometer.notifications(None)
+        if previous is not None:
+            accelerometer.set_settings(data_rate=previous)
+    if len(times) < 2:
+        return 0.0
+    return (len(times) - 1) / (times[-1] - times[0])
+
+
+def _round_trips(client, module_name, n_probes, timeout, interval,
+                 ready=None, start=None):
+    module = getattr(client, module_name)
+    if module.callback is not None:
+        raise PyMetaWearException(
+            "{0} notifications are in use, cannot measure latency.".format(
+                module.module_name))
+    received = threading.Event()
+    module.notifications(lambda data: received.set())
+    latencies = []
+    try:
+        if ready is not None:
+            ready.set()
+            start.wait()
+        for _ in range(n_probes):
+            received.clear()
+            t0 = _clock()
+            module.read()
+            if received.wait(timeout):
+                latencies.append(_clock() - t0)
+            else:
+                # A late response would be taken as the response to the
+                # next probe, so wait until no responses arrive for a
+                # whole timeout before the next probe.
+                while received.wait(timeout):
+                    received.clear()
+            if interval:
+                time.sleep(interval)
+    finally:
+        module.notifications(None)
+    return latencies
+
+
+def measure_latency(client, n_pings=20, timeout=1.0):
+    """Measure command-to-response latency, by reading the battery state.
+
+    :param pymetawear.client.MetaWearClient client: A connected client.
+    :param int n_pings: Number of battery reads to time.
+    :param float timeout: Maximal time to wait for a response, in seconds.
+    :return: The latencies, in seconds, of all answered reads.
+    :rtype: :class:`numpy.ndarray`
+
+    """
+    return np.array(_round_trips(client, 'battery', n_pings, timeout, 0.0))
+
+
+def probe_latency(clients, module='battery', n_probes=100, timeout=1.0,
+                  interval=0.0):
+    """Measure command-to-response latency on one or many boards at once.
+
+    Each round trip reads the data signal of a module, e.g. the battery
+    state or the switch state, and waits for the value to arrive to the
+    module callback. All boards are probed at the same time, each from
+    its own thread, so that contention between the connections shows
+    in the results. A response arriving after the timeout counts as
+    lost, and the next round trip waits until no response has arrived
+    for a whole timeout, so that it is not answered by a late response.
+
+    Example:
+
+    .. code-block:: python
+
+        report = probe_latency([c1, c2, c3], module='switch')
+        print(report['combined']['p99'])
+
+    :param list clients: Connected clients.
+    :param str module: Attribute name of the module to read.
+    :param int n_probes: Number of round trips per board.
+    :param float timeout: Maximal time to wait for a response, in seconds.
+    :param float interval: Time between round trips, in seconds.
+    :return: Dictionary with the latency histogram, see
+        :meth:`pymetawear.stats.LatencyHistogram.as_dict`, with exact
+        percentiles, and the number of unanswered round trips as
+        ``lost``, of all boards under ``combined``, and per board
+        address under ``boards``.
+    :rtype: dict
+
+    """
+    if not isinstance(clients, (list, tuple)):
+        clients = [clients]
+    ready = [threading.Event() for _ in clients]
+    start = threading.Event()
+    results = [[] for _ in clients]
+    errors = []
+
+    def probe(k):
+        try:
+            results[k] = _round_trips(clients[k], module, n_probes,
+                                      timeout, interval, ready[k], start)
+        except Exception as e:
+            errors.append(e)
+            ready[k].set()
+
+    threads = [threading.Thread(target=probe, args=(k, ))
+               for k in range(len(clients))]
+    for t in threads:
+        t.start()
+    # Let all boards subscribe before the first round trip.
+    for r in ready:
+        r.wait()
+    start.set()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+    def report(latencies, n_sent):
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.add(latency)
+        output = histogram.as_dict()
+        # The histogram only bounds the percentiles, so they are
+        # computed from the latencies instead.
+        for q in (50, 90, 99):
+            output['p{0}'.format(q)] = float(
+                np.percentile(latencies, q)) if latencies else None
+        output['lost'] = n_sent - len(latencies)
+        return output
+
+    return {
+        'combined': report([x for r in results for x in r],
+                           n_probes * len(clients)),
+        'boards': {client._address: report(r, n_probes)
+                   for client, r in zip(clients, results)},
+    }
+
+
+def measure_connection(client, min_conn_interval=None, max_conn_interval=None,
+                       latency=0, timeout=6000, settle_time=2.0,
+                       duration=5.0, data_rate=None, n_pings=20):
+    """Measure throughput and latency, optionally for a new set of
+    connection parameters.
+
+    Example:
+
+    .. code-block:: python
+
+        for interval in (7.5, 15.0, 30.0):
+            print(interval, measure_connection(c, interval, interval))
+
+    :param pymetawear.client.MetaWearClient client: A connected client.
+    :param float min_conn_interval: Minimum connection interval, in
+        milliseconds. If ``None``, the current parameters are measured.
+    :param float max_conn_interval: Maximum connection interval, in
+        milliseconds. Defaults to ``min_conn_interval``.
+    :param int latency: Number of connection events the board may skip.
+    :param int timeout: Supervision timeout, in milliseconds.
+    :param float settle_time: Time to wait for new connection parameters
+        to take effect, in seconds.
+    :param float duration: Throughput measurement time, in seconds.
+    :param float data_rate: Accelerometer data rate to stream at, in Hz.
+    :param int n_pings: Number of round trips for the latency measurement.
+    :return: Dictionary with ``notifications_per_second``, and the
+        ``latency_mean``, ``latency_median``, ``latency_max`` in seconds
+        and ``n_lost`` unanswered round trips.
+    :rtype: dict
+
+    """
+    if min_conn_interval is not None:
+        client.settings.set_connection_parameters(
+            min_conn_interval,
+            min_conn_interval if max_conn_interval is None
+            else max_conn_interval, latency, timeout)
+        time.sleep(settle_time)
+
+    rate = measure_throughput(client, duration, data_rate)
+    latencies = measure_latency(client, n_pings)
+    if len(latencies) == 0:
+        latencies = np.array([np.nan])
+    return {
+        'notifications_per_second': rate,
+        'latency_mean': float(np.mean(latencies)),
+        'latency_median': float(np.median(latencies)),
+        'latency_max': float(np.max(latencies)),
+        'n_lost': n_pings - int(np.sum(np.isfinite(latencies))),
+    }
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`workers`
+==============
+
+Clients running in worker processes, one process per board.
+
+With many boards at high data rates, a single Python process is limited
+by the interpreter lock held in the ``libmetawear`` callbacks and the
+backend reader threads. A :class:`WorkerClient` runs a
+:class:`~pymetawear.client.MetaWearClient` in a process of its own. The
+worker writes decoded samples into shared memory ring buffers, which the
+parent reads as NumPy views without copying. Control calls are proxied
+to the worker over a pipe.
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-25
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import ctypes
+import functools
+import threading
+import multiprocessing
+
+import numpy as np
+
+from pymetawear.exceptions import PyMetaWearException
+
+#: Number of values per sample of the module streams. Modules not
+#: listed deliver one value per sample.
+STREAM_COLUMNS = {
+    'accelerometer': 3,
+    'gyroscope': 3,
+    'magnetometer': 3,
+    'battery': 2,
+}
+
+
+class SampleRing(object):
+    """Ring buffer of timestamped samples in shared memory, with one
+    writing and one reading process.
+
+    The ring must be created before the worker process is started, and
+    passed to it as an argument. The reader gets NumPy views into the
+    shared memory, which are valid until the writer has written another
+    ``capacity`` samples. Samples that are overwritten before they have
+    been read are counted in ``overruns``, and samples that are
+    overwritten while the reader is still using them, see :meth:`drain`,
+    in ``overwritten``.
+
+    :param int capacity: Number of samples in the ring.
+    :param int n_columns: Number of values per sample.
+
+    """
+
+    def __init__(self, capacity, n_columns=1):
+        self.capacity = int(capacity)
+        self.n_columns = int(n_columns)
+        self.overruns = 0
+        self.overwritten = 0
+
+        self._epochs_buffer = multiprocessing.RawArray(
+            ctypes.c_int64, self.capacity)
+        self._values_buffer = multiprocessing.RawArray(
+            ctypes.c_double, self.capacity * self.n_columns)
+        # Total number of samples written.
+        self._head = multiprocessing.RawValue(ctypes.c_int64, 0)
+        # Total number of samples read, only used by the reader.
+        self._tail = 0
+        # Position and length of the last read.
+        self._last_read = (0, 0)
+        self._attach()
+
+    def __len__(self):
+        return min(self._head.value - self._tail, self.capacity)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['epochs'], state['values']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    def _attach(self):
+        self.epochs = np.frombuffer(self._epochs_buffer, dtype='int64')
+        self.values = np.frombuffer(
+            self._values_buffer, dtype='float64').reshape(
+            (self.capacity, self.n_columns))
+
+    @property
+    def n_written(self):
+        """Total number of samples written to the ring."""
+        return self._head.value
+
+    def write(self, epoch, value):
+        """Add a sample. Used as data callback in the worker.
+
+        :param int epoch: Timestamp of the sample, in milliseconds.
+        :param value: Tuple of sample values, or a single value.
+
+        """
+        i = self._head.value
+        k = i % self.capacity
+        self.epochs[k] = epoch
+        self.values[k] = value
+        # Published after the sample has been written.
+        self._head.value = i + 1
+
+    def read(self):
+        """Get the unread samples, up to the end of the ring. Call again
+        while the ring is not empty to get samples that wrapped around.
+
+        :return: Views of a ``(n, )`` array of epochs in milliseconds and
+            a ``(n, n_columns)`` array of values.
+        :rtype: tuple
+
+        """
+        head = self._head.value
+        n = head - self._tail
+        if n > self.capacity:
+            self.overruns += n - self.capacity
+            self._tail = head - self.capacity
+            n = self.capacity
+        start = self._tail % self.capacity
+        n = min(n, self.capacity - start)
+        self._last_read = (self._tail, n)
+        self._tail += n
+        return self.epochs[start:start + n], self.values[start:start + n]
+
+    def check(self):
+        """Get the number of samples of the last :meth:`read` that the
+        writer has overwritten since. The views of those samples no
+        longer hold the samples that were read.
+
+        :rtype: int
+
+        """
+        first, n = self._last_read
+        return min(max(self._head.value - self.capacity - first, 0), n)
+
+    def drain(self, callback, copy=False):
+        """Deliver all unread samples.
+
+        The writer may overwrite samples while the callback is using
+        them. This is checked after each call, and the number of samples
+        that were overwritten is added to ``overwritten``. With ``copy``,
+        the samples are copied before the call, and only samples
+        overwritten while copying are counted.
+
+        :param callable callback: Function called with a ``(n, )`` array
+            of epochs and a ``(n, n_columns)`` array of values, once per
+            contiguous part of the ring.
+        :param bool copy: If the callback gets copies of the samples,
+            instead of views into the ring.
+        :return: Number of samples delivered.
+        :rtype: int
+
+        """
+        n = 0
+        while len(self):
+            epochs, values = self.read()
+            if copy:
+                epochs, values = epochs.copy(), values.copy()
+                n_overwritten = self.check()
+            callback(epochs, values)
+            if not copy:
+                n_overwritten = self.check()
+            self.overwritten += n_overwritten
+            n += len(epochs)
+        return n
+
+
+def _resolve(client, path):
+    obj = client
+    for name in path.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _serve(conn, address, rings, kwargs):
+    """Main function of the worker process."""
+    try:
+        from pymetawear.client import MetaWearClient
+        client = MetaWearClient(address, **kwargs)
+    except Exception as e:
+        conn.send((False, e))
+        return
+    conn.send((True, None))
+
+    while True:
+        try:
+            command, path, args, kwargs = conn.recv()
+        except EOFError:
+            # The parent is gone, so there is no one to answer.
+            client.disconnect()
+            return
+        try:
+            if command == 'call':
+                result = _resolve(client, path)(*args, **kwargs)
+            elif command == 'get':
+                result = _resolve(client, path)
+            elif command == 'stream':
+                module = _resolve(client, path)
+                if args[0]:
+                    result = module.notifications(
+                        rings[path].write, with_epoch=True, **kwargs)
+                else:
+                    result = module.notifications(None)
+            elif command == 'close':
+                client.disconnect()
+                result = None
+            else:
+                raise PyMetaWearException(
+                    "Unknown worker command: {0}".format(command))
+        except Exception as e:
+            result, ok = e, False
+        else:
+            ok = True
+
+        try:
+            conn.send((ok, result))
+        except IOError:
+            # The parent is gone.
+            if command != 'close':
+                client.disconnect()
+            return
+        except Exception as e:
+            # E.g. a result that cannot be pickled.
+            conn.send((False, PyMetaWearException(
+                "{0} of {1} failed: {2}".format(command, path, e))))
+        if command == 'close':
+            return
+
+
+class _RemoteAttribute(object):
+    """Attribute of the client in a worker, called through the pipe."""
+
+    def __init__(self, worker, path):
+        self._worker = worker
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _RemoteAttribute(self._worker, self._path + '.' + name)
+
+    def __call__(self, *args, **kwargs):
+        return self._worker.call(self._path, *args, **kwargs)
+
+    def __repr__(self):
+        return "<Remote {0} of {1}>".format(self._path, self._worker)
+
+
+class WorkerClient(object):
+    """A MetaWear client running in a worker process.
+
+    Methods of the client and its modules are called in the worker, with
+    arguments and results passed over a pipe:
+
+    .. code-block:: python
+
+        worker = WorkerClient('DD:3A:7D:4D:56:F0',
+                              streams=['accelerometer', 'gyroscope'])
+        worker.accelerometer.set_settings(data_rate=200.0, data_range=4.0)
+        worker.stream('accelerometer')
+        worker.stream('gyroscope')
+
+        while running:
+            worker.drain(handle_samples)
+
+    Samples of the streamed modules are written to a :class:`SampleRing`
+    per module by the worker, and read in the parent with :meth:`read`
+    or :meth:`drain`.
+
+    :param str address: A Bluetooth MAC address to a MetaWear board.
+    :param str backend: The backend of the client in the worker.
+    :param list streams: Module attribute names of the modules that can
+        be streamed, e.g. ``['accelerometer']``.
+    :param int ring_size: Number of samples in the ring of each module.
+    :param float timeout: Timeout for connecting to the MetaWear board.
+    :param bool debug: If printout of all sent and received
+        data should be done, by the worker.
+
+    """
+
+    def __init__(self, address, backend='pygatt', streams=(),
+                 ring_size=65536, timeout=None, debug=False):
+        self._address = address
+        self._lock = threading.Lock()
+        self.rings = {name: SampleRing(ring_size, STREAM_COLUMNS.get(name, 1))
+                      for name in streams}
+
+        self._conn, conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(conn, address, self.rings,
+                                 {'backend': backend, 'timeout': timeout,
+                                  'debug': debug}))
+        self._process.daemon = True
+        self._process.start()
+        conn.close()
+
+        try:
+            ok, error = self._conn.recv()
+        except EOFError:
+            ok, error = False, PyMetaWearException(
+                "Worker for {0} exited with code {1}.".format(
+                    address, self._process.exitcode))
+        if not ok:
+            self._process.join()
+            raise error
+
+    def __str__(self):
+        return "WorkerClient, {0}".format(self._address)
+
+    def __repr__(self):
+        return "<WorkerClient, {0}>".format(self._address)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _RemoteAttribute(self, name)
+
+    @property
+    def pid(self):
+        """Process id of the worker."""
+        return self._process.pid
+
+    def _request(self, command, path, args=(), kwargs=None):
+        with self._lock:
+            self._conn.send((command, path, args, kwargs or {}))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def call(self, path, *args, **kwargs):
+        """Call a method of the client in the worker.
+
+        :param str path: Attribute path of the method, relative to
+            the client, e.g. ``'accelerometer.set_settings'``.
+        :return: The result of the call.
+
+        """
+        return self._request('call', path, args, kwargs)
+
+    def get(self, path):
+        """Get an attribute value of the client in the worker.
+
+        :param str path: Attribute path, e.g. ``'firmware_version'``.
+        :return: The value.
+
+        """
+        return self._request('get', path)
+
+    def stream(self, module, **kwargs):
+        """Subscribe to notifications from a module in the worker,
+        writing its samples to the ring of the module.
+
+        :param str module: Module attribute name, one of ``streams``.
+        :param kwargs: Further keyword arguments to the module's
+            ``notifications`` method, e.g. ``packed=True``.
+
+        """
+        if module not in self.rings:
+            raise PyMetaWearException(
+                "{0} is not a stream of this worker.".format(module))
+        self._request('stream', module, (True, ), kwargs)
+
+    def stop_stream(self, module):
+        """Unsubscribe from notifications from a module in the worker.
+
+        :param str module: Module attribute name.
+
+        """
+        self._request('stream', module, (False, ))
+
+    def read(self, module):
+        """Get unread samples of a module, see :meth:`SampleRing.read`.
+
+        :param str module: Module attribute name.
+        :return: Views of the epochs and values.
+        :rtype: tuple
+
+        """
+        return self.rings[module].read()
+
+    def drain(self, callback, copy=False):
+        """Deliver all unread samples of all streams, see
+        :meth:`SampleRing.drain`.
+
+        :param callable callback: Function called with the module name,
+            a ``(n, )`` array of epochs and a ``(n, m)`` array of values.
+            Unless ``copy`` is given, the arrays are views into shared
+            memory, and must be copied if they are to be kept.
+        :param bool copy: If the callback gets copies of the samples.
+        :return: Number of samples delivered.
+        :rtype: int
+
+        """
+        return sum(ring.drain(functools.partial(callback, name), copy)
+                   for name, ring in self.rings.items())
+
+    def disconnect(self):
+        """Disconnect the client in the worker and end the worker."""
+        if self._process.is_alive():
+            try:
+                self._request('close', None)
+            except (EOFError, IOError):
+                pass
+        self._process.join()
+        self._conn.close()
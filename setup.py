@@ -142,8 +142,12 @@ setup(
     },
     install_requires=[
         'pybluez[ble]>=0.22',
-        'pygatt[GATTTOOL]>=2.0.1'
+        'pygatt[GATTTOOL]>=2.0.1',
+        'numpy>=1.9'
     ],
+    extras_require={
+        'arrow': ['pyarrow>=0.17'],
+    },
     ext_modules=[],
     entry_points={
     }
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_ambientlight`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.ambientlight import AmbientLightModule
+from pymetawear.modules.base import Modules
+
+
+def _recorder(writes, name):
+    def record(board, *args):
+        writes.append((name, ) + args)
+    return record
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    writes = []
+    for name in ('set_gain', 'set_integration_time',
+                 'set_measurement_rate', 'write_config', 'start', 'stop'):
+        monkeypatch.setattr(libmetawear, 'mbl_mw_als_ltr329_' + name,
+                            _recorder(writes, name), raising=False)
+    for name, func in [
+            ('mbl_mw_als_ltr329_get_illuminance_data_signal',
+             lambda board: 0x0100),
+            ('mbl_mw_datasignal_subscribe',
+             _recorder(writes, 'subscribe')),
+            ('mbl_mw_datasignal_unsubscribe',
+             _recorder(writes, 'unsubscribe'))]:
+        monkeypatch.setattr(libmetawear, name, func, raising=False)
+    return writes
+
+
+def test_missing_ambient_light_sensor():
+    module = AmbientLightModule(None, Modules.MBL_MW_MODULE_NA)
+    assert str(module) == "Ambient Light: Not present"
+    with pytest.raises(PyMetaWearException):
+        module.notifications(lambda data: None)
+
+
+def test_changed_settings_are_written_with_config(writes):
+    module = AmbientLightModule(None, Modules.MBL_MW_MODULE_AMBIENT_LIGHT)
+    module.set_settings(gain=4, measurement_rate=1000)
+    module.set_settings(gain=4, integration_time=50)
+    assert writes == [
+        ('set_gain', module.gain[4]),
+        ('set_measurement_rate', module.measurement_rate[1000]),
+        ('write_config', ),
+        ('set_integration_time', module.integration_time[50]),
+        ('write_config', )]
+
+
+def test_sampling_follows_subscription(writes):
+    module = AmbientLightModule(None, Modules.MBL_MW_MODULE_AMBIENT_LIGHT)
+    module.notifications(lambda data: None)
+    module.notifications(None)
+    assert [w[0] for w in writes] == ['subscribe', 'start', 'stop',
+                                      'unsubscribe']
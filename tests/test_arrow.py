@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_arrow`
+=================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-27
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from pymetawear.arrow import ArrowSink, export_recording
+from pymetawear.recording import Recorder, Recording
+
+
+def test_parquet_row_groups(tmpdir):
+    sink = ArrowSink(str(tmpdir), row_group_size=16)
+    acc = sink.stream('acc')
+    for k in range(40):
+        acc.append(1000 + 10 * k, (k, 2 * k, 3 * k))
+    sink.close()
+
+    f = pq.ParquetFile(sink.path('acc'))
+    assert f.metadata.num_row_groups == 3
+    table = f.read()
+    assert table.schema.field('epoch').type == pa.timestamp('ms')
+    assert table.schema.field('x').type == pa.float32()
+    np.testing.assert_array_equal(
+        table.column('epoch').cast(pa.int64()).to_numpy(),
+        1000 + 10 * np.arange(40))
+    np.testing.assert_array_equal(table.column('z').to_numpy(),
+                                  3 * np.arange(40))
+
+
+def test_recording_export_to_ipc(tmpdir):
+    rec = Recorder(str(tmpdir.join('rec')), chunk_size=8)
+    battery = rec.stream('battery', (('voltage', '<u2'), ('charge', '<u1')))
+    battery.append_batch(np.arange(20), np.column_stack(
+        [4000 + np.arange(20), np.arange(20)]))
+    rec.close()
+
+    paths = export_recording(Recording(str(tmpdir.join('rec'))),
+                             str(tmpdir.join('arrow')), format='ipc',
+                             row_group_size=8)
+    batches = list(pa.ipc.open_stream(paths['battery']))
+    assert len(batches) == 3
+    table = pa.Table.from_batches(batches)
+    assert table.schema.field('charge').type == pa.uint8()
+    np.testing.assert_array_equal(table.column('voltage').to_numpy(),
+                                  4000 + np.arange(20))
+
+
+def test_ipc_stream_is_readable_while_written(tmpdir):
+    sink = ArrowSink(str(tmpdir), format='ipc', row_group_size=4)
+    writer = sink.stream('acc')
+    for k in range(10):
+        writer.append(1000 + k, (k, -k, 0.5))
+    table = pa.ipc.open_stream(writer.path).read_all()
+    assert table.num_rows == 8
+    sink.close()
+    table = pa.ipc.open_stream(writer.path).read_all()
+    np.testing.assert_array_equal(table.column('x').to_numpy(),
+                                  np.arange(10))
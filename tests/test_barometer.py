@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_barometer`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.barometer import BarometerModule
+
+
+def _recorder(writes, name):
+    def record(board, *args):
+        writes.append((name, ) + tuple(getattr(a, 'value', a)
+                                       for a in args))
+    return record
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    writes = []
+    for name in ('set_oversampling', 'set_iir_filter', 'set_standby_time',
+                 'write_config', 'start', 'stop'):
+        monkeypatch.setattr(libmetawear, 'mbl_mw_baro_bosch_' + name,
+                            _recorder(writes, name), raising=False)
+    return writes
+
+
+def test_missing_barometer():
+    module = BarometerModule(None, -1)
+    assert str(module) == "Barometer: Not present"
+    with pytest.raises(PyMetaWearException):
+        module.set_settings(oversampling='standard')
+
+
+def test_changed_settings_are_written_with_config(writes):
+    module = BarometerModule(None, 0)
+    assert module.sensor_name == 'Bmp280'
+    module.set_settings(oversampling='standard', standby_time=1000.0)
+    module.set_settings(oversampling='standard', iir_filter=16)
+    assert writes == [
+        ('set_oversampling', module.oversampling['standard']),
+        ('set_standby_time', pytest.approx(1000.0)),
+        ('write_config', ),
+        ('set_iir_filter', module.iir_filter[16]),
+        ('write_config', )]
+    assert module.get_current_settings() == {
+        'oversampling': 'standard', 'iir_filter': 16,
+        'standby_time': 1000.0}
+
+
+def test_standby_times_of_sensor(writes):
+    with pytest.raises(ValueError):
+        BarometerModule(None, 0).set_settings(standby_time=10.0)
+    BarometerModule(None, 1).set_settings(standby_time=10.0)
+    assert writes[0] == ('set_standby_time', pytest.approx(10.0))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_batching`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-03
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+
+from pymetawear.batching import SampleBatcher
+
+
+def test_batches_are_delivered_when_full():
+    batches = []
+    batcher = SampleBatcher(lambda e, v: batches.append((e, v)), batch_size=4)
+    for k in range(10):
+        batcher.append(1000 + k, (k, -k, 2 * k))
+    assert len(batches) == 2
+    assert len(batcher) == 2
+    np.testing.assert_array_equal(batches[1][0], [1004, 1005, 1006, 1007])
+    np.testing.assert_array_equal(batches[1][1][:, 1], [-4, -5, -6, -7])
+
+    batcher.flush()
+    assert len(batches) == 3
+    assert batches[2][1].shape == (2, 3)
+    assert batcher.n_samples == 10
+
+
+def test_delivered_arrays_are_not_reused():
+    batches = []
+    batcher = SampleBatcher(lambda e, v: batches.append((e, v)), batch_size=2)
+    for k in range(4):
+        batcher.append(k, (k, ))
+    np.testing.assert_array_equal(batches[0][1][:, 0], [0, 1])
+    np.testing.assert_array_equal(batches[1][1][:, 0], [2, 3])
+
+
+def test_attach_subscribes_with_epoch():
+    class FakeModule(object):
+        def notifications(self, callback=None, with_epoch=False, **kwargs):
+            self.with_epoch, self.kwargs = with_epoch, kwargs
+            for k in range(3):
+                callback(k, (k, k, k))
+
+    batches = []
+    module = FakeModule()
+    batcher = SampleBatcher(lambda e, v: batches.append((e, v)), batch_size=3)
+    batcher.attach(module, packed=True)
+    assert module.with_epoch
+    assert module.kwargs == {'packed': True}
+    np.testing.assert_array_equal(batches[0][0], [0, 1, 2])
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_capabilities`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-16
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear.capabilities import get_capabilities
+
+
+class SensorConstants(object):
+    ODR_0_78125HZ = 0
+    ODR_12_5HZ = 4
+    ODR_100HZ = 7
+    ODR_1600HZ = 11
+    FSR_2000DPS = 0
+    FSR_125DPS = 4
+    PRESET_LOW_POWER = 0
+    PRESET_HIGH_ACCURACY = 3
+
+
+def test_capabilities_are_parsed_once():
+    capabilities = get_capabilities(SensorConstants)
+    assert get_capabilities(SensorConstants) is capabilities
+    assert capabilities['data_rate'].values == (0.78125, 12.5, 100.0, 1600.0)
+    assert capabilities['data_rate'].unit == 'Hz'
+    assert capabilities['data_range'].mapping == {125.0: 4, 2000.0: 0}
+    assert capabilities['preset'].values == ('high_accuracy', 'low_power')
+
+
+def test_nearest_value():
+    data_rate = get_capabilities(SensorConstants)['data_rate']
+    assert data_rate.nearest(12.4) == 12.5
+    assert data_rate.nearest(0.5) == 0.78125
+    assert data_rate.nearest(1600.2) == 1600.0
+    assert data_rate.constant(100) == 7
+    assert 50.0 not in data_rate
+    assert 'fast' not in data_rate
+    assert None not in data_rate
+    with pytest.raises(ValueError):
+        data_rate.nearest(3000.0)
+
+    preset = get_capabilities(SensorConstants)['preset']
+    assert preset.constant('High_Accuracy') == 3
+    assert 3 not in preset
+    with pytest.raises(ValueError):
+        preset.nearest('regular')
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_capture`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-06
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import struct
+
+import numpy as np
+
+from pymetawear.capture import NotificationCapture, read_capture, \
+    decode_capture
+
+
+def test_capture_is_decoded(tmpdir):
+    path = str(tmpdir.join('session.cap'))
+    capture = NotificationCapture(path)
+    for k in range(10):
+        capture.write(bytearray(struct.pack('<BBhhh', 0x03, 0x04,
+                                            2048 * k, -2048, 0)))
+        capture.write(bytearray(struct.pack('<BBhhh', 0x13, 0x05,
+                                            164, 0, -164)))
+    capture.write(bytearray([0x01, 0x01, 0x01]))
+    capture.write(bytearray(struct.pack('<BBBH', 0x11, 0x8c, 87, 4123)))
+    capture.close()
+
+    records = read_capture(path)
+    assert len(records) == 22
+    assert np.all(np.diff(records['time']) >= 0)
+
+    data = decode_capture(path, acc_range=16.0, gyro_range=2000.0)
+    t, acc = data['accelerometer']
+    assert acc.shape == (10, 3)
+    np.testing.assert_allclose(acc[:, 0], np.arange(10))
+    np.testing.assert_allclose(acc[:, 1], -1.0)
+    np.testing.assert_allclose(data['gyroscope'][1][0], [10.0, 0.0, -10.0])
+    assert data['switch'][1].tolist() == [[1]]
+    assert data['battery'][1].tolist() == [[4123, 87]]
+
+
+def test_capture_is_appended_to(tmpdir):
+    path = str(tmpdir.join('session.cap'))
+    for k in range(2):
+        capture = NotificationCapture(path)
+        capture.write(bytearray([0x01, 0x01, k]))
+        capture.close()
+    assert read_capture(path)['payload'][:, 2].tolist() == [0, 1]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_dataprocessor`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import threading
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules import base
+from pymetawear.modules.dataprocessor import DataProcessorModule, \
+    DataSignal
+
+
+def _value(pointer):
+    return getattr(pointer, 'value', pointer)
+
+
+class Board(object):
+    """Answers processor creation with a new pointer, from another
+    thread like the Bluetooth backends."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.created = []
+
+    def create(self, signal, *args):
+        callback = args[-1]
+        pointer = 0 if self.fail else 0x1000 + len(self.created)
+        self.created.append((_value(signal), args[:-1], pointer))
+        threading.Timer(self.delay, callback, (pointer, )).start()
+
+
+def test_processors_are_chained(monkeypatch):
+    board = Board()
+    monkeypatch.setattr(libmetawear, 'mbl_mw_dataprocessor_rss_create',
+                        board.create, raising=False)
+    monkeypatch.setattr(libmetawear, 'mbl_mw_dataprocessor_average_create',
+                        board.create, raising=False)
+    module = DataProcessorModule(None)
+    source = DataSignal(None, 'acc', 0x0100)
+
+    rss = module.rss(source)
+    avg = module.average(rss, 8)
+    assert _value(rss.data_signal) == 0x1000
+    assert _value(avg.data_signal) == 0x1001
+    assert board.created[0][0] == 0x0100
+    # The average takes its input from the RSS processor.
+    assert board.created[1][0] == 0x1000
+    assert board.created[1][1][0].value == 8
+    assert avg.source is rss
+
+
+def test_failed_creation_raises(monkeypatch):
+    monkeypatch.setattr(libmetawear, 'mbl_mw_dataprocessor_rms_create',
+                        Board(fail=True).create, raising=False)
+    with pytest.raises(PyMetaWearException):
+        DataProcessorModule(None).rms(DataSignal(None, 'acc', 0x0100))
+
+
+def test_late_answer_is_kept_alive():
+    board = Board(delay=0.05)
+    n_pending = len(base._pending_callbacks)
+    pointer = base.create_board_object(
+        lambda cb: board.create(0x0100, cb), timeout=0.001)
+    assert pointer is None
+    assert len(base._pending_callbacks) == n_pending + 1
+
+    t0 = time.time()
+    while len(base._pending_callbacks) > n_pending and \
+            time.time() - t0 < 2.0:
+        time.sleep(0.01)
+    assert len(base._pending_callbacks) == n_pending
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_decoding`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-17
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from ctypes import c_uint, c_float, cast, pointer, c_void_p
+
+import pytest
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.decoding import data_handler, read_value
+from pymetawear.mbientlab.metawear.core import Data, DataTypeId, \
+    CartesianFloat, BatteryState
+
+
+def _data(type_id, value):
+    data = Data()
+    data.epoch = 1463472000123
+    data.value = cast(pointer(value), c_void_p)
+    data.type_id = type_id
+    return pointer(data), value
+
+
+def test_values_are_decoded():
+    data, _ = _data(DataTypeId.CARTESIAN_FLOAT, CartesianFloat(0.5, -1.0, 2.0))
+    assert read_value(data) == (0.5, -1.0, 2.0)
+    data, _ = _data(DataTypeId.BATTERY_STATE, BatteryState(4105, 87))
+    assert read_value(data) == (4105, 87)
+    data, _ = _data(DataTypeId.FLOAT, c_float(21.5))
+    assert read_value(data) == (21.5, )
+
+
+def test_data_handler():
+    received = []
+    data, _ = _data(DataTypeId.UINT32, c_uint(1))
+    data_handler(received.append, DataTypeId.UINT32)(data)
+    data_handler(lambda e, v: received.append((e, v)), DataTypeId.UINT32,
+                 with_epoch=True)(data)
+    assert received == [1, (1463472000123, 1)]
+
+    with pytest.raises(PyMetaWearException):
+        data_handler(received.append, DataTypeId.CARTESIAN_FLOAT)(data)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_download`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-04
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from pymetawear.download import ResumableLogDownload
+from pymetawear.exceptions import PyMetaWearException
+
+
+class DummyLoggingModule(object):
+    """Stand-in for the logging module, delivering a fixed log."""
+
+    def __init__(self, epochs, drop_after=None):
+        self.loggers = {'acc': None}
+        self.epochs = np.array(epochs, dtype='int64')
+        self.drop_after = drop_after
+        self.cleared = False
+
+    def download(self, callbacks, batch_size, progress_callback,
+                 n_notifies, timeout):
+        for i in range(0, len(self.epochs), batch_size):
+            if self.drop_after is not None and i >= self.drop_after:
+                raise PyMetaWearException("Log download timed out.")
+            epochs = self.epochs[i:i + batch_size]
+            callbacks['acc'](epochs, np.c_[epochs, -epochs].astype(float))
+
+    def clear_entries(self):
+        self.cleared = True
+
+
+def test_resumed_download_stores_every_entry_once(tmpdir):
+    epochs = [1, 2, 2, 2, 3, 4, 5, 5, 6, 7, 8]
+    board = DummyLoggingModule(epochs, drop_after=4)
+    with pytest.raises(PyMetaWearException):
+        ResumableLogDownload(board, str(tmpdir), chunk_size=2).run()
+    assert not board.cleared
+
+    board = DummyLoggingModule(epochs)
+    dl = ResumableLogDownload(board, str(tmpdir), chunk_size=2)
+    assert dl.progress() == {'acc': 4}
+    dl.run()
+    assert board.cleared
+    assert dl.completed
+
+    stored_epochs, values = dl.load('acc')
+    np.testing.assert_array_equal(stored_epochs, epochs)
+    np.testing.assert_array_equal(values[:, 1], -stored_epochs)
+
+
+def test_resume_does_not_depend_on_epochs(tmpdir):
+    epochs = np.arange(10)
+    board = DummyLoggingModule(epochs, drop_after=6)
+    with pytest.raises(PyMetaWearException):
+        ResumableLogDownload(board, str(tmpdir), chunk_size=3).run()
+
+    # The time reference has been read again, shifting all epochs.
+    board = DummyLoggingModule(epochs + 1000)
+    dl = ResumableLogDownload(board, str(tmpdir), chunk_size=3)
+    dl.run()
+    stored_epochs, _ = dl.load('acc')
+    assert len(stored_epochs) == 10
+    np.testing.assert_array_equal(stored_epochs[6:], epochs[6:] + 1000)
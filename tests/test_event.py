@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_event`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.dataprocessor import DataSignal
+from pymetawear.modules.event import EventModule
+
+
+class Board(object):
+    """Stores recorded commands, answering from another thread."""
+
+    def __init__(self, status=0, answer=True):
+        self.status = status
+        self.answer = answer
+        self.calls = []
+
+    def record_commands(self, event):
+        self.calls.append(('record', event))
+
+    def end_record(self, event, callback):
+        self.calls.append(('end', event))
+        if self.answer:
+            threading.Timer(0.001, callback, (None, self.status)).start()
+
+    def patch(self, monkeypatch):
+        monkeypatch.setattr(libmetawear, 'mbl_mw_event_record_commands',
+                            self.record_commands, raising=False)
+        monkeypatch.setattr(libmetawear, 'mbl_mw_event_end_record',
+                            self.end_record, raising=False)
+
+
+def test_commands_are_recorded(monkeypatch):
+    board = Board()
+    board.patch(monkeypatch)
+    source = DataSignal(None, 'switch', 0x0100)
+
+    event = EventModule(None).record(
+        source, lambda: board.calls.append(('command', None)))
+    assert [c for c, _ in board.calls] == ['record', 'command', 'end']
+    assert event.event == 0x0100
+    assert event.source is source
+
+
+def test_failed_recording_raises(monkeypatch):
+    Board(status=16).patch(monkeypatch)
+    with pytest.raises(PyMetaWearException):
+        EventModule(None).record(DataSignal(None, 'switch', 0x0100),
+                                 lambda: None)
+
+
+def test_unanswered_recording_raises(monkeypatch):
+    Board(answer=False).patch(monkeypatch)
+    with pytest.raises(PyMetaWearException):
+        EventModule(None).record(DataSignal(None, 'switch', 0x0100),
+                                 lambda: None, timeout=0.01)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_features`
+====================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-28
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from pymetawear.features import WindowedFeatures
+
+
+def _reference(epochs, values, window, hop):
+    rows, ends = [], []
+    for i in range(0, len(values) - window + 1, hop):
+        w = values[i:i + window]
+        negative = np.signbit(w)
+        row = []
+        for k in range(w.shape[1]):
+            row.extend([np.sqrt(np.mean(w[:, k] ** 2)),
+                        np.abs(w[:, k]).max(),
+                        np.var(w[:, k]),
+                        np.sum(negative[1:, k] != negative[:-1, k])])
+        rows.append(row)
+        ends.append(epochs[i + window - 1])
+    return np.array(ends), np.array(rows)
+
+
+@pytest.mark.parametrize('window,hop', [(64, 32), (50, 20), (16, 40),
+                                        (10, 10)])
+def test_batches_match_reference(window, hop):
+    rng = np.random.RandomState(0)
+    epochs = 1000 + 10 * np.arange(1000)
+    values = rng.randn(1000, 3) + [0.0, 0.1, 1.0]
+    output = []
+    extractor = WindowedFeatures(lambda e, f: output.append((e, f)),
+                                 window, hop)
+    i = 0
+    for n in rng.randint(1, 90, size=100):
+        extractor.append_batch(epochs[i:i + n], values[i:i + n])
+        i += n
+    ends, features = _reference(epochs[:i], values[:i], window, hop)
+    np.testing.assert_array_equal(
+        np.concatenate([e for e, _ in output]), ends)
+    np.testing.assert_allclose(
+        np.concatenate([f for _, f in output]), features, atol=1e-9)
+    assert extractor.n_windows == len(ends)
+
+
+def test_samples_one_by_one():
+    output = []
+    extractor = WindowedFeatures(lambda e, f: output.append(f), window=4,
+                                 hop=2, features=('peak', 'zero_crossings'),
+                                 columns=('state', ))
+    assert extractor.column_names == ['state_peak', 'state_zero_crossings']
+    for k, v in enumerate([1, -1, 2, -3, 0, 0, 1, 5]):
+        extractor.append(k, v)
+    np.testing.assert_array_equal(np.concatenate(output),
+                                  [[3, 3], [3, 2], [5, 0]])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_gateway`
+===================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-26
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import os
+import time
+import socket
+
+import numpy as np
+import pytest
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.gateway import (HEADER, GatewayServer, GatewayClient,
+                                GatewayModule, encode_frame, decode_payload,
+                                read_frame, _Subscriber)
+
+
+class StreamingModule(object):
+
+    def __init__(self):
+        self.callback = None
+
+    def notifications(self, callback=None, with_epoch=False):
+        self.callback = callback
+
+
+class Client(object):
+
+    def __init__(self):
+        self.accelerometer = StreamingModule()
+        self.switch = StreamingModule()
+
+
+def _wait_for(condition, timeout=2.0):
+    t0 = time.time()
+    while not condition() and time.time() - t0 < timeout:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_frame_round_trip():
+    epochs = np.arange(1000, 1005)
+    values = np.arange(15, dtype='float64').reshape((5, 3)) / 4
+    frame = encode_frame(7, epochs, values, 42)
+    assert len(frame) == HEADER.size + 5 * (8 + 3 * 4)
+    kind, stream_id, n_columns, sequence, length = HEADER.unpack(
+        frame[:HEADER.size])
+    assert (stream_id, n_columns, sequence, length) == \
+        (7, 3, 42, len(frame) - HEADER.size)
+    e, v = decode_payload(frame[HEADER.size:], n_columns)
+    np.testing.assert_array_equal(e, epochs)
+    np.testing.assert_array_equal(v, values)
+
+
+def test_streams_are_published_to_subscribers():
+    client = Client()
+    server = GatewayServer(client, streams=['accelerometer', 'switch'],
+                           batch_size={'accelerometer': 4, 'switch': 1})
+    server.start()
+    try:
+        samples, switches, batches = [], [], []
+        c1 = GatewayClient(server.address)
+        c2 = GatewayClient(server.address)
+        c1.accelerometer.notifications(samples.append)
+        c2.accelerometer.batches(lambda e, v: batches.append((e, v)))
+        c2.switch.notifications(lambda epoch, v: switches.append((epoch, v)),
+                                with_epoch=True)
+        assert _wait_for(lambda: sum(len(s['streams'])
+                                     for s in server.stats()) == 3)
+
+        for k in range(8):
+            client.accelerometer.callback(1000 + k, (k, -k, 0.5))
+        client.switch.callback(1010, 1)
+        assert _wait_for(lambda: len(samples) == 8 and len(batches) == 2 and
+                         len(switches) == 1)
+        assert samples[0] == (0.0, 0.0, 0.5)
+        assert switches == [(1010, 1.0)]
+        np.testing.assert_array_equal(batches[1][0], [1004, 1005, 1006, 1007])
+
+        c1.disconnect()
+        c2.disconnect()
+        assert _wait_for(lambda: not server.subscribers)
+    finally:
+        server.stop()
+    assert client.accelerometer.callback is None
+
+
+def test_lost_frames_are_counted():
+    module = GatewayModule(None, 'switch', 0, 1)
+    batches = []
+    module.batch_callback = lambda e, v: batches.append(e)
+    epochs, values = np.arange(2), np.zeros((2, 1))
+    for sequence in (5, 6, 9, 10, 0xffffffff, 0):
+        module._deliver(sequence, epochs, values)
+    assert len(batches) == 6
+    assert module.n_lost == 2 + (0xffffffff - 11)
+
+
+def test_queued_frames_are_sent_after_close():
+    a, b = socket.socketpair()
+    subscriber = _Subscriber(a, max_queue=4)
+    for k in range(3):
+        subscriber.put(encode_frame(0, [k], [[0.5]], k))
+    subscriber.close()
+    subscriber.send_frames()
+    assert subscriber.n_sent == 3
+    assert [read_frame(b)[3] for _ in range(3)] == [0, 1, 2]
+    a.close()
+    b.close()
+
+
+def test_queued_frames_are_sent_on_stop(tmpdir):
+    client = Client()
+    address = str(tmpdir.join('gateway.sock'))
+    server = GatewayServer(client, address, batch_size=4)
+    server.start()
+    try:
+        batches = []
+        c = GatewayClient(address)
+        c.accelerometer.batches(lambda e, v: batches.append(e))
+        assert _wait_for(lambda: server.stats() and
+                         server.stats()[0]['streams'])
+        for k in range(6):
+            client.accelerometer.callback(1000 + k, (k, -k, 0.5))
+    finally:
+        server.stop()
+    assert not os.path.exists(address)
+    # The last two samples are flushed on stop, and sent before the
+    # connection is closed.
+    assert _wait_for(lambda: len(batches) == 2)
+    np.testing.assert_array_equal(batches[1], [1004, 1005])
+    assert c.accelerometer.n_lost == 0
+    c.disconnect()
+
+
+def test_stale_unix_socket_is_replaced(tmpdir):
+    address = str(tmpdir.join('gateway.sock'))
+    # Left by a server that did not stop.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(address)
+    stale.close()
+
+    server = GatewayServer(Client(), address)
+    server.start()
+    try:
+        other = GatewayServer(Client(), address)
+        with pytest.raises(PyMetaWearException):
+            other.start()
+        c = GatewayClient(address)
+        assert 'accelerometer' in c.modules
+        c.disconnect()
+    finally:
+        server.stop()
+
+    server = GatewayServer(Client(), address)
+    server.start()
+    server.stop()
+
+
+def test_slow_stream_is_sent_within_max_latency():
+    client = Client()
+    server = GatewayServer(client, streams=['switch'], batch_size=100,
+                           max_latency=0.05)
+    server.start()
+    try:
+        switches = []
+        c = GatewayClient(server.address)
+        c.switch.notifications(switches.append)
+        assert _wait_for(lambda: server.stats() and
+                         server.stats()[0]['streams'])
+        client.switch.callback(1000, 1)
+        assert _wait_for(lambda: switches == [1.0], timeout=0.5)
+        client.switch.callback(2000, 0)
+        assert _wait_for(lambda: switches == [1.0, 0.0], timeout=0.5)
+        c.disconnect()
+    finally:
+        server.stop()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_humidity`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import Modules
+from pymetawear.modules.humidity import HumidityModule
+from pymetawear.modules.timer import Timer
+
+
+class TimerModule(object):
+    """The timer module of a client, recording scheduled reads."""
+
+    def __init__(self):
+        self.reads = []
+
+    def periodic_read(self, source, period):
+        self.reads.append((source, period))
+        return Timer(None, 0x2000, period)
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    writes = []
+    for name, func in [
+            ('mbl_mw_humidity_bme280_set_oversampling',
+             lambda b, o: writes.append(('oversampling', o))),
+            ('mbl_mw_humidity_bme280_get_percentage_data_signal',
+             lambda b: 0x0100),
+            ('mbl_mw_datasignal_subscribe',
+             lambda signal, callback: writes.append(('subscribe', None))),
+            ('mbl_mw_datasignal_unsubscribe',
+             lambda signal: writes.append(('unsubscribe', None))),
+            ('mbl_mw_timer_stop', lambda t: writes.append(('stop', None))),
+            ('mbl_mw_timer_remove',
+             lambda t: writes.append(('remove', None)))]:
+        monkeypatch.setattr(libmetawear, name, func, raising=False)
+    return writes
+
+
+def test_missing_humidity_sensor():
+    module = HumidityModule(None, Modules.MBL_MW_MODULE_NA)
+    assert str(module) == "Humidity: Not present"
+    with pytest.raises(PyMetaWearException):
+        module.set_settings(oversampling=4)
+
+
+def test_oversampling_is_written_once(writes):
+    module = HumidityModule(None, Modules.MBL_MW_MODULE_HUMIDITY)
+    module.set_settings(oversampling=4)
+    module.set_settings(oversampling=4)
+    assert writes == [('oversampling', module.oversampling[4])]
+
+
+def test_scheduled_reads_use_timer_module(writes):
+    timer_module = TimerModule()
+    module = HumidityModule(None, Modules.MBL_MW_MODULE_HUMIDITY,
+                            timer_module=timer_module)
+    module.notifications(lambda data: None, period=60000)
+    assert timer_module.reads == [(module, 60000)]
+    module.notifications(None)
+    assert [w for w, _ in writes] == ['subscribe', 'stop', 'remove',
+                                      'unsubscribe']
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_logging`
+===================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-03
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+from ctypes import cast, pointer, c_void_p
+
+import numpy as np
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.mbientlab.metawear.core import Data, DataTypeId, \
+    CartesianFloat
+from pymetawear.modules.dataprocessor import DataSignal
+from pymetawear.modules.logging import LoggingModule
+
+
+def _value(pointer):
+    return getattr(pointer, 'value', pointer)
+
+
+def _data(epoch, value):
+    data = Data()
+    data.epoch = epoch
+    data.value = cast(pointer(value), c_void_p)
+    data.type_id = DataTypeId.CARTESIAN_FLOAT
+    # Keep the value alive as long as the data.
+    data._value = value
+    return pointer(data)
+
+
+class Board(object):
+    """Creates loggers and downloads a log of acceleration entries,
+    answering from another thread like the Bluetooth backends."""
+
+    def __init__(self, n_entries=0, fail=False, stall=False):
+        self.n_entries = n_entries
+        self.fail = fail
+        self.stall = stall
+        self.calls = []
+        self.subscribers = {}
+
+    def log(self, signal, callback):
+        logger = 0 if self.fail else 0x3000 + len(self.subscribers)
+        self.calls.append(('log', _value(signal)))
+        threading.Timer(0.001, callback, (logger, )).start()
+
+    def subscribe(self, logger, callback):
+        self.subscribers[_value(logger)] = callback
+
+    def download(self, board, n_notifies, handler):
+        handler = handler._obj
+        self.calls.append(('download', n_notifies))
+        threading.Thread(target=self._send_log, args=(handler, )).start()
+
+    def _send_log(self, handler):
+        handler.received_progress_update(self.n_entries, self.n_entries)
+        if self.stall:
+            # Disconnected in the middle of the download.
+            return
+        for k in range(self.n_entries):
+            for logger, callback in sorted(self.subscribers.items()):
+                callback(_data(1000 + k, CartesianFloat(k, -k, logger)))
+            if k % 4 == 3:
+                handler.received_progress_update(
+                    self.n_entries - k - 1, self.n_entries)
+        if self.n_entries % 4:
+            handler.received_progress_update(0, self.n_entries)
+
+    def patch(self, monkeypatch):
+        for name, func in [
+                ('mbl_mw_datasignal_log', self.log),
+                ('mbl_mw_logger_subscribe', self.subscribe),
+                ('mbl_mw_logging_download', self.download),
+                ('mbl_mw_logger_remove',
+                 lambda logger: self.calls.append(('remove',
+                                                   _value(logger)))),
+                ('mbl_mw_logging_start',
+                 lambda board, overwrite: self.calls.append(('start',
+                                                             overwrite))),
+                ('mbl_mw_logging_stop',
+                 lambda board: self.calls.append(('stop', )))]:
+            monkeypatch.setattr(libmetawear, name, func, raising=False)
+
+
+def test_loggers_are_added_and_removed(monkeypatch):
+    board = Board()
+    board.patch(monkeypatch)
+    logging = LoggingModule(None)
+    logging.add_logger('acc', DataSignal(None, 'acc', 0x0100))
+    assert _value(logging.loggers['acc']) == 0x3000
+    assert 0x3000 in board.subscribers
+    with pytest.raises(PyMetaWearException):
+        logging.add_logger('acc', DataSignal(None, 'acc', 0x0100))
+
+    logging.start(overwrite=True)
+    logging.stop()
+    logging.remove_logger('acc')
+    assert board.calls == [('log', 0x0100), ('start', 1), ('stop', ),
+                           ('remove', 0x3000)]
+    assert logging.loggers == {}
+    with pytest.raises(PyMetaWearException):
+        logging.remove_logger('acc')
+
+
+def test_failed_logger_creation_raises(monkeypatch):
+    Board(fail=True).patch(monkeypatch)
+    logging = LoggingModule(None)
+    with pytest.raises(PyMetaWearException):
+        logging.add_logger('acc', DataSignal(None, 'acc', 0x0100))
+    assert logging.loggers == {}
+
+
+def test_entries_are_downloaded_in_batches(monkeypatch):
+    board = Board(n_entries=10)
+    board.patch(monkeypatch)
+    logging = LoggingModule(None)
+    logging.add_logger('acc', DataSignal(None, 'acc', 0x0100))
+    logging.add_logger('gyro', DataSignal(None, 'gyro', 0x0200))
+
+    batches = []
+    progress = []
+    logging.download({'acc': lambda e, v: batches.append((e, v)),
+                      'gyro': None},
+                     batch_size=4, n_notifies=3,
+                     progress_callback=lambda *args: progress.append(args),
+                     timeout=2.0)
+    assert ('download', 3) in board.calls
+    assert progress == [(10, 10), (6, 10), (2, 10), (0, 10)]
+    assert [len(e) for e, _ in batches] == [4, 4, 2]
+    epochs = np.concatenate([e for e, _ in batches])
+    values = np.vstack([v for _, v in batches])
+    np.testing.assert_array_equal(epochs, 1000 + np.arange(10))
+    np.testing.assert_array_equal(values[:, 1], -np.arange(10))
+    np.testing.assert_array_equal(values[:, 2], 0x3000)
+
+
+def test_stalled_download_times_out(monkeypatch):
+    board = Board(n_entries=10, stall=True)
+    board.patch(monkeypatch)
+    logging = LoggingModule(None)
+    logging.add_logger('acc', DataSignal(None, 'acc', 0x0100))
+    with pytest.raises(PyMetaWearException):
+        logging.download({'acc': lambda e, v: None}, timeout=0.05)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_macro`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import threading
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules import base
+from pymetawear.modules.macro import MacroModule
+
+
+class Board(object):
+    """Stores macros, answering with the macro id from another thread."""
+
+    def __init__(self, delay=0.001, macro_id=0):
+        self.delay = delay
+        self.macro_id = macro_id
+        self.calls = []
+
+    def record(self, board, exec_on_boot):
+        self.calls.append(('record', exec_on_boot.value))
+
+    def end_record(self, board, callback):
+        self.calls.append(('end', None))
+        threading.Timer(self.delay, callback, (self.macro_id, )).start()
+
+    def patch(self, monkeypatch):
+        monkeypatch.setattr(libmetawear, 'mbl_mw_macro_record',
+                            self.record, raising=False)
+        monkeypatch.setattr(libmetawear, 'mbl_mw_macro_end_record',
+                            self.end_record, raising=False)
+
+
+def test_macro_is_recorded(monkeypatch):
+    board = Board(macro_id=3)
+    board.patch(monkeypatch)
+    module = MacroModule(None)
+    with module(exec_on_boot=True) as macro:
+        board.calls.append(('command', None))
+    assert board.calls == [('record', 1), ('command', None), ('end', None)]
+    assert macro.id == 3
+    assert module.macros == [macro]
+
+
+def test_failed_macro_raises(monkeypatch):
+    Board(macro_id=-1).patch(monkeypatch)
+    module = MacroModule(None)
+    with pytest.raises(PyMetaWearException):
+        with module():
+            pass
+    assert module.macros == []
+
+
+def test_failed_block_ends_recording(monkeypatch):
+    board = Board(delay=0.05)
+    board.patch(monkeypatch)
+    module = MacroModule(None)
+    n_pending = len(base._pending_callbacks)
+    with pytest.raises(RuntimeError):
+        with module() as macro:
+            raise RuntimeError("Sensor not found.")
+    assert board.calls[-1] == ('end', None)
+    assert macro.id is None
+    assert module.macros == []
+
+    # The board answers after the block has been left.
+    assert len(base._pending_callbacks) == n_pending + 1
+    t0 = time.time()
+    while len(base._pending_callbacks) > n_pending and \
+            time.time() - t0 < 2.0:
+        time.sleep(0.01)
+    assert len(base._pending_callbacks) == n_pending
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_magnetometer`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import Modules
+from pymetawear.modules.magnetometer import MagnetometerModule
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    writes = []
+    monkeypatch.setattr(
+        libmetawear, 'mbl_mw_mag_bmm150_set_preset',
+        lambda board, preset: writes.append(('preset', preset)),
+        raising=False)
+    monkeypatch.setattr(
+        libmetawear, 'mbl_mw_mag_bmm150_configure',
+        lambda board, xy, z, odr: writes.append(
+            ('configure', xy.value, z.value, odr)),
+        raising=False)
+    return writes
+
+
+def test_missing_magnetometer():
+    module = MagnetometerModule(None, Modules.MBL_MW_MODULE_NA)
+    assert str(module) == "Magnetometer: Not present"
+    with pytest.raises(PyMetaWearException):
+        module.set_settings(preset='regular')
+
+
+def test_preset_is_written_once(writes):
+    module = MagnetometerModule(None, Modules.MBL_MW_MODULE_MAGNETOMETER)
+    module.set_settings(preset='high_accuracy')
+    module.set_settings(preset='high_accuracy')
+    assert writes == [('preset', module.presets['high_accuracy'])]
+    assert module.get_current_settings() == {'preset': 'high_accuracy',
+                                             'data_rate': 20.0}
+
+
+def test_data_rate_keeps_preset_repetitions(writes):
+    module = MagnetometerModule(None, Modules.MBL_MW_MODULE_MAGNETOMETER)
+    module.set_settings(preset='low_power')
+    module.set_settings(data_rate=25.0)
+    assert writes[-1] == ('configure', 3, 3, module.odr[25.0])
+    assert module.get_current_settings() == {'preset': 'low_power',
+                                             'data_rate': 25.0}
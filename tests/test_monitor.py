@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_monitor`
+===================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-24
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+from collections import namedtuple
+
+from pymetawear.monitor import SignalMonitor
+from pymetawear.stats import SignalStats
+
+_Data = namedtuple('_Data', ['epoch'])
+_Pointer = namedtuple('_Pointer', ['contents'])
+
+
+def test_gaps_from_board_timestamps():
+    gaps = []
+    monitor = SignalMonitor('accelerometer', SignalStats(), on_gap=gaps.append)
+    received = []
+
+    def callback(data):
+        received.append(data)
+
+    wrapper = monitor.wrap(callback, data_rate=100.0)
+    for epoch in (1000, 1010, 1020, 1050, 1060, 1075, 1090):
+        wrapper(_Pointer(_Data(epoch)))
+    assert len(received) == 7
+    assert monitor.n_gaps == 1
+    assert monitor.n_missing == 2
+    assert gaps[0].previous == 1020 and gaps[0].epoch == 1050
+
+    # No rate, no gap detection.
+    assert monitor.wrap(callback) is callback
+
+
+def test_stall_watchdog():
+    stats = SignalStats()
+    stalls = []
+    monitor = SignalMonitor('gyroscope', stats, stall_timeout=0.05,
+                            on_stall=stalls.append)
+    wrapper = stats.wrap(lambda data: None)
+    monitor.start()
+    try:
+        for _ in range(10):
+            wrapper(None)
+            time.sleep(0.01)
+        assert monitor.n_stalls == 0
+        time.sleep(0.2)
+        assert monitor.n_stalls == 1
+        assert monitor.stalled
+        wrapper(None)
+        time.sleep(0.03)
+        assert not monitor.stalled
+    finally:
+        monitor.stop()
+    assert stalls[0].signal == 'gyroscope'
+    assert stalls[0].duration > 0.05
+
+
+def test_stop_from_stall_callback():
+    stats = SignalStats()
+    monitor = SignalMonitor('switch', stats, stall_timeout=0.02,
+                            on_stall=lambda event: monitor.stop())
+    monitor.start()
+    thread = monitor._thread
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert monitor._thread is None
+    assert monitor.n_stalls == 1
+
+    monitor.reset()
+    assert monitor.as_dict() == {'gaps': 0, 'missing': 0, 'stalls': 0,
+                                 'stalled': True}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_packets`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-18
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import struct
+
+import numpy as np
+
+from pymetawear.packets import decode_accelerometer, decode_gyroscope, \
+    decode_with_libmetawear, ACC_REGISTERS, GYRO_REGISTERS
+
+
+def test_packed_and_unpacked_in_order():
+    payloads = [
+        bytearray(struct.pack('<BBhhh', 0x03, 0x04, 8192, -8192, 0)),
+        bytearray(struct.pack('<BBhhh', 0x13, 0x05, 656, 0, -656)),
+        bytearray(struct.pack('<BB9h', 0x03, 0x1c, *range(1, 10))),
+        bytearray([0x01, 0x01, 0x01]),
+        bytearray(struct.pack('<BBhhh', 0x03, 0x04, 0, 0, 16384)),
+    ]
+    times = np.arange(len(payloads), dtype='float')
+
+    t, acc = decode_accelerometer(payloads, data_range=4.0, times=times)
+    assert acc.shape == (5, 3)
+    assert t.tolist() == [0.0, 2.0, 2.0, 2.0, 4.0]
+    # libmetawear divides the raw values with the range's sensitivity.
+    np.testing.assert_allclose(acc[0], [1.0, -1.0, 0.0])
+    np.testing.assert_allclose(acc[1:4].ravel(), np.arange(1, 10) / 8192.0)
+    np.testing.assert_allclose(acc[4], [0.0, 0.0, 2.0])
+
+    t, gyro = decode_gyroscope(payloads, data_range=500.0)
+    assert t is None
+    np.testing.assert_allclose(gyro, [[10.0, 0.0, -10.0]])
+
+
+def test_wrong_lengths_are_skipped():
+    payloads = [bytearray(struct.pack('<BBhh', 0x03, 0x04, 1, 1)),
+                bytearray(struct.pack('<BBhhh', 0x03, 0x1c, 1, 1, 1))]
+    assert decode_accelerometer(payloads)[1].shape == (0, 3)
+
+
+def _payloads(registers, n_samples, random_state):
+    raw = random_state.randint(-32768, 32768, size=(n_samples, 3))
+    unpacked = [bytearray(struct.pack('<BBhhh', registers[0],
+                                      registers[1], *r)) for r in raw]
+    packed = [bytearray(struct.pack('<BB9h', registers[0], registers[2],
+                                    *raw[i:i + 3].ravel()))
+              for i in range(0, n_samples, 3)]
+    return unpacked, packed
+
+
+def test_same_values_as_libmetawear():
+    from pymetawear.client import MetaWearClient
+
+    random_state = np.random.RandomState(0)
+    client = MetaWearClient('stand-in', backend='standin')
+    try:
+        for module, decode, registers, data_range in (
+                (client.accelerometer, decode_accelerometer,
+                 ACC_REGISTERS, 4.0),
+                (client.gyroscope, decode_gyroscope,
+                 GYRO_REGISTERS, 500.0)):
+            module.set_settings(data_range=data_range)
+            for packed, payloads in enumerate(
+                    _payloads(registers, 30, random_state)):
+                expected = decode_with_libmetawear(module, payloads,
+                                                   packed=bool(packed))
+                assert expected.shape == (30, 3)
+                np.testing.assert_allclose(
+                    decode(payloads, data_range=data_range)[1], expected,
+                    rtol=1e-5, atol=1e-6)
+    finally:
+        client.disconnect()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_reconnect`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-23
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import struct
+
+from pymetawear.reconnect import AutoReconnect
+from pymetawear.stats import ConnectionStats
+from pymetawear.tracing import WRITE
+
+
+class FlakyBackend(object):
+
+    def __init__(self, n_failures):
+        self.connected = True
+        self.n_failures = n_failures
+        self.attempts = 0
+        self.stats = ConnectionStats()
+
+    def is_connected(self):
+        return self.connected
+
+    def reconnect(self):
+        self.attempts += 1
+        if self.attempts <= self.n_failures:
+            raise IOError("Board not found.")
+        self.connected = True
+
+
+class Client(object):
+
+    def __init__(self, backend, n_failed_restores=0):
+        self.backend = backend
+        self.n_failed_restores = n_failed_restores
+
+    def restore_session(self):
+        if self.n_failed_restores:
+            # Lost again while restoring.
+            self.n_failed_restores -= 1
+            self.backend.stats.packets_out += 1
+            self.backend.connected = False
+            raise IOError("Connection lost.")
+        self.backend.stats.packets_out += 3
+
+
+def test_reconnects_with_backoff():
+    client = Client(FlakyBackend(n_failures=2))
+    events = []
+    reconnector = AutoReconnect(client, check_interval=0.01,
+                                initial_delay=0.01, callback=events.append)
+    reconnector.start()
+    try:
+        client.backend.connected = False
+        t0 = time.time()
+        while not events and time.time() - t0 < 2.0:
+            time.sleep(0.01)
+    finally:
+        reconnector.stop()
+
+    event = events[0]
+    assert event.attempts == 3
+    assert event.writes == 3
+    # Waited 0.01 and 0.02 seconds between the attempts.
+    assert event.downtime >= 0.03
+    assert client.backend.connected
+
+
+def test_gives_up():
+    client = Client(FlakyBackend(n_failures=10))
+    client.backend.connected = False
+    reconnector = AutoReconnect(client, initial_delay=0.0, max_attempts=4)
+    event = reconnector.reconnect()
+    assert event.connected is None
+    assert event.attempts == 4
+
+
+def test_failed_restore_is_retried():
+    client = Client(FlakyBackend(n_failures=0), n_failed_restores=1)
+    events = []
+    reconnector = AutoReconnect(client, check_interval=0.01,
+                                initial_delay=0.01, callback=events.append)
+    reconnector.start()
+    try:
+        client.backend.connected = False
+        t0 = time.time()
+        while not events and time.time() - t0 < 2.0:
+            time.sleep(0.01)
+        assert reconnector.is_running
+    finally:
+        reconnector.stop()
+
+    event = events[0]
+    assert event.attempts == 2
+    assert event.writes == 3
+    assert isinstance(event.error, IOError)
+    assert client.backend.connected
+
+
+def test_watchdog_survives_callback_errors():
+    client = Client(FlakyBackend(n_failures=0))
+    events = []
+
+    def callback(event):
+        events.append(event)
+        raise ValueError("Callback failed.")
+
+    reconnector = AutoReconnect(client, check_interval=0.01,
+                                callback=callback)
+    reconnector.start()
+    try:
+        for _ in range(2):
+            n_events = len(events)
+            client.backend.connected = False
+            t0 = time.time()
+            while len(events) == n_events and time.time() - t0 < 2.0:
+                time.sleep(0.01)
+        assert len(events) == 2
+        assert reconnector.is_running
+    finally:
+        reconnector.stop()
+
+
+def test_stand_in_session_is_restored():
+    from pymetawear.client import MetaWearClient
+
+    client = MetaWearClient('stand-in', backend='standin')
+    writes = []
+    samples = []
+    payload = bytearray(struct.pack(str('<BBhhh'), 0x03, 0x04, 0, 0, 8192))
+    try:
+        client.accelerometer.set_settings(data_rate=100.0, data_range=4.0)
+        client.accelerometer.notifications(samples.append)
+        client.add_trace_hook(
+            lambda e: writes.append(bytes(e.data)) if e.kind == WRITE
+            else None)
+
+        client.backend.drop()
+        assert not client.backend.is_connected()
+        n_commands = client.backend.n_commands
+        client.backend.notify(payload)
+        client.accelerometer.start()
+        assert client.backend.n_commands == n_commands
+        assert samples == []
+
+        del writes[:]
+        client.backend.reconnect()
+        client.restore_session()
+        assert client.backend.is_connected()
+        assert client.backend.n_commands == n_commands + len(writes)
+        # The acceleration config is written before the subscription,
+        # and sampling is started after it.
+        config = [k for k, w in enumerate(writes) if w[:2] == b'\x03\x03']
+        subscribe = writes.index(b'\x03\x04\x01')
+        start = writes.index(b'\x03\x01\x01')
+        assert config and config[-1] < subscribe < start
+
+        client.backend.notify(payload)
+        assert len(samples) == 1
+    finally:
+        client.disconnect()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_recording`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-05
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.recording import Recorder, Recording
+
+
+def test_recorded_streams_are_read_back(tmpdir):
+    rec = Recorder(str(tmpdir), chunk_size=16)
+    acc = rec.stream('acc')
+    battery = rec.stream('battery', (('voltage', '<u2'), ('charge', '<u1')))
+    for k in range(100):
+        acc.append(1000 + 10 * k, (k, 2 * k, 3 * k))
+    battery.append(1000, (4100, 87))
+    rec.close()
+
+    recording = Recording(str(tmpdir))
+    assert recording.streams == ['acc', 'battery']
+    stream = recording['acc']
+    assert len(stream) == 100
+    assert len(stream.index) == 7
+    assert isinstance(stream['x'], np.memmap)
+    np.testing.assert_array_equal(stream['z'], 3 * np.arange(100))
+    assert recording['battery']['charge'][0] == 87
+    assert recording['battery']['voltage'].dtype == np.dtype('<u2')
+
+
+def test_time_slice(tmpdir):
+    rec = Recorder(str(tmpdir), chunk_size=8)
+    epochs = 1000 + 10 * np.arange(50)
+    rec.stream('acc').append_batch(epochs, np.c_[epochs, epochs, epochs])
+    rec.close()
+
+    epochs, columns = Recording(str(tmpdir))['acc'].time_slice(1095, 1200)
+    np.testing.assert_array_equal(epochs, np.arange(1100, 1200, 10))
+    np.testing.assert_array_equal(columns['y'], epochs)
+
+
+def test_appending_to_existing_recording(tmpdir):
+    for k in range(2):
+        rec = Recorder(str(tmpdir), chunk_size=8)
+        rec.stream('acc').append(k, (k, k, k))
+        rec.close()
+    assert len(Recording(str(tmpdir))['acc']) == 2
+
+    rec = Recorder(str(tmpdir))
+    with pytest.raises(PyMetaWearException):
+        rec.stream('acc', (('x', '<f8'), ))
+
+
+def test_unindexed_data_is_cut_off_on_reopen(tmpdir):
+    rec = Recorder(str(tmpdir), chunk_size=4)
+    rec.stream('acc').append_batch([0, 1, 2, 3], np.zeros((4, 3)))
+    rec.close()
+    # A crash after the columns of a chunk were written, but not the index.
+    for c, dtype in (('epoch', '<i8'), ('x', '<f4'), ('y', '<f4'),
+                     ('z', '<f4')):
+        with open(str(tmpdir.join('acc.{0}.bin'.format(c))), 'ab') as f:
+            np.array([100, 101, 102, 103], dtype=dtype).tofile(f)
+
+    rec = Recorder(str(tmpdir), chunk_size=4)
+    rec.stream('acc').append_batch([200, 201, 202, 203], np.ones((4, 3)))
+    rec.close()
+    acc = Recording(str(tmpdir))['acc']
+    np.testing.assert_array_equal(acc.epochs, [0, 1, 2, 3, 200, 201, 202, 203])
+    np.testing.assert_array_equal(acc['x'], [0, 0, 0, 0, 1, 1, 1, 1])
+
+
+def test_reserved_column_names(tmpdir):
+    rec = Recorder(str(tmpdir))
+    for name in ('epoch', 'index'):
+        with pytest.raises(PyMetaWearException):
+            rec.stream('acc', ((name, '<f4'), ))
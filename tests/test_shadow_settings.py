@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_shadow_settings`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-15
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.mbientlab.metawear import sensor
+from pymetawear.modules.accelerometer import AccelerometerModule
+from pymetawear.modules.base import PyMetaWearModule, Modules, \
+    begin_recording, end_recording
+from pymetawear.modules.magnetometer import MagnetometerModule
+
+
+class CountingModule(PyMetaWearModule):
+
+    def __init__(self, board=None):
+        super(CountingModule, self).__init__(board)
+        self.writes = []
+
+    def set_settings(self, data_rate=None, data_range=None):
+        settings = self._changed_settings(data_rate=data_rate,
+                                          data_range=data_range)
+        if settings:
+            self.writes.append(settings)
+            self._store_settings(settings)
+
+
+def test_unchanged_settings_are_not_written():
+    module = CountingModule()
+    module.set_settings(data_rate=100.0, data_range=4.0)
+    module.set_settings(data_rate=100.0, data_range=4.0)
+    module.set_settings(data_range=8.0)
+    assert module.writes == [{'data_rate': 100.0, 'data_range': 4.0},
+                             {'data_range': 8.0}]
+    assert module.get_current_settings() == {'data_rate': 100.0,
+                                             'data_range': 8.0}
+
+    module.clear_settings()
+    module.set_settings(data_range=8.0)
+    assert len(module.writes) == 3
+
+
+def test_restored_settings_are_not_written():
+    module = CountingModule()
+    module.restore_settings(data_rate=50.0)
+    module.set_settings(data_rate=50.0)
+    assert module.writes == []
+
+
+def test_settings_are_written_while_recording():
+    module = CountingModule()
+    module.set_settings(data_rate=100.0)
+    begin_recording(module.board)
+    try:
+        module.set_settings(data_rate=100.0)
+        module.set_settings(data_rate=25.0)
+    finally:
+        end_recording(module.board)
+    assert len(module.writes) == 3
+    # Recorded settings are not applied to the board.
+    assert module.get_current_settings() == {'data_rate': 100.0}
+
+
+def test_settings_are_reapplied_in_one_write():
+    module = CountingModule()
+    module.set_settings(data_rate=100.0)
+    module.set_settings(data_range=8.0)
+    module.reapply()
+    assert module.writes[-1] == {'data_rate': 100.0, 'data_range': 8.0}
+    assert len(module.writes) == 3
+
+
+def test_recording_is_tracked_per_board():
+    recorded, other = CountingModule(0x1000), CountingModule(0x2000)
+    recorded.set_settings(data_rate=100.0)
+    other.set_settings(data_rate=100.0)
+    begin_recording(0x1000)
+    try:
+        recorded.set_settings(data_rate=100.0)
+        other.set_settings(data_rate=100.0)
+        other.set_settings(data_rate=25.0)
+    finally:
+        end_recording(0x1000)
+    assert len(recorded.writes) == 2
+    assert len(other.writes) == 2
+    assert other.get_current_settings() == {'data_rate': 25.0}
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    writes = []
+    for name in ('mbl_mw_acc_set_odr', 'mbl_mw_acc_set_range',
+                 'mbl_mw_acc_write_acceleration_config',
+                 'mbl_mw_mag_bmm150_set_preset',
+                 'mbl_mw_mag_bmm150_configure'):
+        monkeypatch.setattr(
+            libmetawear, name,
+            lambda board, *args, **kwargs: writes.append(board),
+            raising=False)
+    return writes
+
+
+def test_accelerometer_settings_while_recording(writes):
+    recorded = AccelerometerModule(0x1000,
+                                   sensor.AccelerometerBmi160.MODULE_TYPE)
+    other = AccelerometerModule(0x2000,
+                                sensor.AccelerometerBmi160.MODULE_TYPE)
+    for module in (recorded, other):
+        module.set_settings(data_rate=100.0, data_range=4.0)
+    del writes[:]
+
+    begin_recording(0x1000)
+    try:
+        recorded.set_settings(data_rate=100.0, data_range=4.0)
+        other.set_settings(data_rate=100.0, data_range=4.0)
+        other.set_settings(data_range=8.0)
+    finally:
+        end_recording(0x1000)
+    # Rate, range and config write of each call.
+    assert writes == [0x1000] * 3 + [0x2000] * 2
+    assert recorded.get_current_settings() == {'data_rate': 100.0,
+                                               'data_range': 4.0}
+    assert other.get_current_settings() == {'data_rate': 100.0,
+                                            'data_range': 8.0}
+
+
+def test_magnetometer_settings_while_recording(writes):
+    recorded = MagnetometerModule(0x1000, Modules.MBL_MW_MODULE_MAGNETOMETER)
+    other = MagnetometerModule(0x2000, Modules.MBL_MW_MODULE_MAGNETOMETER)
+    for module in (recorded, other):
+        module.set_settings(preset='regular')
+    del writes[:]
+
+    begin_recording(0x1000)
+    try:
+        recorded.set_settings(preset='regular')
+        recorded.set_settings(data_rate=25.0)
+        other.set_settings(preset='regular')
+    finally:
+        end_recording(0x1000)
+    assert writes == [0x1000, 0x1000]
+    assert recorded.get_current_settings() == {'preset': 'regular',
+                                               'data_rate': 10.0}
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_stats`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-19
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear.stats import LatencyHistogram, SignalStats
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for _ in range(90):
+        h.add(3e-6)
+    for _ in range(10):
+        h.add(1e-3)
+    d = h.as_dict()
+    assert d['count'] == 100
+    assert d['buckets'] == {4: 90, 1024: 10}
+    assert d['p50'] == pytest.approx(4e-6)
+    assert d['p99'] == pytest.approx(1e-3)
+
+
+def test_signal_counting_survives_reset():
+    stats = SignalStats(timing=True)
+    received = []
+    wrapper = stats.wrap(received.append)
+    for k in range(5):
+        wrapper(k)
+    assert received == list(range(5))
+    assert stats.samples == 5
+    stats.reset()
+    wrapper(5)
+    assert stats.samples == 1
+    assert stats.as_dict()['callback_latency']['count'] == 1
+
+    wrapper = stats.wrap(lambda data: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        wrapper(0)
+    assert stats.errors == 1
+
+
+def test_samples_are_only_counted_without_timing():
+    stats = SignalStats()
+    received = []
+    wrapper = stats.wrap(received.append)
+    for k in range(5):
+        wrapper(k)
+    assert received == list(range(5))
+    assert stats.samples == 5
+    assert stats.first is None
+    assert stats.rate > 0.0
+    d = stats.as_dict()
+    assert d['callback_latency']['count'] == 0
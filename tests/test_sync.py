@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_sync`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-02
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.sync import StreamSynchronizer
+
+
+class FrameCollector(object):
+
+    def __init__(self):
+        self.epochs = []
+        self.frames = []
+
+    def __call__(self, epochs, frames):
+        self.epochs.append(epochs)
+        self.frames.append(frames)
+
+    @property
+    def all_epochs(self):
+        return np.concatenate(self.epochs)
+
+    @property
+    def all_frames(self):
+        return np.vstack(self.frames)
+
+
+def _synchronizer(collector, **kwargs):
+    sync = StreamSynchronizer(100.0, collector, **kwargs)
+    sync.add_stream('accelerometer')
+    sync.add_stream('gyroscope')
+    return sync
+
+
+def test_interleaved_streams_are_aligned():
+    collector = FrameCollector()
+    sync = _synchronizer(collector)
+    # Accelerometer at 200 Hz and gyroscope at 100 Hz, offset by 3 ms.
+    for k in range(40):
+        t = 1000.0 + 5.0 * k
+        sync.feed('accelerometer', t, (t, 0.0, 1.0))
+        if k % 2 == 0:
+            sync.feed('gyroscope', t + 3.0, (-t, 2.0, 3.0))
+
+    epochs = collector.all_epochs
+    frames = collector.all_frames
+    assert frames.shape == (len(epochs), 6)
+    np.testing.assert_allclose(np.diff(epochs), 10.0)
+    assert epochs[0] == 1010.0
+    np.testing.assert_allclose(frames[:, 0], epochs)
+    np.testing.assert_allclose(frames[:, 3], -(epochs - 3.0))
+    np.testing.assert_allclose(frames[:, 4], 2.0)
+
+
+def test_lagging_stream_is_not_waited_for():
+    collector = FrameCollector()
+    sync = _synchronizer(collector, max_latency=0.1)
+    sync.feed('gyroscope', 1000.0, (0.0, 0.0, 0.0))
+    for k in range(50):
+        sync.feed('accelerometer', 1000.0 + 10.0 * k, (1.0, 1.0, 1.0))
+
+    frames = collector.all_frames
+    assert collector.all_epochs[-1] <= 1490.0 - 100.0
+    assert np.all(np.isnan(frames[1:, 3:]))
+    np.testing.assert_allclose(frames[:, :3], 1.0)
+
+
+def test_silent_stream_is_nan():
+    collector = FrameCollector()
+    sync = _synchronizer(collector, max_latency=0.1)
+    for k in range(200):
+        sync.feed('accelerometer', 1000.0 + 5.0 * k, (1.0, 1.0, 1.0))
+    sync.flush()
+
+    frames = collector.all_frames
+    assert collector.all_epochs[-1] == 1990.0
+    assert np.all(np.isnan(frames[:, 3:]))
+    np.testing.assert_allclose(frames[:, :3], 1.0)
+
+
+def test_buffers_are_bounded():
+    collector = FrameCollector()
+    sync = _synchronizer(collector, max_latency=1000.0, buffer_size=16)
+    for k in range(100):
+        sync.feed('accelerometer', 1000.0 + 10.0 * k, (1.0, 1.0, 1.0))
+    assert sync.n_dropped == {'accelerometer': 84, 'gyroscope': 0}
+    assert len(collector.epochs) == 0
+
+
+def test_timestamp_jump_is_skipped():
+    collector = FrameCollector()
+    sync = _synchronizer(collector, max_latency=0.1, buffer_size=16)
+    for k in range(10):
+        sync.feed('accelerometer', 1000.0 + 10.0 * k, (1.0, 1.0, 1.0))
+        sync.feed('gyroscope', 1000.0 + 10.0 * k, (2.0, 2.0, 2.0))
+    n_frames = len(collector.all_epochs)
+    sync.feed('accelerometer', 1e12, (1.0, 1.0, 1.0))
+    assert len(collector.all_epochs) - n_frames <= 16 + 10 + 1
+    assert sync.n_skipped > 1e9
+
+
+def test_unknown_stream_raises():
+    sync = StreamSynchronizer(100.0, FrameCollector())
+    with pytest.raises(PyMetaWearException):
+        sync.feed('magnetometer', 0.0, (0.0, 0.0, 0.0))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_temperature`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.base import Modules
+from pymetawear.modules.temperature import TemperatureModule
+
+
+class Timer(object):
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def stop(self):
+        self.calls.append('stop')
+
+    def remove(self):
+        self.calls.append('remove')
+
+
+class TimerModule(object):
+    """The timer module of a client, recording scheduled reads."""
+
+    def __init__(self):
+        self.calls = []
+
+    def periodic_read(self, source, period):
+        self.calls.append(('periodic_read', source, period))
+        return Timer(self.calls)
+
+
+@pytest.fixture
+def board(monkeypatch):
+    calls = []
+    for name, func in [
+            ('mbl_mw_multi_chnl_temp_get_num_channels', lambda b: 2),
+            ('mbl_mw_multi_chnl_temp_get_source',
+             lambda b, channel: [0, 2][channel.value]),
+            ('mbl_mw_multi_chnl_temp_get_temperature_data_signal',
+             lambda b, channel: 0x0100 + channel.value),
+            ('mbl_mw_datasignal_subscribe',
+             lambda signal, callback: calls.append('subscribe')),
+            ('mbl_mw_datasignal_unsubscribe',
+             lambda signal: calls.append('unsubscribe'))]:
+        monkeypatch.setattr(libmetawear, name, func, raising=False)
+    return calls
+
+
+def test_channels(board):
+    module = TemperatureModule(None, Modules.MBL_MW_MODULE_TEMPERATURE)
+    assert module.channels == ['nrf_die', 'bmp280']
+    module.set_settings(channel=1)
+    assert module.sensor_name == 'bmp280'
+    with pytest.raises(ValueError):
+        module.set_settings(channel=2)
+
+
+def test_scheduled_reads_use_timer_module(board):
+    timer_module = TimerModule()
+    module = TemperatureModule(None, Modules.MBL_MW_MODULE_TEMPERATURE,
+                               timer_module=timer_module)
+    module.notifications(lambda data: None, period=1000)
+    assert timer_module.calls == [('periodic_read', module, 1000)]
+    module.notifications(None)
+    assert timer_module.calls[1:] == ['stop', 'remove']
+    assert board == ['subscribe', 'unsubscribe']
+
+
+def test_scheduled_reads_need_timer_module(board):
+    module = TemperatureModule(None, Modules.MBL_MW_MODULE_TEMPERATURE)
+    with pytest.raises(PyMetaWearException):
+        module.notifications(lambda data: None, period=1000)
+    assert module.callback is None
+    assert board == []
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_timer`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-30
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import threading
+
+import pytest
+
+from pymetawear import libmetawear
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.modules.dataprocessor import DataSignal
+from pymetawear.modules.timer import TimerModule
+
+
+def _value(pointer):
+    return getattr(pointer, 'value', pointer)
+
+
+class Board(object):
+    """Creates timers and stores their commands, answering from
+    another thread."""
+
+    def __init__(self, timer=0x2000, status=0):
+        self.timer = timer
+        self.status = status
+        self.calls = []
+
+    def _answer(self, callback, *args):
+        threading.Timer(0.001, callback, args).start()
+
+    def create(self, board, period, repetitions, delay, callback):
+        self.calls.append(('create', period.value, repetitions.value))
+        self._answer(callback, self.timer)
+
+    def create_indefinite(self, board, period, delay, callback):
+        self.calls.append(('create', period.value, None))
+        self._answer(callback, self.timer)
+
+    def end_record(self, event, callback):
+        self.calls.append(('recorded', _value(event)))
+        self._answer(callback, None, self.status)
+
+    def patch(self, monkeypatch):
+        for name, func in [
+                ('mbl_mw_timer_create', self.create),
+                ('mbl_mw_timer_create_indefinite', self.create_indefinite),
+                ('mbl_mw_event_end_record', self.end_record),
+                ('mbl_mw_event_record_commands',
+                 lambda event: self.calls.append(('record', _value(event)))),
+                ('mbl_mw_datasignal_read',
+                 lambda signal: self.calls.append(('read', _value(signal)))),
+                ('mbl_mw_timer_start',
+                 lambda timer: self.calls.append(('start', _value(timer)))),
+                ('mbl_mw_timer_remove',
+                 lambda timer: self.calls.append(('remove',
+                                                  _value(timer))))]:
+            monkeypatch.setattr(libmetawear, name, func, raising=False)
+
+
+def test_periodic_read(monkeypatch):
+    board = Board()
+    board.patch(monkeypatch)
+    timer = TimerModule(None).periodic_read(
+        DataSignal(None, 'battery', 0x0100), 1000, repetitions=10)
+    assert board.calls == [('create', 1000, 10),
+                           ('record', 0x2000),
+                           ('read', 0x0100),
+                           ('recorded', 0x2000),
+                           ('start', 0x2000)]
+    assert timer.period == 1000
+    assert timer.repetitions == 10
+
+
+def test_indefinite_timer_is_not_started(monkeypatch):
+    board = Board()
+    board.patch(monkeypatch)
+    TimerModule(None).schedule(500, lambda: None, start=False)
+    assert board.calls[0] == ('create', 500, None)
+    assert 'start' not in [c[0] for c in board.calls]
+
+
+def test_failed_creation_raises(monkeypatch):
+    Board(timer=0).patch(monkeypatch)
+    with pytest.raises(PyMetaWearException):
+        TimerModule(None).create(1000)
+
+
+def test_timer_is_removed_if_recording_fails(monkeypatch):
+    board = Board(status=16)
+    board.patch(monkeypatch)
+    with pytest.raises(PyMetaWearException):
+        TimerModule(None).schedule(500, lambda: None)
+    assert board.calls[-1] == ('remove', 0x2000)
+    assert 'start' not in [c[0] for c in board.calls]
+
+    board = Board()
+    board.patch(monkeypatch)
+
+    def commands():
+        raise ValueError("Not recordable.")
+
+    with pytest.raises(ValueError):
+        TimerModule(None).schedule(500, commands)
+    assert board.calls[-1] == ('remove', 0x2000)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_tracing`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-20
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import io
+import uuid
+
+from pymetawear.tracing import TraceEvent, FileHook, format_event, \
+    WRITE, NOTIFY
+
+
+def test_events_are_written_to_file(tmpdir):
+    path = str(tmpdir.join('trace.log'))
+    hook = FileHook(path)
+    hook(TraceEvent(1463702400.0, NOTIFY, 'DD:3A:7D:4D:56:F0', 0x0e,
+                    b'\x03\x04\x00\x40'))
+    hook(TraceEvent(1463702400.5, WRITE, 'DD:3A:7D:4D:56:F0',
+                    uuid.UUID(int=1), b'\x01'))
+    hook.close()
+
+    with io.open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ("1463702400.000000 DD:3A:7D:4D:56:F0 Notify    "
+                        "0x000e: 03 04 00 40")
+    assert lines[1].endswith("00000000-0000-0000-0000-000000000001: 01")
+
+
+def test_event_without_characteristic():
+    line = format_event(TraceEvent(0.0, 'init', 'DD:3A:7D:4D:56:F0',
+                                   None, b''))
+    assert line.split()[2:] == ['Init', '-:']
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_tuning`
+==================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-22
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import time
+import threading
+
+import pytest
+
+from pymetawear.exceptions import PyMetaWearException
+from pymetawear.tuning import measure_throughput, probe_latency
+
+
+class RespondingModule(object):
+    """Module answering reads from another thread, dropping every
+    tenth read."""
+
+    module_name = 'Battery'
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.callback = None
+        self.n_reads = 0
+
+    def notifications(self, callback=None):
+        self.callback = callback
+
+    def read(self):
+        self.n_reads += 1
+        if self.n_reads % 10:
+            threading.Timer(self.latency, self.callback, (None, )).start()
+
+
+class DelayingModule(RespondingModule):
+    """Module answering every fifth read after a long delay."""
+
+    def __init__(self, latency, delay):
+        super(DelayingModule, self).__init__(latency)
+        self.delay = delay
+
+    def read(self):
+        self.n_reads += 1
+        latency = self.delay if self.n_reads % 5 == 0 else self.latency
+        threading.Timer(latency, self.callback, (None, )).start()
+
+
+class StreamingModule(object):
+    """Module streaming samples from another thread while subscribed."""
+
+    module_name = 'Accelerometer'
+
+    def __init__(self, data_rate):
+        self.callback = None
+        self.writes = []
+        self._settings = {'data_rate': data_rate}
+
+    def get_possible_settings(self):
+        return {'data_rate': [25.0, 50.0, 100.0, 200.0]}
+
+    def get_current_settings(self):
+        return dict(self._settings)
+
+    def set_settings(self, data_rate=None):
+        if data_rate != self._settings.get('data_rate'):
+            self.writes.append(data_rate)
+            self._settings['data_rate'] = data_rate
+
+    def notifications(self, callback=None):
+        self.callback = callback
+        if callback is not None:
+            threading.Thread(target=self._stream).start()
+
+    def _stream(self):
+        callback = self.callback
+        while self.callback is callback:
+            callback(None)
+            time.sleep(1.0 / self._settings['data_rate'])
+
+
+class Client(object):
+
+    def __init__(self, address, latency=0.0, data_rate=50.0):
+        self._address = address
+        self.battery = RespondingModule(latency)
+        self.accelerometer = StreamingModule(data_rate)
+
+
+def test_boards_are_probed_concurrently():
+    clients = [Client('A', 0.002), Client('B', 0.02)]
+    report = probe_latency(clients, n_probes=20, timeout=0.2)
+    assert report['boards']['A']['lost'] == 2
+    assert report['boards']['A']['count'] == 18
+    assert report['boards']['A']['p50'] < report['boards']['B']['p50']
+    assert report['combined']['count'] == 36
+    assert report['combined']['lost'] == 4
+    assert all(c.battery.callback is None for c in clients)
+
+
+def test_late_responses_are_lost():
+    client = Client('A')
+    client.battery = DelayingModule(0.002, 0.1)
+    report = probe_latency(client, n_probes=10, timeout=0.05)
+    board = report['boards']['A']
+    assert board['lost'] == 2
+    assert board['count'] == 8
+    assert board['max'] < 0.05
+    assert board['p50'] <= board['p90'] <= board['max']
+
+
+def test_throughput_restores_data_rate():
+    client = Client('A', data_rate=50.0)
+    rate = measure_throughput(client, duration=0.2)
+    assert rate > 0.0
+    assert client.accelerometer.writes == [200.0, 50.0]
+    assert client.accelerometer.callback is None
+
+
+def test_throughput_needs_free_notifications():
+    client = Client('A')
+    client.accelerometer.callback = print
+    with pytest.raises(PyMetaWearException):
+        measure_throughput(client, duration=0.1)
+    assert client.accelerometer.writes == []
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:mod:`test_workers`
+===================
+
+Created by hbldh <henrik.blidh@nedomkull.com>
+Created on 2016-05-25
+
+"""
+
+from __future__ import division
+from __future__ import print_function
+#from __future__ import unicode_literals
+from __future__ import absolute_import
+
+import struct
+import threading
+import multiprocessing
+
+import numpy as np
+
+from pymetawear.workers import SampleRing, _serve
+
+
+def _write_samples(ring, n):
+    for k in range(n):
+        ring.write(1000 + k, (k, -k, 2 * k))
+
+
+def test_ring_wraps_and_counts_overruns():
+    ring = SampleRing(8, 3)
+    _write_samples(ring, 6)
+    epochs, values = ring.read()
+    np.testing.assert_array_equal(epochs, np.arange(1000, 1006))
+    assert len(ring) == 0
+
+    _write_samples(ring, 4)
+    epochs, values = ring.read()
+    assert len(epochs) == 2
+    epochs, values = ring.read()
+    assert len(epochs) == 2
+    np.testing.assert_array_equal(values[:, 1], [-2, -3])
+
+    _write_samples(ring, 12)
+    assert len(ring) == 8
+    n = 0
+    while len(ring):
+        n += len(ring.read()[0])
+    assert n == 8
+    assert ring.overruns == 4
+
+
+def test_ring_is_shared_with_worker_process():
+    ring = SampleRing(1024, 3)
+    p = multiprocessing.Process(target=_write_samples, args=(ring, 100))
+    p.start()
+    p.join()
+    assert ring.n_written == 100
+    epochs, values = ring.read()
+    np.testing.assert_array_equal(epochs, np.arange(1000, 1100))
+    np.testing.assert_array_equal(values[:, 2], 2 * np.arange(100))
+
+
+def test_drain_counts_samples_overwritten_in_callback():
+    ring = SampleRing(8, 3)
+    received = []
+
+    def handle(epochs, values, n_new):
+        received.append(epochs)
+        if len(received) == 1:
+            # The worker writes while the samples are being handled.
+            _write_samples(ring, n_new)
+
+    _write_samples(ring, 6)
+    assert ring.drain(lambda e, v: handle(e, v, 5)) == 11
+    assert ring.overwritten == 3
+    assert ring.overruns == 0
+
+    del received[:]
+    _write_samples(ring, 4)
+    assert ring.drain(lambda e, v: handle(e, v, 8), copy=True) == 12
+    np.testing.assert_array_equal(received[0], np.arange(1000, 1004))
+    assert ring.overwritten == 3
+
+
+def test_stand_in_worker():
+    from pymetawear.workers import WorkerClient
+
+    worker = WorkerClient('stand-in', backend='standin',
+                          streams=['accelerometer'])
+    payload = bytearray(struct.pack(str('<BBhhh'), 0x03, 0x04, 0, 0, 8192))
+    samples = []
+    try:
+        assert worker.get('firmware_version') == (1, 2, 3)
+        worker.accelerometer.set_settings(data_rate=100.0, data_range=4.0)
+        assert worker.accelerometer.get_current_settings()[
+            'data_range'] == 4.0
+        worker.stream('accelerometer')
+        for _ in range(3):
+            worker.backend.notify(payload)
+        n = worker.drain(lambda name, epochs, values: samples.append(
+            (name, values.copy())))
+        assert n == 3
+        assert samples[0][0] == 'accelerometer'
+        np.testing.assert_allclose(samples[0][1][0], [0.0, 0.0, 1.0])
+
+        worker.stop_stream('accelerometer')
+        worker.backend.notify(payload)
+        assert worker.drain(lambda *args: None) == 0
+    finally:
+        worker.disconnect()
+
+
+def test_worker_disconnects_once_when_parent_is_gone(monkeypatch):
+    from pymetawear import client
+
+    disconnects = []
+
+    class Client(object):
+
+        def __init__(self, address, **kwargs):
+            pass
+
+        def disconnect(self):
+            disconnects.append(True)
+
+    monkeypatch.setattr(client, 'MetaWearClient', Client)
+    parent, child = multiprocessing.Pipe()
+    t = threading.Thread(target=_serve, args=(child, 'stand-in', {}, {}))
+    t.start()
+    assert parent.recv() == (True, None)
+    parent.close()
+    t.join(5.0)
+    assert not t.is_alive()
+    assert len(disconnects) == 1